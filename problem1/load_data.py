@@ -4,6 +4,12 @@ import argparse, os, sys, csv, json
 import psycopg2
 from psycopg2.extras import execute_values
 
+from load_profile import LoadProfiler
+from timetable import build_stop_times
+
+# stages are only measured with --profile; without it stage() just yields
+NO_PROFILE = LoadProfiler(enabled=False)
+
 def resolve_path(datadir, base_name):
     """
     Find a data file in datadir that matches one of:
@@ -34,19 +40,21 @@ def run_schema(conn, schema_path):
         cur.execute(f.read())
     conn.commit()
 
-def load_lines(conn, path):
+def load_lines(conn, path, prof=NO_PROFILE):
     path = resolve_path(os.path.dirname(path), os.path.basename(path))
     rows = []
-    with open(path, newline='', encoding='utf-8') as f:
+    with prof.stage("lines.parse") as st, open(path, newline='', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for r in reader:
             rows.append((r['line_name'].strip(), r['vehicle_type'].strip()))
-    with conn.cursor() as cur:
+        st.rows = len(rows)
+    with prof.stage("lines.insert", len(rows)), conn.cursor() as cur:
         execute_values(cur,
             "INSERT INTO lines (line_name, vehicle_type) VALUES %s ON CONFLICT (line_name) DO NOTHING",
             rows
         )
-    conn.commit()
+    with prof.stage("lines.commit"):
+        conn.commit()
     return len(rows)
 
 def map_ids(conn, table, key_col, id_col):
@@ -54,28 +62,32 @@ def map_ids(conn, table, key_col, id_col):
         cur.execute(f"SELECT {key_col}, {id_col} FROM {table}")
         return dict(cur.fetchall())
 
-def load_stops(conn, path):
+def load_stops(conn, path, prof=NO_PROFILE):
     path = resolve_path(os.path.dirname(path), os.path.basename(path))
     rows = []
-    with open(path, newline='', encoding='utf-8') as f:
+    with prof.stage("stops.parse") as st, open(path, newline='', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for r in reader:
             rows.append((r['stop_name'].strip(), float(r['latitude']), float(r['longitude'])))
-    with conn.cursor() as cur:
+        st.rows = len(rows)
+    with prof.stage("stops.insert", len(rows)), conn.cursor() as cur:
         execute_values(cur,
             "INSERT INTO stops (stop_name, latitude, longitude) VALUES %s ON CONFLICT (stop_name) DO NOTHING",
             rows
         )
-    conn.commit()
+    with prof.stage("stops.commit"):
+        conn.commit()
     return len(rows)
 
-def load_line_stops(conn, path):
+def load_line_stops(conn, path, prof=NO_PROFILE):
     path = resolve_path(os.path.dirname(path), os.path.basename(path))
     # map for FK resolution
-    lmap = map_ids(conn, "lines", "line_name", "line_id")
-    smap = map_ids(conn, "stops", "stop_name", "stop_id")
+    with prof.stage("line_stops.map_ids") as st:
+        lmap = map_ids(conn, "lines", "line_name", "line_id")
+        smap = map_ids(conn, "stops", "stop_name", "stop_id")
+        st.rows = len(lmap) + len(smap)
     rows = []
-    with open(path, newline='', encoding='utf-8') as f:
+    with prof.stage("line_stops.parse") as st, open(path, newline='', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for r in reader:
             ln = r['line_name'].strip()
@@ -83,20 +95,24 @@ def load_line_stops(conn, path):
             seq = int(r['sequence'])
             offset = int(r['time_offset'])
             rows.append((lmap[ln], smap[sn], seq, offset))
-    with conn.cursor() as cur:
+        st.rows = len(rows)
+    with prof.stage("line_stops.insert", len(rows)), conn.cursor() as cur:
         execute_values(cur,
             """INSERT INTO line_stops (line_id, stop_id, sequence_number, time_offset_minutes)
                VALUES %s ON CONFLICT (line_id, sequence_number) DO NOTHING""",
             rows
         )
-    conn.commit()
+    with prof.stage("line_stops.commit"):
+        conn.commit()
     return len(rows)
 
-def load_trips(conn, path):
+def load_trips(conn, path, prof=NO_PROFILE):
     path = resolve_path(os.path.dirname(path), os.path.basename(path))
-    lmap = map_ids(conn, "lines", "line_name", "line_id")
+    with prof.stage("trips.map_ids") as st:
+        lmap = map_ids(conn, "lines", "line_name", "line_id")
+        st.rows = len(lmap)
     rows = []
-    with open(path, newline='', encoding='utf-8') as f:
+    with prof.stage("trips.parse") as st, open(path, newline='', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for r in reader:
             trip_id = r['trip_id'].strip()
@@ -104,20 +120,24 @@ def load_trips(conn, path):
             sched = r['scheduled_departure'].strip()
             vehicle = r['vehicle_id'].strip()
             rows.append((trip_id, line_id, sched, vehicle))
-    with conn.cursor() as cur:
+        st.rows = len(rows)
+    with prof.stage("trips.insert", len(rows)), conn.cursor() as cur:
         execute_values(cur,
             """INSERT INTO trips (trip_id, line_id, scheduled_departure, vehicle_id)
                VALUES %s ON CONFLICT (trip_id) DO NOTHING""",
             rows
         )
-    conn.commit()
+    with prof.stage("trips.commit"):
+        conn.commit()
     return len(rows)
 
-def load_stop_events(conn, path):
+def load_stop_events(conn, path, prof=NO_PROFILE):
     path = resolve_path(os.path.dirname(path), os.path.basename(path))
-    smap = map_ids(conn, "stops", "stop_name", "stop_id")
+    with prof.stage("stop_events.map_ids") as st:
+        smap = map_ids(conn, "stops", "stop_name", "stop_id")
+        st.rows = len(smap)
     rows = []
-    with open(path, newline='', encoding='utf-8') as f:
+    with prof.stage("stop_events.parse") as st, open(path, newline='', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for r in reader:
             trip_id = r['trip_id'].strip()
@@ -127,13 +147,15 @@ def load_stop_events(conn, path):
             on = int(r['passengers_on'])
             off = int(r['passengers_off'])
             rows.append((trip_id, stop_id, scheduled, actual, on, off))
-    with conn.cursor() as cur:
+        st.rows = len(rows)
+    with prof.stage("stop_events.insert", len(rows)), conn.cursor() as cur:
         execute_values(cur,
             """INSERT INTO stop_events (trip_id, stop_id, scheduled, actual, passengers_on, passengers_off)
                VALUES %s ON CONFLICT (trip_id, stop_id) DO NOTHING""",
             rows
         )
-    conn.commit()
+    with prof.stage("stop_events.commit"):
+        conn.commit()
     return len(rows)
 
 def main():
@@ -145,20 +167,32 @@ def main():
     p.add_argument("--password", required=True)
     p.add_argument("--datadir", default="data")
     p.add_argument("--schema", default="schema.sql")
+    p.add_argument("--profile", nargs="?", const="load_profile.json", metavar="REPORT_JSON",
+                   help="per-stage wall/CPU time, rows, peak RSS and tracemalloc top allocators -> JSON report")
+    p.add_argument("--profile-cprofile", default="", metavar="STAGE,...",
+                   help="also cProfile these stages, e.g. stop_events.parse (REPORT.<stage>.prof)")
+    p.add_argument("--profile-top", default=10, type=int,
+                   help="allocation sites per stage (0 = tracemalloc off, for clean timings)")
     args = p.parse_args()
+    prof = NO_PROFILE
+    if args.profile:
+        prof = LoadProfiler(enabled=True, cprofile_stages=[s for s in args.profile_cprofile.split(",") if s],
+                            tracemalloc_top=args.profile_top, prof_prefix=os.path.splitext(args.profile)[0])
 
     print(f"Connected to {args.dbname}@{args.host}")
-    conn = connect(args)
+    with prof.stage("connect"):
+        conn = connect(args)
 
     print("Creating schema...")
-    run_schema(conn, args.schema)
-    print("Tables created: lines, stops, line_stops, trips, stop_events\n")
+    with prof.stage("schema"):
+        run_schema(conn, args.schema)
+    print("Tables created: lines, stops, line_stops, trips, stop_events, stop_times\n")
 
     total = 0
     def load_and_report(fname, loader):
         nonlocal total
         path = os.path.join(args.datadir, fname)
-        n = loader(conn, path)
+        n = loader(conn, path, prof)
         total += n
         print(f"Loading {path}... {n} rows")
 
@@ -168,8 +202,18 @@ def main():
     load_and_report("trips", load_trips)
     load_and_report("stop_events", load_stop_events)
 
+    # derived, not counted in the total: trips x line_stops expanded inside the database
+    with prof.stage("stop_times.build") as st:
+        st.rows = build_stop_times(conn)
+    print(f"Building stop_times... {st.rows} rows")
+
     print(f"\nTotal: {total} rows loaded")
     conn.close()
 
+    if args.profile:
+        rep = prof.write(args.profile, rows_loaded=total)
+        print(f"Profile written to {args.profile} (slowest stages: {', '.join(rep['slowest_stages'])}, "
+              f"peak RSS {rep['peak_rss_mb']} MB)")
+
 if __name__ == "__main__":
     main()
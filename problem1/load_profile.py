@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# problem1/load_profile.py
+"""
+Stage-level profiling for load_data.py (--profile REPORT_JSON).
+
+    prof = LoadProfiler(enabled=True, cprofile_stages={"stop_events.insert"}, tracemalloc_top=10)
+    with prof.stage("stop_events.parse") as st:
+        rows = [...]
+        st.rows = len(rows)
+    prof.write("load_profile.json")
+
+Each stage gets wall and CPU seconds, rows and rows/s, its share of the run,
+the process' peak RSS so far, Python heap growth and peak plus the top
+allocation sites (tracemalloc), and optionally a cProfile dump
+(<prefix>.<stage>.prof) with its top functions by cumulative time.
+
+Server-side time shows up as wall time without CPU time (execute_values,
+commit, the stop_times build). tracemalloc snapshots are kept out of the
+stage times and reported as profiler_overhead_s; for clean timings run
+with tracemalloc off (--profile-top 0).
+"""
+
+import contextlib
+import cProfile
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:                     # Windows: no getrusage
+    resource = None
+
+MB = 1024 * 1024
+CPROFILE_TOP = 15
+
+
+def peak_rss_mb():
+    """High-water mark of the process' resident set (None where getrusage is missing)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (MB if sys.platform == "darwin" else 1024), 1)    # bytes on macOS, KB on Linux
+
+
+class Stage:
+    __slots__ = ("name", "rows")
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+
+
+class LoadProfiler:
+    def __init__(self, enabled=False, cprofile_stages=(), tracemalloc_top=10, prof_prefix=None):
+        self.enabled = enabled
+        self.cprofile_stages = set(cprofile_stages)
+        self.tracemalloc_top = int(tracemalloc_top) if enabled else 0
+        self.prof_prefix = prof_prefix          # <prefix>.<stage>.prof for cProfile dumps
+        self.stages = []
+        self.overhead_s = 0.0                   # snapshots / diffs, not part of any stage
+        self._t0, self._cpu0 = time.perf_counter(), time.process_time()
+        if self.tracemalloc_top and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name, rows=None):
+        st = Stage(name, rows)
+        if not self.enabled:
+            yield st
+            return
+        tracing = tracemalloc.is_tracing() and self.tracemalloc_top > 0
+        if tracing:
+            t = time.perf_counter()
+            before = tracemalloc.take_snapshot()
+            heap0 = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            self.overhead_s += time.perf_counter() - t
+        prof = cProfile.Profile() if name in self.cprofile_stages else None
+        t0, cpu0 = time.perf_counter(), time.process_time()
+        if prof:
+            prof.enable()
+        try:
+            yield st
+        finally:
+            if prof:
+                prof.disable()
+            wall, cpu = time.perf_counter() - t0, time.process_time() - cpu0
+            rec = {"stage": name, "wall_s": round(wall, 4), "cpu_s": round(cpu, 4), "rows": st.rows,
+                   "rows_per_s": round(st.rows / wall, 1) if st.rows and wall > 0 else None,
+                   "peak_rss_mb": peak_rss_mb()}
+            if tracing:
+                heap, peak = tracemalloc.get_traced_memory()
+                rec["py_heap_growth_mb"] = round((heap - heap0) / MB, 2)
+                rec["py_heap_peak_mb"] = round(peak / MB, 2)
+                t = time.perf_counter()
+                rec["top_allocators"] = self._top_allocators(before)
+                self.overhead_s += time.perf_counter() - t
+            if prof:
+                rec["cprofile"] = self._cprofile(prof, name)
+            self.stages.append(rec)
+
+    # ---- tracemalloc / cProfile ---- #
+    def _top_allocators(self, before):
+        """Source lines holding the most memory the stage allocated and kept."""
+        out = []
+        # (Snapshot.filter_traces would cost more than the diff itself on a big heap)
+        for diff in tracemalloc.take_snapshot().compare_to(before, "lineno"):
+            frame = diff.traceback[0]
+            if diff.size_diff <= 0 or frame.filename in (tracemalloc.__file__, __file__):
+                continue
+            out.append({"where": f"{_short_path(frame.filename)}:{frame.lineno}",
+                        "size_diff_kb": round(diff.size_diff / 1024, 1), "count_diff": diff.count_diff})
+            if len(out) >= self.tracemalloc_top:
+                break
+        return out
+
+    def _cprofile(self, prof, name):
+        rec = {}
+        if self.prof_prefix:
+            path = f"{self.prof_prefix}.{name}.prof"
+            prof.dump_stats(path)
+            rec["dump"] = path
+        stats = pstats.Stats(prof).stats          # (file, line, func) -> (cc, nc, tt, ct, callers)
+        top = sorted(stats.items(), key=lambda kv: kv[1][3], reverse=True)[:CPROFILE_TOP]
+        rec["top_cumulative"] = [{"function": f"{_short_path(f)}:{line}({func})", "calls": nc,
+                                  "tottime_s": round(tt, 4), "cumtime_s": round(ct, 4)}
+                                 for (f, line, func), (_, nc, tt, ct, _) in top]
+        return rec
+
+    # ---- report ---- #
+    def report(self, **extra):
+        wall = time.perf_counter() - self._t0
+        for rec in self.stages:
+            rec["wall_share_pct"] = round(100 * rec["wall_s"] / wall, 1) if wall > 0 else None
+        rep = {
+            "argv": sys.argv,
+            "python": sys.version.split()[0],
+            "wall_s": round(wall, 3),
+            "cpu_s": round(time.process_time() - self._cpu0, 3),
+            "profiler_overhead_s": round(self.overhead_s, 3),
+            "peak_rss_mb": peak_rss_mb(),
+            "tracemalloc": self.tracemalloc_top > 0,
+            "slowest_stages": [r["stage"] for r in sorted(self.stages, key=lambda r: -r["wall_s"])[:3]],
+            **extra,
+            "stages": self.stages,
+        }
+        if self.tracemalloc_top and tracemalloc.is_tracing():
+            rep["py_heap_peak_mb"] = round(max((r.get("py_heap_peak_mb") or 0) for r in self.stages), 2) \
+                if self.stages else None
+        return rep
+
+    def write(self, path, **extra):
+        rep = self.report(**extra)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rep, f, indent=2)
+            f.write("\n")
+        return rep
+
+
+def _short_path(filename):
+    """Last two path components: enough to find the line, stable across machines."""
+    parts = filename.replace("\\", "/").split("/")
+    return "/".join(parts[-2:])
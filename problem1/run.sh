@@ -18,3 +18,5 @@ echo ""
 echo "Running sample queries..."
 docker-compose run --rm app python queries.py --host db --query Q1 --dbname transit --user transit --password transit123
 docker-compose run --rm app python queries.py --host db --query Q3 --dbname transit --user transit --password transit123
+docker-compose run --rm app python timetable.py departures --host db --dbname transit --user transit --password transit123 \
+  --stop "Le Conte / Broxton" --after "2025-10-01 07:30"
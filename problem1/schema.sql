@@ -1,6 +1,7 @@
 -- problem1/schema.sql
 -- Schema for Metro Transit Database
 
+DROP TABLE IF EXISTS stop_times CASCADE;
 DROP TABLE IF EXISTS stop_events CASCADE;
 DROP TABLE IF EXISTS trips CASCADE;
 DROP TABLE IF EXISTS line_stops CASCADE;
@@ -50,3 +51,15 @@ CREATE TABLE stop_events (
     passengers_off INTEGER NOT NULL DEFAULT 0 CHECK (passengers_off >= 0),
     PRIMARY KEY (trip_id, stop_id)
 );
+
+-- Scheduled time of every trip at every stop of its line (trips x line_stops),
+-- built by timetable.py after each load; its indexes are created there, after the bulk insert
+CREATE TABLE stop_times (
+    trip_id VARCHAR(20) NOT NULL REFERENCES trips(trip_id) ON DELETE CASCADE,
+    line_id INTEGER NOT NULL REFERENCES lines(line_id) ON DELETE CASCADE,
+    stop_id INTEGER NOT NULL REFERENCES stops(stop_id) ON DELETE CASCADE,
+    sequence_number INTEGER NOT NULL,
+    scheduled TIMESTAMP NOT NULL,
+    last_stop BOOLEAN NOT NULL DEFAULT FALSE,
+    PRIMARY KEY (trip_id, sequence_number)
+);
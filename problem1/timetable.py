@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# problem1/timetable.py
+"""
+Materialized timetable: the scheduled time of every trip at every stop of its line.
+
+trips.scheduled_departure + line_stops.time_offset_minutes is only ever
+re-joined per trip at query time (Q4). build_stop_times() expands
+trips x line_stops once, set-based inside PostgreSQL (one INSERT ... SELECT,
+no rows through Python), into stop_times; the indexes are created after the
+bulk insert, then the table is analyzed:
+    stop_times_departures_idx  (stop_id, scheduled) WHERE NOT last_stop
+        -> next departures from a stop after a time: one index range scan + LIMIT
+    stop_times_headway_idx     (stop_id, line_id, scheduled) WHERE NOT last_stop
+        -> per-stop, per-line headways: rows already in window order
+
+    python timetable.py build      --dbname transit
+    python timetable.py departures --dbname transit --stop "Le Conte / Broxton" --after "2025-10-01 07:30"
+    python timetable.py headways   --dbname transit --stop "Le Conte / Broxton" [--start ... --end ...]
+    python timetable.py bench      --dbname transit --n 500
+"""
+import argparse, json, random, time
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+BUILD_SQL = """
+    INSERT INTO stop_times (trip_id, line_id, stop_id, sequence_number, scheduled, last_stop)
+    SELECT t.trip_id, t.line_id, ls.stop_id, ls.sequence_number,
+           t.scheduled_departure + ls.time_offset_minutes * interval '1 minute',
+           ls.sequence_number = last.max_seq
+    FROM trips t
+    JOIN line_stops ls ON ls.line_id = t.line_id
+    JOIN (SELECT line_id, MAX(sequence_number) AS max_seq
+          FROM line_stops GROUP BY line_id) last ON last.line_id = t.line_id
+"""
+
+# created after the bulk insert (building them row by row is much slower)
+INDEXES = [
+    # a trip does not depart from its line's last stop
+    """CREATE INDEX stop_times_departures_idx ON stop_times (stop_id, scheduled)
+       INCLUDE (line_id, trip_id, sequence_number) WHERE NOT last_stop""",
+    "CREATE INDEX stop_times_headway_idx ON stop_times (stop_id, line_id, scheduled) WHERE NOT last_stop",
+]
+
+DEPARTURES_SQL = """
+    SELECT st.scheduled, l.line_name, st.trip_id, st.sequence_number AS sequence
+    FROM stops s
+    JOIN stop_times st ON st.stop_id = s.stop_id AND NOT st.last_stop
+    JOIN lines l ON l.line_id = st.line_id
+    WHERE s.stop_name = %s AND st.scheduled >= %s
+    ORDER BY st.scheduled, l.line_name, st.trip_id
+    LIMIT %s
+"""
+
+# gap between consecutive departures of the same line at the stop, in minutes
+HEADWAYS_SQL = """
+    SELECT l.line_name,
+           COUNT(*) AS departures,
+           ROUND(MIN(g.gap_minutes), 2) AS min_headway,
+           ROUND(AVG(g.gap_minutes), 2) AS avg_headway,
+           ROUND(MAX(g.gap_minutes), 2) AS max_headway,
+           MIN(g.scheduled) AS first_departure,
+           MAX(g.scheduled) AS last_departure
+    FROM (
+        SELECT st.line_id, st.scheduled,
+               (EXTRACT(EPOCH FROM st.scheduled - LAG(st.scheduled)
+                   OVER (PARTITION BY st.line_id ORDER BY st.scheduled)) / 60)::numeric AS gap_minutes
+        FROM stops s
+        JOIN stop_times st ON st.stop_id = s.stop_id AND NOT st.last_stop
+        WHERE s.stop_name = %s
+          AND st.scheduled >= COALESCE(%s::timestamp, '-infinity')
+          AND st.scheduled <  COALESCE(%s::timestamp, 'infinity')
+    ) g
+    JOIN lines l ON l.line_id = g.line_id
+    GROUP BY l.line_name
+    ORDER BY l.line_name
+"""
+
+
+def build_stop_times(conn):
+    """(Re)build stop_times from trips x line_stops in one transaction; returns the row count."""
+    with conn.cursor() as cur:
+        cur.execute("DROP INDEX IF EXISTS stop_times_departures_idx")
+        cur.execute("DROP INDEX IF EXISTS stop_times_headway_idx")
+        cur.execute("TRUNCATE stop_times")
+        cur.execute(BUILD_SQL)
+        n = cur.rowcount
+        for ddl in INDEXES:
+            cur.execute(ddl)
+        cur.execute("ANALYZE stop_times")      # fresh row estimates for the planner
+    conn.commit()
+    return n
+
+def next_departures(conn, stop_name, after, limit=10):
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(DEPARTURES_SQL, [stop_name, after, limit])
+        return cur.fetchall()
+
+def headways(conn, stop_name, start=None, end=None):
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(HEADWAYS_SQL, [stop_name, start, end])
+        return cur.fetchall()
+
+def bench(conn, n, seed=0):
+    """n next-departure + n headway lookups at random (stop, time) pairs -> latency percentiles (ms)."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT DISTINCT s.stop_name FROM stops s JOIN stop_times st ON st.stop_id = s.stop_id")
+        stops = [r[0] for r in cur.fetchall()]
+        cur.execute("SELECT MIN(scheduled), MAX(scheduled), COUNT(*) FROM stop_times")
+        lo, hi, rows = cur.fetchone()
+    if not stops:
+        raise RuntimeError("stop_times is empty (run: python timetable.py build)")
+    rng = random.Random(seed)
+    span = (hi - lo).total_seconds()
+    out = {"stop_times_rows": rows, "stops": len(stops), "n": n}
+    for name, fn in (("departures", lambda s, t: next_departures(conn, s, t, 10)),
+                     ("headways", lambda s, t: headways(conn, s, t, None))):
+        samples = []
+        for _ in range(n):
+            stop = rng.choice(stops)
+            at = lo + (hi - lo) * (rng.random() if span else 0)
+            t0 = time.perf_counter()
+            fn(stop, at)
+            samples.append((time.perf_counter() - t0) * 1000)
+        samples.sort()
+        out[name] = {p: round(samples[min(len(samples) - 1, int(q * len(samples)))], 3)
+                     for p, q in (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99))}
+    return out
+
+def print_rows(title, rows, fmt):
+    if fmt == "json":
+        print(json.dumps({"query": title, "results": rows, "count": len(rows)},
+                         default=str, ensure_ascii=False, indent=2))
+    else:
+        print(title)
+        for r in rows:
+            print(dict(r))
+        print(f"({len(rows)} rows)")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("command", choices=["build", "departures", "headways", "bench"])
+    ap.add_argument("--host", default="localhost")
+    ap.add_argument("--port", default=5432, type=int)
+    ap.add_argument("--dbname", required=True)
+    ap.add_argument("--user", default="transit")
+    ap.add_argument("--password", default="transit123")
+    ap.add_argument("--stop", help="stop name (departures / headways)")
+    ap.add_argument("--after", help="departures at or after this timestamp")
+    ap.add_argument("--start", help="headways: window start (timestamp)")
+    ap.add_argument("--end", help="headways: window end (timestamp, exclusive)")
+    ap.add_argument("--limit", default=10, type=int)
+    ap.add_argument("--n", default=200, type=int, help="bench: lookups per query")
+    ap.add_argument("--format", choices=["text", "json"], default="text")
+    args = ap.parse_args()
+    if args.command in ("departures", "headways") and not args.stop:
+        ap.error(f"{args.command} needs --stop")
+    if args.command == "departures" and not args.after:
+        ap.error("departures needs --after")
+
+    conn = psycopg2.connect(
+        host=args.host, port=args.port, dbname=args.dbname,
+        user=args.user, password=args.password
+    )
+    try:
+        if args.command == "build":
+            t0 = time.perf_counter()
+            n = build_stop_times(conn)
+            print(f"stop_times: {n} rows in {time.perf_counter() - t0:.2f}s")
+        elif args.command == "departures":
+            print_rows(f"Next departures from {args.stop} after {args.after}",
+                       next_departures(conn, args.stop, args.after, args.limit), args.format)
+        elif args.command == "headways":
+            print_rows(f"Headways at {args.stop}", headways(conn, args.stop, args.start, args.end), args.format)
+        else:
+            print(json.dumps(bench(conn, args.n), indent=2))
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Admission control for api_server.py: in-flight limit, deadlines, rate limits.
+Allowed deps: stdlib (contextlib, contextvars, math, threading, time) + aws_clients.TableMeta
+
+Under a burst every request used to be accepted and then queue behind slow
+DynamoDB calls (and throttling retries) until clients gave up, so latency
+collapsed for everyone. Three independent guards:
+
+  Admission     at most max_in_flight requests do work; up to max_queue more
+                wait at most queue_timeout for a slot. Anything beyond that is
+                refused at once (503 + Retry-After) instead of joining the pile.
+  deadlines     each request runs under a deadline (route budget, capped by
+                the client's X-Request-Timeout-Ms). DeadlineTable refuses to
+                start a DynamoDB call (page, shard, batch chunk, retry) once
+                it has passed, so abandoned requests stop consuming capacity;
+                the handler answers 504.
+  TokenBuckets  optional per-client rate limit (429 + Retry-After).
+
+The deadline lives in a context variable, so fan-out workers
+(fanout.py / batch_get.py copy the context) see it too.
+"""
+
+import contextlib
+import contextvars
+import math
+import threading
+import time
+
+from aws_clients import TableMeta
+
+_deadline = contextvars.ContextVar("arxiv_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """The request's time budget ran out before its DynamoDB work did."""
+
+
+# ---- deadlines ---- #
+@contextlib.contextmanager
+def deadline_scope(deadline):
+    """Run the body under an absolute time.monotonic() deadline (None = no deadline)."""
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining():
+    """Seconds left in the current request's budget (None = unbounded)."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+def check_deadline(op=""):
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"deadline exceeded{' before ' + op if op else ''} "
+                               f"({-left * 1000:.0f} ms over budget)")
+
+
+class _DeadlineClient:
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def batch_get_item(self, **kwargs):
+        check_deadline("BatchGetItem")
+        return self._client.batch_get_item(**kwargs)
+
+    def update_item(self, **kwargs):
+        check_deadline("UpdateItem")
+        return self._client.update_item(**kwargs)
+
+
+class DeadlineTable:
+    """Same interface as the table it wraps; no call starts after the request deadline."""
+    def __init__(self, table):
+        self._table = table
+        self.name = table.name
+        self.meta = TableMeta(_DeadlineClient(table.meta.client), table.meta)
+
+    def __getattr__(self, name):
+        return getattr(self._table, name)
+
+    def query(self, **kwargs):
+        check_deadline("Query")
+        return self._table.query(**kwargs)
+
+    def get_item(self, **kwargs):
+        check_deadline("GetItem")
+        return self._table.get_item(**kwargs)
+
+    def scan(self, **kwargs):
+        check_deadline("Scan")
+        return self._table.scan(**kwargs)
+
+
+# ---- in-flight limit ---- #
+class Admission:
+    """
+    Bounded concurrency with a short, bounded wait queue.
+    max_in_flight <= 0 disables the limit (requests are still counted).
+    """
+    def __init__(self, max_in_flight=32, max_queue=64, queue_timeout=0.25):
+        self.max_in_flight = int(max_in_flight)
+        self.max_queue = max(0, int(max_queue))
+        self.queue_timeout = max(0.0, float(queue_timeout))
+        self._cond = threading.Condition()
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = {"queue_full": 0, "queue_timeout": 0}
+        self._service_s = 0.05          # EWMA of admitted request time, for Retry-After
+
+    def acquire(self, deadline=None):
+        """True = run the request (call release() after); False = shed it."""
+        with self._cond:
+            if self.max_in_flight <= 0 or (self.in_flight < self.max_in_flight and not self.waiting):
+                self.in_flight += 1
+                self.admitted += 1
+                return True
+            if self.waiting >= self.max_queue:
+                self.rejected["queue_full"] += 1
+                return False
+            # 排队时间也算在请求的 deadline 里
+            end = time.monotonic() + self.queue_timeout
+            if deadline is not None:
+                end = min(end, deadline)
+            self.waiting += 1
+            try:
+                while self.in_flight >= self.max_in_flight:
+                    left = end - time.monotonic()
+                    if left <= 0:
+                        self.rejected["queue_timeout"] += 1
+                        return False
+                    self._cond.wait(left)
+                self.in_flight += 1
+                self.admitted += 1
+                return True
+            finally:
+                self.waiting -= 1
+
+    def release(self, seconds=None):
+        with self._cond:
+            self.in_flight -= 1
+            if seconds is not None:
+                self._service_s += 0.1 * (seconds - self._service_s)
+            self._cond.notify()
+
+    def retry_after(self):
+        """Whole seconds until the current backlog should have drained (>= 1)."""
+        with self._cond:
+            slots = max(1, self.max_in_flight)
+            return max(1, math.ceil((self.waiting + self.in_flight) * self._service_s / slots))
+
+    def stats(self):
+        with self._cond:
+            return {"max_in_flight": self.max_in_flight, "max_queue": self.max_queue,
+                    "in_flight": self.in_flight, "waiting": self.waiting,
+                    "admitted": self.admitted, "rejected": dict(self.rejected)}
+
+
+# ---- per-client rate limit ---- #
+class TokenBuckets:
+    """One token bucket per client key: `rate` requests/s sustained, bursts up to `burst`."""
+    def __init__(self, rate, burst=None, max_clients=10000):
+        self.rate = float(rate)
+        self.burst = float(burst) if burst else max(1.0, self.rate)
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+        self._buckets = {}              # client -> [tokens, last refill]
+        self.limited = 0
+
+    def take(self, client):
+        """0.0 if the request may proceed, else seconds until the client's next token."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                if len(self._buckets) >= self.max_clients:
+                    self._prune(now)
+                bucket = self._buckets[client] = [self.burst, now]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens >= 1.0:
+                bucket[0] = tokens - 1.0
+                return 0.0
+            bucket[0] = tokens
+            self.limited += 1
+            return (1.0 - tokens) / self.rate
+
+    def _prune(self, now):
+        # a bucket idle long enough to be full again carries no state
+        full_after = self.burst / self.rate
+        for client, (_, last) in list(self._buckets.items()):
+            if now - last >= full_after:
+                del self._buckets[client]
+        if len(self._buckets) >= self.max_clients:
+            self._buckets.clear()
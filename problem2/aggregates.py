@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Precomputed paper counters (per author, category, category-month, keyword).
+Allowed deps: boto3 + stdlib (collections, concurrent.futures)
+
+"Count papers by author" would otherwise mean paging a whole AuthorIndex
+partition. load_data.py keeps one counter item per value instead:
+    PK=STATS#AUTHOR#<name>     SK=COUNT              papers=N
+    PK=STATS#CATEGORY#<cat>    SK=COUNT              papers=N
+    PK=STATS#CATEGORY#<cat>    SK=MONTH#<YYYY-MM>    papers=N
+    PK=STATS#KEYWORD#<kw>      SK=COUNT              papers=N
+Each load compares the papers it writes with the detail items already in
+the table: a new paper adds its authors / categories / keywords, a reloaded
+one adds what it gained and takes back what it lost (so reloading the same
+file is a no-op). The deltas are summed in memory and applied with one
+atomic UpdateItem ADD per counter after the items are written. Reads are a
+single GetItem.
+
+The deltas are not written together with the items: a load that dies
+between write_items and apply_deltas, or two loads of the same papers at
+once, leave the counters off, and a rerun cannot tell. Incremental counters
+are only exact for append-only loads that run to completion;
+rebuild_counters() (load_data.py --recount-aggregates) recomputes every
+counter from a Scan of the detail items.
+"""
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+STATS_KINDS = ("AUTHOR", "CATEGORY", "KEYWORD")
+
+
+def stats_key(kind, value, month=None):
+    return {"PK": f"STATS#{kind}#{value}", "SK": f"MONTH#{month}" if month else "COUNT"}
+
+def _count(counts, authors, categories, published_date, keywords, n=1):
+    month = published_date[:7]
+    for author in authors:
+        counts[("AUTHOR", author, None)] += n
+    for cat in categories:
+        counts[("CATEGORY", cat, None)] += n
+        counts[("CATEGORY", cat, month)] += n
+    for kw in keywords:
+        counts[("KEYWORD", kw, None)] += n
+
+def count_deltas(prepared, loaded=None):
+    """
+    [(paper, keywords), ...] -> Counter{(kind, value, month_or_None): n}.
+    loaded = {arxiv_id: detail item already in the table}: those papers count
+    as new minus old (entries can be negative). A paper listed twice counts
+    once, as its last copy (the one the batch writer keeps).
+    """
+    loaded = loaded or {}
+    deltas = Counter()
+    for p, keywords in {p["arxiv_id"]: (p, kw) for p, kw in prepared}.values():
+        _count(deltas, p["authors"], p["categories"], p["published_date"], keywords)
+        old = loaded.get(p["arxiv_id"])
+        if old:
+            _count(deltas, old.get("authors") or [], old.get("categories") or [],
+                   old.get("published_date") or "", old.get("keywords") or [], n=-1)
+    return deltas
+
+def apply_deltas(table, deltas, workers=8):
+    """One UpdateItem ADD per counter; the low-level client is thread-safe."""
+    client = table.meta.client
+
+    def add(entry):
+        (kind, value, month), n = entry
+        key = stats_key(kind, value, month)
+        client.update_item(
+            TableName=table.name,
+            Key={"PK": {"S": key["PK"]}, "SK": {"S": key["SK"]}},
+            UpdateExpression="ADD papers :n SET entity_type = :t",
+            ExpressionAttributeValues={":n": {"N": str(n)}, ":t": {"S": "STATS_ITEM"}},
+        )
+
+    entries = [e for e in deltas.items() if e[1]]
+    if entries:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(entries)))) as pool:
+            list(pool.map(add, entries))
+    return len(entries)
+
+def _scan(table, **kwargs):
+    while True:
+        resp = table.scan(**kwargs)
+        yield from resp.get("Items", [])
+        if not resp.get("LastEvaluatedKey"):
+            return
+        kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+def rebuild_counters(table):
+    """
+    Recompute every counter from the detail items (two Scans) and overwrite
+    them; counters whose value no longer occurs are deleted. Run it with no
+    other load in flight. Returns (papers, counters written, counters deleted).
+    """
+    from boto3.dynamodb.conditions import Attr     # load_data.py only: query_papers.py imports this module
+    details = {}
+    for it in _scan(table, FilterExpression=Attr("entity_type").eq("PAPER_ITEM"),
+                    ProjectionExpression="PK, SK, authors, categories, published_date, keywords"):
+        # a paper with both a DETAILS#<date> and a DETAILS item counts once, as the new one
+        if it["PK"] not in details or it["SK"] == "DETAILS":
+            details[it["PK"]] = it
+    counts = Counter()
+    for it in details.values():
+        _count(counts, it.get("authors") or [], it.get("categories") or [],
+               it.get("published_date") or "", it.get("keywords") or [])
+
+    keep = {(k["PK"], k["SK"]) for k in (stats_key(*c) for c in counts)}
+    stale = [(it["PK"], it["SK"]) for it in _scan(table, FilterExpression=Attr("entity_type").eq("STATS_ITEM"),
+                                                  ProjectionExpression="PK, SK")
+             if (it["PK"], it["SK"]) not in keep]
+    with table.batch_writer() as batch:
+        for (kind, value, month), n in counts.items():
+            batch.put_item(Item={**stats_key(kind, value, month), "entity_type": "STATS_ITEM", "papers": n})
+        for pk, sk in stale:
+            batch.delete_item(Key={"PK": pk, "SK": sk})
+    return len(details), len(counts), len(stale)
+
+def get_count(table, kind, value, month=None):
+    resp = table.get_item(Key=stats_key(kind, value, month))
+    item = resp.get("Item")
+    return int(item["papers"]) if item and "papers" in item else 0
@@ -5,15 +5,32 @@ HW3 Problem 2 — Part D: Minimal HTTP API using http.server + DynamoDB backend.
 Allowed deps: boto3 + stdlib (http.server, urllib.parse, json, os, datetime)
 """
 
+import hmac
 import json
+import math
 import os
+import threading
+import time
 from datetime import datetime, timezone
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import urlparse, parse_qs, unquote
 
-import boto3
 from boto3.dynamodb.conditions import Key
 
+from admission import Admission, DeadlineExceeded, DeadlineTable, TokenBuckets, deadline_scope
+from aggregates import get_count
+from author_names import AuthorIndex
+from backend import open_table
+from batch_get import MAX_BATCH_IDS, batch_get_papers, get_paper, reset_index_cache
+from fanout import MAX_FANOUT, merged_top_n, sharded_iter, sharded_page, split_values
+from http_encoding import etag_matches, negotiate, prepare, stream_compressor
+from hot_lists import hot_page
+from metrics import InstrumentedTable, Registry
+from pagination import InvalidLimit, InvalidToken, iter_json_envelope, parse_limit, query_page
+from response_cache import ResponseCache
+from sharding import ShardMap
+from text_index import TextIndex
+
 # ---- helpers ----
 def now_ms():
     # 使用 timezone-aware 的 UTC 时间，避免 DeprecationWarning
@@ -22,134 +39,514 @@ def now_ms():
 REGION = os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION") or "us-west-2"
 TABLE_NAME = os.environ.get("ARXIV_TABLE") or "arxiv-papers"
 
-dynamodb = boto3.resource("dynamodb", region_name=REGION)
-table = dynamodb.Table(TABLE_NAME)
+# ARXIV_BACKEND=local serves from an in-memory copy of ARXIV_LOCAL_DATA (see backend.py)
+table = open_table(TABLE_NAME, REGION)
+# /metrics: every table call is timed and capacity-tracked (ARXIV_METRICS=0 turns the wrapper off)
+METRICS = Registry()
+if os.environ.get("ARXIV_METRICS", "1") not in ("0", "false", "no"):
+    table = InstrumentedTable(table, METRICS)
+# outermost: once a request's deadline has passed no further DynamoDB call starts (admission.py)
+table = DeadlineTable(table)
+SHARDS = ShardMap(table, ttl=float(os.environ.get("SHARD_MAP_TTL", 60)))
+
+# ---- response cache (data only changes when load_data.py runs) ----
+def _env_float(name, default):
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return float(default)
+
+CACHE = ResponseCache(
+    max_entries=int(_env_float("CACHE_MAX_ENTRIES", 2048)),
+    default_ttl=_env_float("CACHE_TTL_DEFAULT", 60),
+    route_ttls={
+        "recent":  _env_float("CACHE_TTL_RECENT", 30),
+        "author":  _env_float("CACHE_TTL_AUTHOR", 300),
+        "keyword": _env_float("CACHE_TTL_KEYWORD", 300),
+        "search":  _env_float("CACHE_TTL_SEARCH", 300),
+        "get":     _env_float("CACHE_TTL_GET", 600),
+        "recent_multi": _env_float("CACHE_TTL_RECENT", 30),
+        "keywords_any": _env_float("CACHE_TTL_KEYWORD", 300),
+        "stats":   _env_float("CACHE_TTL_STATS", 300),
+        "text":    _env_float("CACHE_TTL_TEXT", 300),
+    },
+)
+
+METRICS.collect("arxiv_cache_requests_total", "counter", "Response cache lookups by route and result",
+                ("route", "result"),
+                lambda: {(r, res): n for r, c in CACHE.stats()["routes"].items() for res, n in c.items()})
+METRICS.collect("arxiv_cache_entries", "gauge", "Entries in the response cache", (),
+                lambda: {(): CACHE.stats()["entries"]})
+
+# POST /cache/invalidate: with ARXIV_INVALIDATE_TOKEN set, callers must send it as X-Invalidate-Token;
+# without it only loopback clients may invalidate (the server listens on 0.0.0.0)
+INVALIDATE_TOKEN = os.environ.get("ARXIV_INVALIDATE_TOKEN") or None
+LOOPBACK = ("127.0.0.1", "::1", "::ffff:127.0.0.1")
+
+# ---- admission control / load shedding (admission.py) ----
+# ARXIV_MAX_IN_FLIGHT=0 turns the in-flight limit off; ARXIV_RATE_LIMIT (req/s per client) turns rate limiting on
+ADMISSION = Admission(max_in_flight=int(_env_float("ARXIV_MAX_IN_FLIGHT", 32)),
+                      max_queue=int(_env_float("ARXIV_QUEUE_DEPTH", 64)),
+                      queue_timeout=_env_float("ARXIV_QUEUE_TIMEOUT_MS", 250) / 1000)
+_rate_limit = _env_float("ARXIV_RATE_LIMIT", 0)
+RATE_LIMIT = TokenBuckets(_rate_limit, _env_float("ARXIV_RATE_BURST", 0)) if _rate_limit > 0 else None
+# behind a load balancer the client is the first X-Forwarded-For hop
+TRUST_FORWARDED = os.environ.get("ARXIV_TRUST_FORWARDED", "0") in ("1", "true", "yes")
+
+# per-route budgets (seconds); the client can only shorten them (X-Request-Timeout-Ms). 0 = no deadline
+DEFAULT_DEADLINE = _env_float("ARXIV_DEADLINE_MS", 2000) / 1000
+LONG_DEADLINE = _env_float("ARXIV_DEADLINE_LONG_MS", 5000) / 1000
+ROUTE_DEADLINES = {
+    # limit-less reads walk every page of a partition / index
+    "/papers/author/{author}": LONG_DEADLINE,
+    "/papers/search": LONG_DEADLINE,
+    "/papers/batch": LONG_DEADLINE,
+}
+# never queued, limited or cut short: scrapes and operator hooks must work during an overload
+UNGATED_ROUTES = ("/metrics", "/cache/stats", "/cache/invalidate")
+
+METRICS.collect("arxiv_admission_in_flight", "gauge", "Requests currently admitted", (),
+                lambda: {(): ADMISSION.stats()["in_flight"]})
+METRICS.collect("arxiv_admission_waiting", "gauge", "Requests waiting for an admission slot", (),
+                lambda: {(): ADMISSION.stats()["waiting"]})
+METRICS.collect("arxiv_admission_rejected_total", "counter", "Requests shed before doing any work, by reason",
+                ("reason",),
+                lambda: {**{(r,): n for r, n in ADMISSION.stats()["rejected"].items()},
+                         ("rate_limited",): RATE_LIMIT.limited if RATE_LIMIT else 0})
+
+def request_budget(route, query, client_timeout_ms=None):
+    """Seconds this request may spend (queueing included), or None for no deadline."""
+    if (parse_qs(query).get("all") or ["0"])[0] in ("1", "true", "yes"):
+        return None                 # all=1 streams run as long as the client keeps reading
+    budget = ROUTE_DEADLINES.get(route, DEFAULT_DEADLINE)
+    try:
+        if client_timeout_ms:
+            client = float(client_timeout_ms) / 1000
+            budget = min(budget, client) if budget > 0 else client
+    except ValueError:
+        pass
+    return budget if budget > 0 else None
+
+def route_label(path):
+    """Path -> bounded route template for metric labels."""
+    if path.startswith("/papers/author/"):
+        return "/papers/author/{author}"
+    if path.startswith("/papers/keyword/"):
+        return "/papers/keyword/{keyword}"
+    if path.startswith("/stats/"):
+        parts = path.split("/")
+        kind = parts[2] if parts[2] in ("author", "category", "keyword") else "{kind}"
+        return f"/stats/{kind}/{{value}}" + ("/{month}" if len(parts) > 4 else "")
+    if path in ("/metrics", "/cache/stats", "/cache/invalidate", "/papers/batch", "/papers/recent",
+                "/papers/keywords", "/papers/search", "/papers/search/text", "/authors/suggest"):
+        return path
+    if path.startswith("/papers/") and path.count("/") == 2:
+        return "/papers/{id}"
+    return "other"
 
 # ---- query helpers (返回值已按作业 D 的格式) ----
-def q_recent(category, limit=20):
-    resp = table.query(
-        KeyConditionExpression=Key('PK').eq(f'CATEGORY#{category}'),
-        ScanIndexForward=False,
-        Limit=int(limit),
-    )
-    items = [{
-        "arxiv_id": it.get("arxiv_id"),
-        "title": it.get("title"),
-        "authors": it.get("authors"),
-        "published": it.get("published"),
-        "categories": it.get("categories"),
-    } for it in resp.get("Items", [])]
-    return {"category": category, "papers": items, "count": len(items)}
-
-def q_author(author_name):
-    resp = table.query(
-        IndexName='AuthorIndex',
-        KeyConditionExpression=Key('GSI1PK').eq(f'AUTHOR#{author_name}')
-    )
-    items = [{
+def list_fields(it):
+    return {
         "arxiv_id": it.get("arxiv_id"),
         "title": it.get("title"),
         "authors": it.get("authors"),
         "published": it.get("published"),
         "categories": it.get("categories"),
-    } for it in resp.get("Items", [])]
-    return {"author": author_name, "papers": items, "count": len(items)}
+    }
+
+# Query kwargs per access pattern, shared by the paged and streaming paths.
+# Category / keyword partitions may be write-sharded (sharding.py): one query per shard.
+BASE_KEY = ("PK", "SK")
+KEYWORD_KEY = ("PK", "SK", "GSI3PK", "GSI3SK")
+
+def recent_queries(category):
+    return [dict(KeyConditionExpression=Key('PK').eq(pk), ScanIndexForward=False)
+            for pk in SHARDS.partitions("CATEGORY", category)]
+
+def author_queries(author_name):
+    return [dict(IndexName='AuthorIndex',
+                 KeyConditionExpression=Key('GSI1PK').eq(f'AUTHOR#{author_name}'))]
+
+def search_queries(category, start_date, end_date):
+    return [dict(KeyConditionExpression=Key('PK').eq(pk) &
+                                        Key('SK').between(f'{start_date}#', f'{end_date}#zzzzzzz'))
+            for pk in SHARDS.partitions("CATEGORY", category)]
+
+def keyword_queries(keyword):
+    return [dict(IndexName='KeywordIndex',
+                 KeyConditionExpression=Key('GSI3PK').eq(pk),
+                 ScanIndexForward=False)
+            for pk in SHARDS.partitions("KEYWORD", keyword.lower())]
+
+def q_recent(category, limit=20, next_token=None):
+    # first page with limit <= hot-list size: one GetItem on the precomputed list (hot_lists.py)
+    hot = None if next_token else hot_page(table, category, SHARDS.partitions("CATEGORY", category), limit)
+    raw, token = hot or sharded_page(table, recent_queries(category), BASE_KEY, "SK", True, limit, next_token)
+    items = [list_fields(it) for it in raw]
+    return {"category": category, "papers": items, "count": len(items), "next_token": token}
+
+def q_author(author_name, limit=None, next_token=None):
+    raw, token = query_page(table, limit, next_token, **author_queries(author_name)[0])
+    resolved = None
+    if not raw and not next_token:
+        # "Y. LeCun" / "yann lecun" -> the exact AuthorIndex name, if the author index knows it
+        candidates = [n for n in resolve_author(author_name) if n != author_name]
+        if candidates:
+            resolved = candidates[0]
+            raw, token = query_page(table, limit, None, **author_queries(resolved)[0])
+    items = [list_fields(it) for it in raw]
+    out = {"author": author_name, "papers": items, "count": len(items), "next_token": token}
+    if resolved:
+        out["resolved_author"] = resolved
+    return out
 
 def q_get(arxiv_id):
-    resp = table.query(
-        IndexName='PaperIdIndex',
-        KeyConditionExpression=Key('GSI2PK').eq(f'PAPER#{arxiv_id}')
-    )
-    items = resp.get("Items", [])
-    if not items:
+    item = get_paper(table, arxiv_id)
+    if not item:
         return None
     # 按要求“返回全文细节”，直接把该条目放入 "paper"
-    return {"paper": items[0]}
-
-def q_search(category, start_date, end_date):
-    resp = table.query(
-        KeyConditionExpression=Key('PK').eq(f'CATEGORY#{category}') &
-                               Key('SK').between(f'{start_date}#', f'{end_date}#zzzzzzz')
-    )
-    items = [{
-        "arxiv_id": it.get("arxiv_id"),
-        "title": it.get("title"),
-        "authors": it.get("authors"),
-        "published": it.get("published"),
-        "categories": it.get("categories"),
-    } for it in resp.get("Items", [])]
+    return {"paper": item}
+
+def q_search(category, start_date, end_date, limit=None, next_token=None):
+    raw, token = sharded_page(table, search_queries(category, start_date, end_date),
+                              BASE_KEY, "SK", False, limit, next_token)
+    items = [list_fields(it) for it in raw]
     return {
         "category": category,
         "start": start_date,
         "end": end_date,
         "papers": items,
         "count": len(items),
+        "next_token": token,
     }
 
-def q_keyword(keyword, limit=20):
-    resp = table.query(
-        IndexName='KeywordIndex',
-        KeyConditionExpression=Key('GSI3PK').eq(f'KEYWORD#{keyword.lower()}'),
-        ScanIndexForward=False,
-        Limit=int(limit),
-    )
-    items = [{
-        "arxiv_id": it.get("arxiv_id"),
-        "title": it.get("title"),
-        "authors": it.get("authors"),
-        "published": it.get("published"),
-        "categories": it.get("categories"),
-    } for it in resp.get("Items", [])]
-    return {"keyword": keyword, "papers": items, "count": len(items)}
+def q_keyword(keyword, limit=20, next_token=None):
+    raw, token = sharded_page(table, keyword_queries(keyword), KEYWORD_KEY, "GSI3SK", True, limit, next_token)
+    items = [list_fields(it) for it in raw]
+    return {"keyword": keyword, "papers": items, "count": len(items), "next_token": token}
+
+def q_recent_multi(categories, limit=20):
+    queries = [q for c in categories for q in recent_queries(c)]
+    raw = merged_top_n(table, queries, limit, sort_attr="SK")
+    items = [list_fields(it) for it in raw]
+    return {"categories": categories, "papers": items, "count": len(items)}
+
+def q_keywords_any(keywords, limit=20):
+    queries = [q for k in keywords for q in keyword_queries(k)]
+    raw = merged_top_n(table, queries, limit, sort_attr="GSI3SK")
+    items = [list_fields(it) for it in raw]
+    return {"keywords": keywords, "papers": items, "count": len(items)}
+
+def q_stats(kind, value, month=None):
+    out = {kind.lower(): value, "papers": get_count(table, kind, value, month)}
+    if month:
+        out["month"] = month
+    return out
+
+# ---- full-text search (text_index.py, mmap'd on first use) ----
+TEXT_INDEX_PATH = os.environ.get("ARXIV_TEXT_INDEX") or "text_index.bin"
+MAX_TEXT_RESULTS = 100
+_text_index = None
+_text_index_lock = threading.Lock()
+
+def text_index():
+    global _text_index
+    with _text_index_lock:
+        if _text_index is None:
+            _text_index = TextIndex(TEXT_INDEX_PATH)
+        return _text_index
+
+def reset_text_index():
+    """Pick up a rebuilt index file on next use (in-flight searches keep the old mmap)."""
+    global _text_index
+    with _text_index_lock:
+        _text_index = None
+
+# ---- author typeahead (author_names.py, loaded into memory on first use) ----
+AUTHOR_INDEX_PATH = os.environ.get("ARXIV_AUTHOR_INDEX") or "authors_index.json"
+_author_index = None
+_author_index_lock = threading.Lock()
+
+def author_index():
+    global _author_index
+    with _author_index_lock:
+        if _author_index is None:
+            _author_index = AuthorIndex.load(AUTHOR_INDEX_PATH)
+        return _author_index
+
+def reset_author_index():
+    global _author_index
+    with _author_index_lock:
+        _author_index = None
+
+def resolve_author(name):
+    try:
+        return author_index().resolve(name)
+    except FileNotFoundError:
+        return []
+
+def q_suggest_authors(prefix, limit=10):
+    authors = author_index().suggest(prefix, limit)
+    return {"prefix": prefix, "authors": authors, "count": len(authors)}
+
+def q_text(query, op="and", limit=10):
+    hits, total = text_index().search(query, op, limit)
+    papers, _ = batch_get_papers(table, [a for a, _ in hits])
+    by_id = {p.get("arxiv_id"): p for p in papers}
+    items = [dict(list_fields(by_id[a]), score=s) for a, s in hits if a in by_id]
+    return {"query": query, "op": op, "papers": items, "count": len(items), "total_matches": total}
+
+def stream_papers(queries, sort_attr="SK", descending=True):
+    """all=1 mode: list items page by page as DynamoDB returns them."""
+    for it in sharded_iter(table, queries, sort_attr, descending):
+        yield list_fields(it)
 
 # ---- HTTP handler ----
 class Handler(BaseHTTPRequestHandler):
-    def _send(self, code, payload, pretty=True):
-        # 默认美化输出，和作业示例保持一致
-        if pretty:
-            body = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
-        else:
-            body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    def _instrumented(self, handle):
+        """Run do_GET / do_POST inside a metrics scope: status, total / DynamoDB / serialization time."""
+        self._status, self._serialize_s = 500, 0.0
+        self._bytes_out, self._encoding = 0, None
+        self._pretty = False
+        t0 = time.perf_counter()
+        parsed = urlparse(self.path)
+        route = route_label(parsed.path)
+        with METRICS.request(route) as stats:
+            self._req_stats = stats
+            admitted = False
+            try:
+                if route in UNGATED_ROUTES:
+                    handle(); return
+                if RATE_LIMIT is not None:
+                    wait = RATE_LIMIT.take(self._client_id())
+                    if wait:
+                        self._reject(429, "rate limit exceeded", math.ceil(wait)); return
+                budget = request_budget(route, parsed.query, self.headers.get("X-Request-Timeout-Ms"))
+                deadline = time.monotonic() + budget if budget is not None else None
+                # saturated: answer now rather than queue behind slow DynamoDB calls
+                if not ADMISSION.acquire(deadline):
+                    self._reject(503, "server busy", ADMISSION.retry_after()); return
+                admitted = True
+                with deadline_scope(deadline):
+                    handle()
+            finally:
+                if admitted:
+                    ADMISSION.release(time.perf_counter() - t0)
+                METRICS.finish_request(stats, self.command, self._status, time.perf_counter() - t0,
+                                       self._serialize_s, self._bytes_out, self._encoding)
+
+    def _client_id(self):
+        forwarded = self.headers.get("X-Forwarded-For") if TRUST_FORWARDED else None
+        return forwarded.split(",")[0].strip() if forwarded else self.client_address[0]
+
+    def _may_invalidate(self):
+        if INVALIDATE_TOKEN:
+            return hmac.compare_digest(self.headers.get("X-Invalidate-Token") or "", INVALIDATE_TOKEN)
+        return self.client_address[0] in LOOPBACK          # never X-Forwarded-For: the client sets it
+
+    def _reject(self, code, message, retry_after):
+        """Shed without touching DynamoDB; the body is tiny and the connection is closed."""
+        self.close_connection = True
+        self._send(code, {"error": message, "retry_after": retry_after},
+                   headers={"Retry-After": str(retry_after), "Connection": "close"})
+
+    def _send(self, code, payload, pretty=None, headers=None):
+        """
+        JSON response: compact unless ?pretty=1, gzip/deflate if the client accepts it,
+        ETag on every body and 304 when If-None-Match already has it.
+        """
+        t0 = time.perf_counter()
+        pretty = self._pretty if pretty is None else pretty
+        body, encoding, etag = prepare(payload, pretty, self.headers.get("Accept-Encoding"))
+        if code == 200 and self.command == "GET" and etag_matches(self.headers.get("If-None-Match"), etag):
+            code, body = 304, b""
+        self._send_bytes(code, body, "application/json; charset=utf-8", encoding, etag, headers)
+        self._serialize_s += time.perf_counter() - t0
+
+    def _send_bytes(self, code, body, content_type, encoding=None, etag=None, headers=None):
+        self._status = code
         self.send_response(code)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if code != 304:
+            self.send_header("Content-Type", content_type)
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+        self._bytes_out += len(body)
+        self._encoding = encoding
+
+    def _stream(self, head, items):
+        """
+        Stream a {..., "papers": [...], "count": N} body page by page (compressed
+        on the fly if accepted). No Content-Length: the response ends when the
+        connection closes.
+        """
+        encoding = negotiate(self.headers.get("Accept-Encoding"))
+        comp = stream_compressor(encoding)
+        self._status, self._encoding = 200, encoding
+        self.send_response(200)
         self.send_header("Content-Type", "application/json; charset=utf-8")
-        self.send_header("Content-Length", str(len(body)))
+        if comp:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Connection", "close")
         self.end_headers()
-        self.wfile.write(body)
+        self.close_connection = True
+        # pages are fetched while encoding: serialization = stream time minus DynamoDB time
+        t0, db0 = time.perf_counter(), self._req_stats.dynamodb_seconds
+        try:
+            for chunk in iter_json_envelope(head, "papers", items, tail=lambda n: {"count": n},
+                                            indent=2 if self._pretty else None):
+                data = chunk.encode("utf-8")
+                if comp:
+                    data = comp.compress(data)
+                if data:
+                    self.wfile.write(data)
+                    self._bytes_out += len(data)
+            if comp:
+                data = comp.flush()
+                self.wfile.write(data)
+                self._bytes_out += len(data)
+        except Exception as e:
+            # headers are already out; a truncated body is the only signal left
+            self.log(f"stream aborted: {e}")
+        finally:
+            self._serialize_s += max(0.0, time.perf_counter() - t0
+                                     - (self._req_stats.dynamodb_seconds - db0))
 
     def log(self, msg):
         print(f"[{datetime.now(timezone.utc).isoformat()}] {msg}")
 
     def do_GET(self):
+        self._instrumented(self._get)
+
+    def do_POST(self):
+        self._instrumented(self._post)
+
+    def _get(self):
         try:
             parsed = urlparse(self.path)
             path = parsed.path
             qs = parse_qs(parsed.query)
+            self._pretty = (qs.get("pretty") or ["0"])[0] in ("1", "true", "yes")
             self.log(f"{self.command} {path}?{parsed.query}")
 
+            # Prometheus scrape
+            if path == "/metrics":
+                self._send_bytes(200, METRICS.render().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8")
+                return
+
+            # cache stats
+            if path == "/cache/stats":
+                self._send(200, CACHE.stats()); return
+
+            limit_raw = (qs.get("limit") or [None])[0]
+            next_token = (qs.get("next_token") or [None])[0]
+            fetch_all = (qs.get("all") or ["0"])[0] in ("1", "true", "yes")
+
+            # precomputed counters: /stats/author/<name>, /stats/keyword/<kw>,
+            # /stats/category/<cat>[/<YYYY-MM>]
+            if path.startswith("/stats/"):
+                parts = [unquote(x) for x in path[len("/stats/"):].split("/")]
+                kind = parts[0].upper()
+                if kind not in ("AUTHOR", "CATEGORY", "KEYWORD") or len(parts) < 2 or not parts[1] \
+                        or len(parts) > (3 if kind == "CATEGORY" else 2):
+                    self._send(404, {"error": "route not found"}); return
+                value = parts[1].lower() if kind == "KEYWORD" else parts[1]
+                month = parts[2] if len(parts) == 3 else None
+                data = CACHE.get_or_load("stats", {"kind": kind, "value": value, "month": month},
+                                         lambda: q_stats(kind, value, month))
+                self._send(200, data); return
+
+            # author typeahead: /authors/suggest?prefix=lec&limit=10 (in memory, not cached)
+            if path == "/authors/suggest":
+                prefix = (qs.get("prefix") or [""])[0]
+                if not prefix.strip():
+                    self._send(400, {"error": "prefix is required"}); return
+                limit = parse_limit(limit_raw, 10, maximum=50)
+                try:
+                    self._send(200, q_suggest_authors(prefix, limit)); return
+                except FileNotFoundError:
+                    self._send(503, {"error": f"author index {AUTHOR_INDEX_PATH} not built "
+                                              "(python author_names.py build papers.json authors_index.json)"}); return
+
+            # full-text search: /papers/search/text?q=graph+"neural network"&op=and|or&limit=10
+            if path == "/papers/search/text":
+                q = (qs.get("q") or [""])[0].strip()
+                op = (qs.get("op") or ["and"])[0].lower()
+                if not q or op not in ("and", "or"):
+                    self._send(400, {"error": "q is required, op must be and|or"}); return
+                limit = parse_limit(limit_raw, 10, maximum=MAX_TEXT_RESULTS)
+                try:
+                    data = CACHE.get_or_load("text", {"q": q, "op": op, "limit": limit},
+                                             lambda: q_text(q, op, limit))
+                except FileNotFoundError:
+                    self._send(503, {"error": f"text index {TEXT_INDEX_PATH} not built "
+                                              "(python text_index.py build papers.json text_index.bin)"}); return
+                self._send(200, data); return
+
+            # recent across several categories: ?categories=cs.LG,cs.NE,stat.ML
+            if path == "/papers/recent" and qs.get("categories"):
+                categories = split_values(qs["categories"][0])
+                if not categories or len(categories) > MAX_FANOUT:
+                    self._send(400, {"error": f"categories: 1..{MAX_FANOUT} comma-separated values"}); return
+                limit = parse_limit(limit_raw, 20)
+                data = CACHE.get_or_load("recent_multi", {"categories": ",".join(categories), "limit": limit},
+                                         lambda: q_recent_multi(categories, limit))
+                self._send(200, data); return
+
+            # papers matching any of several keywords: /papers/keywords?keywords=graph,learning
+            if path == "/papers/keywords":
+                keywords = split_values((qs.get("keywords") or [""])[0].lower())
+                if not keywords or len(keywords) > MAX_FANOUT:
+                    self._send(400, {"error": f"keywords: 1..{MAX_FANOUT} comma-separated values"}); return
+                limit = parse_limit(limit_raw, 20)
+                data = CACHE.get_or_load("keywords_any", {"keywords": ",".join(keywords), "limit": limit},
+                                         lambda: q_keywords_any(keywords, limit))
+                self._send(200, data); return
+
             # recent
             if path == "/papers/recent":
                 category = (qs.get("category") or [""])[0]
                 if not category:
                     self._send(400, {"error": "category is required"}); return
-                limit = int((qs.get("limit") or ["20"])[0])
-                self._send(200, q_recent(category, limit)); return
+                if fetch_all:
+                    self._stream({"category": category}, stream_papers(recent_queries(category))); return
+                limit = parse_limit(limit_raw, 20)
+                data = CACHE.get_or_load("recent", {"category": category, "limit": limit, "next_token": next_token},
+                                         lambda: q_recent(category, limit, next_token))
+                self._send(200, data); return
 
             # author
             if path.startswith("/papers/author/"):
                 author = unquote(path[len("/papers/author/"):])
                 if not author:
                     self._send(400, {"error": "author_name missing"}); return
-                self._send(200, q_author(author)); return
+                if fetch_all:
+                    self._stream({"author": author}, stream_papers(author_queries(author))); return
+                limit = parse_limit(limit_raw)
+                data = CACHE.get_or_load("author", {"author": author, "limit": limit, "next_token": next_token},
+                                         lambda: q_author(author, limit, next_token))
+                self._send(200, data); return
 
             # keyword
             if path.startswith("/papers/keyword/"):
                 kw = unquote(path[len("/papers/keyword/"):])
                 if not kw:
                     self._send(400, {"error": "keyword missing"}); return
-                limit = int((qs.get("limit") or ["20"])[0])
-                self._send(200, q_keyword(kw, limit)); return
-
-
+                if fetch_all:
+                    self._stream({"keyword": kw}, stream_papers(keyword_queries(kw), "GSI3SK")); return
+                limit = parse_limit(limit_raw, 20)
+                data = CACHE.get_or_load("keyword", {"keyword": kw, "limit": limit, "next_token": next_token},
+                                         lambda: q_keyword(kw, limit, next_token))
+                self._send(200, data); return
 
             # date range search
             if path == "/papers/search":
@@ -158,20 +555,83 @@ class Handler(BaseHTTPRequestHandler):
                 end_date = (qs.get("end") or [""])[0]
                 if not (category and start_date and end_date):
                     self._send(400, {"error": "category,start,end are required"}); return
-                self._send(200, q_search(category, start_date, end_date)); return
-                        # get by id
+                if fetch_all:
+                    self._stream({"category": category, "start": start_date, "end": end_date},
+                                 stream_papers(search_queries(category, start_date, end_date), "SK", False)); return
+                limit = parse_limit(limit_raw)
+                data = CACHE.get_or_load("search", {"category": category, "start": start_date, "end": end_date,
+                                                    "limit": limit, "next_token": next_token},
+                                         lambda: q_search(category, start_date, end_date, limit, next_token))
+                self._send(200, data); return
+
+            # get by id
             if path.startswith("/papers/") and path.count("/") == 2:
                 arxiv_id = unquote(path.split("/", 2)[2])
-                data = q_get(arxiv_id)
+                data = CACHE.get_or_load("get", {"arxiv_id": arxiv_id},
+                                         lambda: q_get(arxiv_id))
                 if not data:
                     self._send(404, {"error": "not found", "arxiv_id": arxiv_id}); return
                 self._send(200, data); return
                 
             # not found
             self._send(404, {"error": "route not found"})
+        except (InvalidToken, InvalidLimit) as e:
+            self._send(400, {"error": str(e)})
+        except DeadlineExceeded as e:
+            self._send(504, {"error": "deadline_exceeded", "message": str(e)})
+        except Exception as e:
+            self._send(500, {"error": "server_error", "message": str(e)})
+
+    def _post(self):
+        try:
+            parsed = urlparse(self.path)
+            path = parsed.path
+            qs = parse_qs(parsed.query)
+            self._pretty = (qs.get("pretty") or ["0"])[0] in ("1", "true", "yes")
+            self.log(f"{self.command} {path}?{parsed.query}")
+
+            # batch lookup: {"arxiv_ids": [...]}
+            if path == "/papers/batch":
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._send(400, {"error": "invalid JSON body"}); return
+                ids = body.get("arxiv_ids") if isinstance(body, dict) else None
+                if not isinstance(ids, list) or not ids:
+                    self._send(400, {"error": "arxiv_ids (non-empty list) is required"}); return
+                if len(ids) > MAX_BATCH_IDS:
+                    self._send(400, {"error": f"at most {MAX_BATCH_IDS} arxiv_ids per request"}); return
+                # str(None) would look up a paper called "None"
+                if not all(isinstance(a, str) and a for a in ids):
+                    self._send(400, {"error": "arxiv_ids must be non-empty strings"}); return
+                papers, missing = batch_get_papers(table, ids)
+                self._send(200, {"papers": papers, "count": len(papers), "missing": missing}); return
+
+            # cache invalidation hook (called by load_data.py after a load)
+            if path == "/cache/invalidate":
+                if not self._may_invalidate():
+                    self._send(403, {"error": "forbidden"}); return
+                route = (qs.get("route") or [None])[0]
+                removed = CACHE.invalidate(route)
+                SHARDS.invalidate()
+                reset_index_cache()
+                reset_text_index()
+                reset_author_index()
+                self._send(200, {"invalidated": removed, "route": route or "*"}); return
+
+            self._send(404, {"error": "route not found"})
+        except DeadlineExceeded as e:
+            self._send(504, {"error": "deadline_exceeded", "message": str(e)})
         except Exception as e:
             self._send(500, {"error": "server_error", "message": str(e)})
 
+class APIServer(ThreadingHTTPServer):
+    # listen backlog (default 5): a burst beyond it is dropped by the kernel and the
+    # client retransmits after ~1 s, before admission control ever sees the request
+    request_queue_size = int(_env_float("ARXIV_LISTEN_BACKLOG", 1024))
+    daemon_threads = True
+
 # ---- main ----
 def main():
     port = 8080
@@ -182,7 +642,8 @@ def main():
         except Exception:
             pass
     print(f"Starting server on 0.0.0.0:{port} (region={REGION}, table={TABLE_NAME})")
-    httpd = HTTPServer(("0.0.0.0", port), Handler)
+    # threaded so concurrent identical cache misses can be coalesced
+    httpd = APIServer(("0.0.0.0", port), Handler)
     httpd.serve_forever()
 
 if __name__ == "__main__":
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Author name index: normalized keys + prefix (typeahead) search.
+Allowed deps: stdlib only (bisect, collections, json, random, re, sys, time, unicodedata)
+
+Usage:
+  python author_names.py build <papers_json_path> <index_path>
+  python author_names.py suggest <index_path> <prefix> [--limit N]
+  python author_names.py bench <index_path> [--lookups N]
+
+AuthorIndex keys are exact names ("AUTHOR#Yann LeCun"), so "LeCun",
+"Y. LeCun" or "Yann Lecun" find nothing. Every author gets a few folded
+(lower-case, accents stripped, punctuation -> space) lookup keys:
+    yann lecun         full name
+    lecun yann         surname first
+    thomas dietterich  first given name + surname ("Thomas G. Dietterich")
+    y lecun            initials + surname
+    lecun              surname alone
+The index file is just {name: paper_count} (written by load_data.py
+--author-index); api_server.py expands it into one sorted key array. A
+prefix is a contiguous range of that array (two bisects); its most-cited
+authors come either from scanning the range (narrow prefixes) or from
+walking all keys in paper-count order until enough land in the range
+(broad prefixes like "a"), whichever is expected to touch fewer entries.
+"""
+
+import bisect
+import json
+import re
+import sys
+import time
+import unicodedata
+from collections import Counter
+
+SURNAME_PARTICLES = {"de", "del", "della", "der", "den", "di", "da", "du", "la", "le", "van", "von", "dos"}
+
+
+def fold(name):
+    """'Jürgen Schmidhuber' -> 'jurgen schmidhuber'; 'Y. LeCun' -> 'y lecun'."""
+    s = unicodedata.normalize("NFKD", name)
+    s = "".join(c for c in s if not unicodedata.combining(c)).lower()
+    return " ".join(re.findall(r"[a-z0-9]+", s))
+
+def name_keys(name):
+    parts = fold(name).split()
+    if not parts:
+        return set()
+    keys = {" ".join(parts)}
+    if len(parts) == 1:
+        return keys
+    # "Luc De Raedt": surname is "de raedt", also reachable as "raedt"
+    cut = len(parts) - 1
+    while cut > 1 and parts[cut - 1] in SURNAME_PARTICLES:
+        cut -= 1
+    given, surname = parts[:cut], " ".join(parts[cut:])
+    keys.add(surname)
+    keys.add(parts[-1])
+    keys.add(f"{surname} {' '.join(given)}")
+    keys.add(f"{given[0]} {surname}")
+    keys.add(f"{' '.join(g[0] for g in given)} {surname}")
+    keys.add(f"{given[0][0]} {surname}")
+    return keys
+
+def author_counts(papers):
+    """papers (papers.json shape) -> {author name: papers}."""
+    counts = Counter()
+    for p in papers:
+        authors = p.get("authors") or []
+        if isinstance(authors, str):
+            authors = [a.strip() for a in authors.split(",") if a.strip()]
+        counts.update(set(authors))
+    return dict(counts)
+
+def write_index(counts, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"authors": counts}, f, ensure_ascii=False, separators=(",", ":"))
+    return len(counts)
+
+
+class AuthorIndex:
+    """Sorted (key, author) arrays plus the same keys in paper-count order."""
+    def __init__(self, counts):
+        self.names = sorted(counts)
+        self.papers = [int(counts[n]) for n in self.names]
+        entries = sorted({(k, i) for i, n in enumerate(self.names) for k in name_keys(n)})
+        self._keys = [k for k, _ in entries]
+        self._ids = [i for _, i in entries]
+        self._by_papers = sorted(range(len(entries)), key=lambda j: self._rank(self._ids[j]))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f)["authors"])
+
+    def __len__(self):
+        return len(self.names)
+
+    def entry(self, i):
+        name = self.names[i]
+        return {"name": name, "papers": self.papers[i], "author_key": f"AUTHOR#{name}"}
+
+    def _rank(self, i):
+        return -self.papers[i], self.names[i]
+
+    def suggest(self, prefix, limit=10):
+        """Authors with a key starting with `prefix`: exact key matches first, then by paper count."""
+        p = fold(prefix)
+        if not p or limit <= 0:
+            return []
+        lo = bisect.bisect_left(self._keys, p)
+        mid = bisect.bisect_right(self._keys, p)              # [lo, mid): key == prefix
+        hi = bisect.bisect_left(self._keys, p + "\uffff", mid)  # [mid, hi): longer keys
+        ranked = sorted(set(self._ids[lo:mid]), key=self._rank)[:limit]
+        seen = set(ranked)
+        span = hi - mid
+        if len(ranked) < limit and span:
+            if span * span <= limit * len(self._keys):
+                # narrow range: scanning it is cheaper than the expected walk (~limit * n / span)
+                rest = sorted(set(self._ids[mid:hi]) - seen, key=self._rank)
+                ranked += rest[:limit - len(ranked)]
+            else:
+                for j in self._by_papers:
+                    if mid <= j < hi and self._ids[j] not in seen:
+                        seen.add(self._ids[j])
+                        ranked.append(self._ids[j])
+                        if len(ranked) >= limit:
+                            break
+        return [self.entry(i) for i in ranked]
+
+    def resolve(self, name):
+        """Exact names whose folded keys equal the folded `name`, most papers first."""
+        p = fold(name)
+        lo = bisect.bisect_left(self._keys, p)
+        hi = bisect.bisect_right(self._keys, p)
+        return [self.names[i] for i in sorted(set(self._ids[lo:hi]), key=self._rank)]
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ("build", "suggest", "bench"):
+        print(__doc__); sys.exit(1)
+    cmd = sys.argv[1]
+    if cmd == "build":
+        if len(sys.argv) < 4:
+            print(__doc__); sys.exit(1)
+        with open(sys.argv[2], "r", encoding="utf-8") as f:
+            data = json.load(f)
+        n = write_index(author_counts(data["papers"] if isinstance(data, dict) else data), sys.argv[3])
+        print(f"Indexed {n} authors -> {sys.argv[3]}")
+        return
+
+    t0 = time.perf_counter()
+    idx = AuthorIndex.load(sys.argv[2])
+    load_ms = (time.perf_counter() - t0) * 1000
+    if cmd == "suggest":
+        if len(sys.argv) < 4:
+            print(__doc__); sys.exit(1)
+        opts = dict(zip(sys.argv[4::2], sys.argv[5::2]))
+        t0 = time.perf_counter()
+        results = idx.suggest(sys.argv[3], int(opts.get("--limit", 10)))
+        us = (time.perf_counter() - t0) * 1e6
+        print(json.dumps({"prefix": sys.argv[3], "authors": results, "count": len(results),
+                          "lookup_us": round(us, 1)}, ensure_ascii=False, indent=2))
+        return
+
+    # bench: prefixes of 1..8 characters cut from real names
+    import random
+    from latency import summarize
+    opts = dict(zip(sys.argv[3::2], sys.argv[4::2]))
+    rng = random.Random(547)
+    samples = []
+    for _ in range(int(opts.get("--lookups", 5000))):
+        name = fold(rng.choice(idx.names)) or "a"
+        prefix = name[:rng.randint(1, min(8, len(name)))]
+        t0 = time.perf_counter()
+        idx.suggest(prefix)
+        samples.append((time.perf_counter() - t0) * 1000)
+    print(json.dumps({"authors": len(idx), "keys": len(idx._keys), "load_ms": round(load_ms, 1),
+                      **summarize("suggest", samples)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Shared, tuned DynamoDB clients + a lean Table on the low-level client.
+Allowed deps: boto3 / botocore + stdlib (decimal, os, threading)
+
+One botocore Config for every process (env overrides in brackets):
+    max_pool_connections  50   [ARXIV_DDB_MAX_POOL]   >= server threads x fan-out workers
+    tcp_keepalive         on                           idle pooled sockets stay usable
+    retries               adaptive, 8 attempts [ARXIV_DDB_MAX_ATTEMPTS]
+                          (client-side rate limiting when DynamoDB throttles)
+    connect / read timeout 2 s / 5 s [ARXIV_DDB_CONNECT_TIMEOUT / ARXIV_DDB_READ_TIMEOUT]
+Clients are cached per region and are thread-safe; boto3 resources are not,
+so threads that want a resource pass their own session.
+
+FastTable speaks the subset of the Table resource API the query layer
+uses (query / get_item / scan / meta.client), accepting the same Key() /
+Attr() conditions, but on the low-level client: items are decoded by
+deserialize_item(), which returns plain str / int / list values instead of
+running TypeDeserializer's per-value dispatch and Decimal conversion.
+"""
+
+import os
+import threading
+from decimal import Decimal
+
+import boto3
+from boto3.dynamodb.conditions import ConditionExpressionBuilder
+from boto3.dynamodb.types import TypeSerializer
+from botocore.config import Config
+
+_lock = threading.Lock()
+_clients = {}
+_ser = TypeSerializer()
+
+
+def _env(name, default, cast=int):
+    try:
+        return cast(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+def client_config(max_pool=None):
+    return Config(
+        max_pool_connections=max_pool or _env("ARXIV_DDB_MAX_POOL", 50),
+        tcp_keepalive=True,
+        retries={"mode": "adaptive", "max_attempts": _env("ARXIV_DDB_MAX_ATTEMPTS", 8)},
+        connect_timeout=_env("ARXIV_DDB_CONNECT_TIMEOUT", 2.0, float),
+        read_timeout=_env("ARXIV_DDB_READ_TIMEOUT", 5.0, float),
+    )
+
+def dynamodb_client(region, max_pool=None):
+    """Process-wide low-level client for `region` (thread-safe, created once)."""
+    key = (region, max_pool)
+    with _lock:
+        if key not in _clients:
+            _clients[key] = boto3.session.Session().client(
+                "dynamodb", region_name=region, config=client_config(max_pool))
+        return _clients[key]
+
+def dynamodb_resource(region, session=None, max_pool=None):
+    """Table-resource factory with the same config; give each thread its own session."""
+    return (session or boto3.session.Session()).resource(
+        "dynamodb", region_name=region, config=client_config(max_pool))
+
+
+# ------------ lightweight (de)serialization ------------ #
+
+def _number(s):
+    try:
+        return int(s)
+    except ValueError:
+        return Decimal(s)
+
+def deserialize_value(v):
+    (t, x), = v.items()
+    if t == "S":
+        return x
+    if t == "N":
+        return _number(x)
+    if t == "L":
+        return [deserialize_value(e) for e in x]
+    if t == "M":
+        return {k: deserialize_value(e) for k, e in x.items()}
+    if t == "BOOL":
+        return x
+    if t == "NULL":
+        return None
+    if t == "SS":
+        return set(x)
+    if t == "NS":
+        return {_number(n) for n in x}
+    if t in ("B", "BS"):
+        return x
+    raise TypeError(f"unknown DynamoDB type {t}")
+
+def deserialize_item(raw):
+    """Wire-format item -> python dict; strings (the common case) pass straight through."""
+    out = {}
+    for k, v in raw.items():
+        s = v.get("S")
+        out[k] = s if s is not None else deserialize_value(v)
+    return out
+
+def serialize_item(item):
+    return {k: _ser.serialize(v) for k, v in item.items()}
+
+
+class TableMeta:
+    """
+    table.meta look-alike: .client, plus whatever the wrapped table's meta has
+    (wrappers such as InstrumentedTable / DeadlineTable swap only the client).
+    """
+    def __init__(self, client, meta=None):
+        self.client = client
+        self._meta = meta
+
+    def __getattr__(self, name):
+        if self._meta is None:
+            raise AttributeError(name)
+        return getattr(self._meta, name)
+
+
+class FastTable:
+    """Table-resource look-alike on a shared low-level client."""
+    def __init__(self, client, name):
+        self.name = name
+        self.meta = TableMeta(client)
+
+    def _request(self, kwargs):
+        req = dict(kwargs, TableName=self.name)
+        names = dict(req.pop("ExpressionAttributeNames", None) or {})
+        values = {k: _ser.serialize(v) for k, v in (req.pop("ExpressionAttributeValues", None) or {}).items()}
+        builder = ConditionExpressionBuilder()
+        for param, is_key in (("KeyConditionExpression", True), ("FilterExpression", False),
+                              ("ConditionExpression", False)):
+            cond = req.get(param)
+            if cond is not None and not isinstance(cond, str):
+                built = builder.build_expression(cond, is_key_condition=is_key)
+                req[param] = built.condition_expression
+                names.update(built.attribute_name_placeholders)
+                values.update({k: _ser.serialize(v) for k, v in built.attribute_value_placeholders.items()})
+        for param in ("Key", "ExclusiveStartKey"):
+            if param in req:
+                req[param] = serialize_item(req[param])
+        if names:
+            req["ExpressionAttributeNames"] = names
+        if values:
+            req["ExpressionAttributeValues"] = values
+        return req
+
+    @staticmethod
+    def _response(resp):
+        if "Items" in resp:
+            resp["Items"] = [deserialize_item(it) for it in resp["Items"]]
+        if "Item" in resp:
+            resp["Item"] = deserialize_item(resp["Item"])
+        if "LastEvaluatedKey" in resp:
+            resp["LastEvaluatedKey"] = deserialize_item(resp["LastEvaluatedKey"])
+        return resp
+
+    def query(self, **kwargs):
+        return self._response(self.meta.client.query(**self._request(kwargs)))
+
+    def get_item(self, **kwargs):
+        return self._response(self.meta.client.get_item(**self._request(kwargs)))
+
+    def scan(self, **kwargs):
+        return self._response(self.meta.client.scan(**self._request(kwargs)))
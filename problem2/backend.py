@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Pick the table the query layer talks to.
+Allowed deps: boto3 + stdlib (os, threading)
+
+    ARXIV_BACKEND=dynamodb   (default) FastTable on the shared, tuned low-level
+                             client (aws_clients.py)
+    ARXIV_BACKEND=local      in-memory LocalTable (local_backend.py), filled
+                             from ARXIV_LOCAL_DATA (default papers.json);
+                             ARXIV_LOCAL_LATENCY_MS / ARXIV_LOCAL_MAX_CONCURRENCY
+                             simulate a remote table's round trip and capacity
+
+api_server.py and query_papers.py only ever call open_table(), so every
+q_* / _q_* function runs unchanged against either backend.
+"""
+
+import os
+import threading
+
+BACKENDS = ("dynamodb", "local")
+
+_local_tables = {}
+_local_lock = threading.Lock()
+
+
+def open_table(table_name, region, backend=None, data_path=None):
+    backend = (backend or os.environ.get("ARXIV_BACKEND") or "dynamodb").lower()
+    if backend == "dynamodb":
+        from aws_clients import FastTable, dynamodb_client
+        return FastTable(dynamodb_client(region), table_name)
+    if backend == "local":
+        from local_backend import load_local_table
+        path = data_path or os.environ.get("ARXIV_LOCAL_DATA") or "papers.json"
+        shards = int(os.environ.get("ARXIV_LOCAL_SHARDS", 1))
+        # one load per (table, file) per process; the table is shared like a boto3 resource
+        with _local_lock:
+            key = (table_name, os.path.abspath(path), shards)
+            if key not in _local_tables:
+                _local_tables[key] = load_local_table(path, table_name, shards=shards).simulate(
+                    float(os.environ.get("ARXIV_LOCAL_LATENCY_MS", 0)) / 1000,
+                    int(os.environ.get("ARXIV_LOCAL_MAX_CONCURRENCY", 0)))
+            return _local_tables[key]
+    raise ValueError(f"unknown backend {backend!r} (expected one of {', '.join(BACKENDS)})")
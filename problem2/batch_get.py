@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Paper detail lookups by primary key (GetItem / BatchGetItem).
+Allowed deps: boto3 + stdlib (concurrent.futures, contextvars, os, time)
+
+Paper detail items live at PK=PAPER#<arxiv_id>, SK=DETAILS (see load_data.py),
+so a list of ids maps straight to base-table keys:
+  - chunks of 100 keys (BatchGetItem limit), issued in parallel
+  - UnprocessedKeys retried with exponential backoff (not past the request
+    deadline, see admission.py)
+  - ids not found that way (tables loaded before the fixed SK existed)
+    fall back to the PaperIdIndex query, as long as DescribeTable still
+    lists that index
+"""
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeSerializer
+
+from admission import DeadlineExceeded, remaining
+from aws_clients import deserialize_item
+
+BATCH_GET_MAX = 100          # DynamoDB hard limit per BatchGetItem
+MAX_BATCH_IDS = 500          # per API request / CLI call
+DETAILS_SK = "DETAILS"
+
+# whether the PaperIdIndex fallback exists is read from DescribeTable, cached this long (seconds)
+INDEX_CACHE_TTL = float(os.environ.get("ARXIV_INDEX_CACHE_TTL", 300))
+_index_cache = {}                  # table name -> (has PaperIdIndex, checked at)
+_index_lock = threading.Lock()
+
+_ser = TypeSerializer()
+
+
+def paper_key(arxiv_id):
+    return {"PK": f"PAPER#{arxiv_id}", "SK": DETAILS_SK}
+
+def _chunks(seq, n):
+    for i in range(0, len(seq), n):
+        yield seq[i:i + n]
+
+def _get_chunk(table, keys, consistent, projection=None, max_retries=8):
+    """One BatchGetItem request (<=100 keys), retrying UnprocessedKeys."""
+    client = table.meta.client
+    request = {table.name: {
+        "Keys": [{k: _ser.serialize(v) for k, v in key.items()} for key in keys],
+        "ConsistentRead": consistent,
+        **({"ProjectionExpression": projection} if projection else {}),
+    }}
+    items = []
+    attempt = 0
+    while request:
+        resp = client.batch_get_item(RequestItems=request)
+        for raw in resp.get("Responses", {}).get(table.name, []):
+            items.append(deserialize_item(raw))
+        request = resp.get("UnprocessedKeys") or None
+        if request:
+            attempt += 1
+            if attempt > max_retries:
+                raise RuntimeError(f"BatchGetItem: {len(request[table.name]['Keys'])} keys still unprocessed")
+            delay = min(0.05 * (2 ** attempt), 2.0)
+            left = remaining()
+            if left is not None and left < delay:    # the retry could not start in time anyway
+                raise DeadlineExceeded(f"BatchGetItem: {len(request[table.name]['Keys'])} keys unprocessed "
+                                       "at the request deadline")
+            time.sleep(delay)
+    return items
+
+def _get_by_index(table, arxiv_id):
+    resp = table.query(
+        IndexName='PaperIdIndex',
+        KeyConditionExpression=Key('GSI2PK').eq(f'PAPER#{arxiv_id}'),
+        Limit=1,
+    )
+    items = resp.get("Items", [])
+    return items[0] if items else None
+
+def has_paper_id_index(table):
+    """
+    Does the table (still) have PaperIdIndex? One DescribeTable per table and
+    INDEX_CACHE_TTL. If DescribeTable fails the fallback is skipped (a 404
+    rather than a query on an index that may be gone) and retried next call.
+    """
+    now = time.monotonic()
+    with _index_lock:
+        cached = _index_cache.get(table.name)
+        if cached and now - cached[1] < INDEX_CACHE_TTL:
+            return cached[0]
+    try:
+        desc = table.meta.client.describe_table(TableName=table.name)
+    except Exception:
+        return False
+    found = any(g.get("IndexName") == "PaperIdIndex" for g in desc["Table"].get("GlobalSecondaryIndexes") or [])
+    with _index_lock:
+        _index_cache[table.name] = (found, now)
+    return found
+
+def reset_index_cache():
+    """Forget the DescribeTable results (after a load that dropped the index)."""
+    with _index_lock:
+        _index_cache.clear()
+
+def get_paper(table, arxiv_id, consistent=True, index_fallback=None):
+    """Strongly consistent GetItem on PAPER#<id>/DETAILS; PaperIdIndex only for unmigrated tables."""
+    resp = table.get_item(Key=paper_key(arxiv_id), ConsistentRead=consistent)
+    item = resp.get("Item")
+    if item is None and (has_paper_id_index(table) if index_fallback is None else index_fallback):
+        item = _get_by_index(table, arxiv_id)
+    return item
+
+def _map_in_context(pool, fn, args):
+    """pool.map, but each call runs in a copy of the caller's context (request metrics)."""
+    futures = [pool.submit(contextvars.copy_context().run, fn, a) for a in args]
+    return (f.result() for f in futures)
+
+def batch_get_papers(table, arxiv_ids, max_workers=8, consistent=False, index_fallback=None,
+                     projection=None, max_ids=MAX_BATCH_IDS):
+    """
+    Resolve many arxiv ids. Returns (papers, missing): papers in request order
+    (duplicates collapsed), missing = ids with no detail item.
+    """
+    ids = list(dict.fromkeys(a for a in arxiv_ids if a))
+    if max_ids is not None and len(ids) > max_ids:
+        raise ValueError(f"at most {max_ids} arxiv_ids per request")
+
+    found = {}
+    chunks = list(_chunks([paper_key(a) for a in ids], BATCH_GET_MAX))
+    if chunks:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+            for items in _map_in_context(pool, lambda c: _get_chunk(table, c, consistent, projection), chunks):
+                for it in items:
+                    found[it.get("arxiv_id")] = it
+
+    unresolved = [a for a in ids if a not in found]
+    if unresolved and index_fallback is None:
+        index_fallback = has_paper_id_index(table)
+    if unresolved and index_fallback:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unresolved))) as pool:
+            for a, it in zip(unresolved, _map_in_context(pool, lambda a: _get_by_index(table, a), unresolved)):
+                if it:
+                    found[a] = it
+
+    papers = [found[a] for a in ids if a in found]
+    missing = [a for a in ids if a not in found]
+    return papers, missing
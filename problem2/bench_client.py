@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Microbenchmark: resource-layer item decoding vs. aws_clients.deserialize_item.
+Allowed deps: boto3 + stdlib (json, sys, os, time)
+
+Usage:
+  python bench_client.py <papers_json_path> [--reps N]
+                         [--table TABLE --region REGION --rounds N]
+
+Offline part (no AWS needed): builds the real item set from papers.json
+(load_data.paper_items), serializes it to the wire format once, then
+times decoding every item with
+    typedeserializer   what the Table resource does per attribute (Decimal numbers)
+    lightweight        aws_clients.deserialize_item (str passthrough, int numbers)
+With --table it also times the same category Query through a default
+boto3 Table resource and through FastTable on the tuned shared client.
+"""
+
+import json
+import os
+import sys
+import time
+
+from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+from aws_clients import FastTable, deserialize_item, dynamodb_client
+from latency import summarize, timed
+
+
+def decode_bench(raw_items, reps):
+    deser = TypeDeserializer()
+    variants = {
+        "typedeserializer": lambda it: {k: deser.deserialize(v) for k, v in it.items()},
+        "lightweight": deserialize_item,
+    }
+    out = {}
+    for name, fn in variants.items():
+        t0 = time.process_time()
+        for _ in range(reps):
+            for it in raw_items:
+                fn(it)
+        out[name] = round((time.process_time() - t0) / (reps * len(raw_items)) * 1e6, 2)
+    return out
+
+def live_bench(table_name, region, category, rounds):
+    import boto3
+    resource = boto3.resource("dynamodb", region_name=region).Table(table_name)
+    fast = FastTable(dynamodb_client(region), table_name)
+    cond = Key("PK").eq(f"CATEGORY#{category}")
+    results = {}
+    for t in (resource, fast):
+        t.query(KeyConditionExpression=cond, Limit=1)  # warm up TLS + credentials
+    samples = {"resource": [], "fasttable": []}
+    for _ in range(rounds):
+        for name, t in (("resource", resource), ("fasttable", fast)):
+            samples[name].append(timed(lambda: t.query(KeyConditionExpression=cond, Limit=100)))
+    for name, s in samples.items():
+        results[name] = summarize(name, s)
+    return results
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__); sys.exit(1)
+    opts = dict(zip(sys.argv[2::2], sys.argv[3::2]))
+    import load_data
+
+    prepared = load_data.prepare_papers(load_data.load_papers_json(sys.argv[1]))
+    ser = TypeSerializer()
+    raw_items = [{k: ser.serialize(v) for k, v in it.items()}
+                 for p, kws in prepared for it in load_data.paper_items(p, kws)]
+    report = {"items": len(raw_items),
+              "decode_us_per_item": decode_bench(raw_items, int(opts.get("--reps", 20)))}
+    d = report["decode_us_per_item"]
+    report["speedup"] = round(d["typedeserializer"] / d["lightweight"], 2)
+
+    if "--table" in opts:
+        region = opts.get("--region") or os.environ.get("AWS_REGION") or "us-west-2"
+        cat = max({c for p, _ in prepared for c in p["categories"]},
+                  key=lambda c: sum(c in p["categories"] for p, _ in prepared))
+        report["query_ms"] = live_bench(opts["--table"], region, cat, int(opts.get("--rounds", 20)))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — End-to-end benchmark: synthetic corpus -> loader -> five access patterns under load.
+Allowed deps: boto3 + stdlib (json, sys, os, time, random, datetime, concurrent.futures)
+
+Usage:
+  python bench_e2e.py [--papers N] [--skew S] [--category-skew S] [--author-skew S] [--keyword-skew S]
+                      [--ops N] [--concurrency N] [--mix recent=35,get=30,author=15,keyword=12,daterange=8]
+                      [--shards N] [--seed SEED] [--out REPORT_JSON] [--baseline REPORT_JSON]
+                      [--backend local|dynamodb --table TABLE --region REGION --writers N]
+
+1. synth_corpus.generate() builds the corpus (Zipf skew per dimension).
+2. load_data.py's item builders load it: into an in-memory LocalTable by
+   default, or with --backend dynamodb into a new table (point
+   AWS_ENDPOINT_URL at DynamoDB Local to stay offline).
+3. --ops requests are drawn from the --mix weights; parameters come from a
+   random paper, so hot categories / authors / keywords are hit as often as
+   they are published. --concurrency workers run them closed-loop through
+   the same _q_* functions as query_papers.py.
+4. Per pattern: p50/p95/p99, DynamoDB calls, items read (ScannedCount) and
+   consumed read capacity per request, taken from metrics.InstrumentedTable.
+
+Same --seed + options = same corpus and request sequence, so two reports
+(e.g. before/after a schema or loader change) are directly comparable;
+--baseline prints the relative change of each number.
+"""
+
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import load_data
+import query_papers
+from latency import summarize
+from metrics import InstrumentedTable, Registry
+from synth_corpus import generate
+
+PATTERNS = ("recent", "get", "author", "keyword", "daterange")
+DEFAULT_MIX = "recent=35,get=30,author=15,keyword=12,daterange=8"
+WINDOWS_DAYS = (7, 30, 90, 365)
+
+
+def parse_mix(spec):
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in PATTERNS:
+            raise ValueError(f"unknown pattern {name!r} in --mix (expected {', '.join(PATTERNS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+def workload(prepared, ops, mix, seed):
+    """[(pattern, fn(table)), ...]; parameters follow the corpus' own popularity."""
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    ids = [p["arxiv_id"] for p, _ in prepared]
+    jobs = []
+    for pattern in rng.choices(names, weights=weights, k=ops):
+        p, keywords = rng.choice(prepared)
+        if pattern == "recent":
+            c = rng.choice(p["categories"])
+            jobs.append((pattern, lambda t, c=c: query_papers._q_recent_in_category(t, c, 20)))
+        elif pattern == "get":
+            i = rng.choice(ids)
+            jobs.append((pattern, lambda t, i=i: query_papers._q_paper_by_id(t, i)))
+        elif pattern == "author":
+            a = rng.choice(p["authors"])
+            jobs.append((pattern, lambda t, a=a: query_papers._q_papers_by_author(t, a)))
+        elif pattern == "keyword":
+            k = rng.choice(keywords) if keywords else "learning"
+            jobs.append((pattern, lambda t, k=k: query_papers._q_papers_by_keyword(t, k, 20)))
+        else:
+            c = rng.choice(p["categories"])
+            end = date.fromisoformat(p["published_date"])
+            start = end - timedelta(days=rng.choice(WINDOWS_DAYS))
+            jobs.append((pattern, lambda t, c=c, lo=start.isoformat(), hi=end.isoformat():
+                         query_papers._q_papers_in_date_range(t, c, lo, hi)))
+    return jobs
+
+def _results(out):
+    if out is None:
+        return 0
+    if isinstance(out, tuple):
+        out = out[0]
+    return len(out) if isinstance(out, list) else 1
+
+def load(papers, opts):
+    """-> (table, load report)"""
+    backend = opts.get("--backend", "local")
+    shards = int(opts.get("--shards", 1))
+    threshold = max(1, len(papers) // 50)        # shard values holding >= 2% of the corpus
+    t0 = time.perf_counter()
+    if backend == "local":
+        from local_backend import load_local_table
+        table = load_local_table(None, opts.get("--table", "arxiv-bench"), shards, threshold, papers=papers)
+        stats = {"items": table.item_count()}
+    elif backend == "dynamodb":
+        from bench_sharding import load as load_dynamodb
+        region = opts.get("--region") or os.environ.get("AWS_REGION") or "us-east-1"
+        table, _, stats = load_dynamodb(region, opts.get("--table", "arxiv-bench"), papers, shards,
+                                        int(opts.get("--writers", 4)))
+    else:
+        raise ValueError(f"unknown backend {backend!r}")
+    return table, {"backend": backend, "shards": shards, **stats,
+                   "load_seconds": round(time.perf_counter() - t0, 2)}
+
+def drive(table, jobs, concurrency, registry):
+    def one(job):
+        pattern, fn = job
+        with registry.request(pattern):
+            t0 = time.perf_counter()
+            out = fn(table)
+            return pattern, (time.perf_counter() - t0) * 1000, _results(out)
+
+    for job in jobs[:min(len(jobs), 2 * concurrency)]:     # warm-up: shard map, connections
+        with registry.request("warmup"):
+            job[1](table)
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        done = list(pool.map(one, jobs))
+    return done, time.perf_counter() - t0
+
+def report_patterns(done, registry):
+    rows = []
+    for pattern in PATTERNS:
+        samples = [ms for p, ms, _ in done if p == pattern]
+        if not samples:
+            continue
+        n = len(samples)
+        row = summarize(pattern, samples)
+        row.update({
+            "results_per_op": round(sum(r for p, _, r in done if p == pattern) / n, 2),
+            "calls_per_op": round(registry.calls.total(route=pattern) / n, 2),
+            "items_read_per_op": round(registry.items.total(route=pattern) / n, 2),
+            "rcu_per_op": round(registry.capacity.total(route=pattern) / n, 3),
+            "rcu_total": round(registry.capacity.total(route=pattern), 1),
+        })
+        rows.append(row)
+    return rows
+
+def compare(report, baseline):
+    """Relative change (%) of each per-pattern number vs. a previous report."""
+    old = {r["method"]: r for r in baseline.get("patterns", [])}
+    out = {}
+    for row in report["patterns"]:
+        prev = old.get(row["method"])
+        if not prev:
+            continue
+        out[row["method"]] = {k: round(100 * (row[k] - prev[k]) / prev[k], 1)
+                              for k in ("p50_ms", "p95_ms", "p99_ms", "items_read_per_op", "rcu_per_op")
+                              if prev.get(k)}
+    return out
+
+def main():
+    opts = dict(zip(sys.argv[1::2], sys.argv[2::2]))
+    if len(sys.argv) % 2 == 0 or any(not k.startswith("--") for k in opts):
+        print(__doc__); sys.exit(1)
+    seed = int(opts.get("--seed", 547))
+    ops = int(opts.get("--ops", 5000))
+    concurrency = int(opts.get("--concurrency", 8))
+    try:
+        mix = parse_mix(opts.get("--mix", DEFAULT_MIX))
+    except ValueError as e:
+        print(f"Error: {e}"); sys.exit(1)
+    skews = {k: float(opts[f"--{k.replace('_', '-')}"]) for k in ("category_skew", "author_skew", "keyword_skew")
+             if f"--{k.replace('_', '-')}" in opts}
+
+    t0 = time.perf_counter()
+    papers = generate(int(opts.get("--papers", 5000)), float(opts.get("--skew", 1.1)), seed, **skews)
+    gen_seconds = time.perf_counter() - t0
+    table, load_report = load(papers, opts)
+
+    registry = Registry()
+    table = InstrumentedTable(table, registry)
+    query_papers._shard_maps.clear()
+    jobs = workload(load_data.prepare_papers(papers), ops, mix, seed)
+    done, elapsed = drive(table, jobs, concurrency, registry)
+
+    report = {
+        "corpus": {"papers": len(papers), "skew": float(opts.get("--skew", 1.1)), **skews, "seed": seed,
+                   "generate_seconds": round(gen_seconds, 2)},
+        "load": load_report,
+        "run": {"ops": len(done), "concurrency": concurrency, "mix": mix,
+                "seconds": round(elapsed, 2), "ops_per_s": round(len(done) / elapsed, 1) if elapsed else 0.0},
+        "patterns": report_patterns(done, registry),
+    }
+    if "--baseline" in opts:
+        with open(opts["--baseline"], "r", encoding="utf-8") as f:
+            report["vs_baseline_pct"] = compare(report, json.load(f))
+    text = json.dumps(report, indent=2)
+    if "--out" in opts:
+        with open(opts["--out"], "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Benchmark: response bytes and serialization CPU per route.
+Allowed deps: boto3 + stdlib (json, os, sys, time)
+
+Usage:
+  python bench_encoding.py <papers_json_path> [--reps N]
+
+Builds real API payloads with api_server's q_* functions on the local
+backend (no AWS needed), then encodes each one the old way (indent=2, no
+compression) and the new ways (compact; compact + gzip; compact + deflate),
+reporting body bytes and CPU microseconds per response. A 304 answer to
+If-None-Match costs the same CPU as "compact" (the ETag needs the body)
+and sends 0 body bytes.
+"""
+
+import json
+import os
+import sys
+import time
+
+
+def measure(fn, reps):
+    t0 = time.process_time()
+    for _ in range(reps):
+        out = fn()
+    return out, (time.process_time() - t0) / reps * 1e6
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__); sys.exit(1)
+    opts = dict(zip(sys.argv[2::2], sys.argv[3::2]))
+    reps = int(opts.get("--reps", 200))
+    os.environ.setdefault("ARXIV_BACKEND", "local")
+    os.environ["ARXIV_LOCAL_DATA"] = sys.argv[1]
+    import api_server
+    import load_data
+    from http_encoding import compress, encode_json, make_etag
+
+    prepared = load_data.prepare_papers(load_data.load_papers_json(sys.argv[1]))
+    cat = max({c for p, _ in prepared for c in p["categories"]},
+              key=lambda c: sum(c in p["categories"] for p, _ in prepared))
+    author = prepared[0][0]["authors"][0]
+    kw = prepared[0][1][0] if prepared[0][1] else "learning"
+    dates = sorted(p["published_date"] for p, _ in prepared)
+    payloads = {
+        "recent": api_server.q_recent(cat, 20),
+        "author": api_server.q_author(author),
+        "get": api_server.q_get(prepared[0][0]["arxiv_id"]),
+        "search": api_server.q_search(cat, dates[0], dates[-1], 50),
+        "keyword": api_server.q_keyword(kw, 20),
+        "stats": api_server.q_stats("CATEGORY", cat),
+    }
+
+    variants = {
+        "pretty": lambda p: encode_json(p, pretty=True),
+        "compact": lambda p: encode_json(p),
+        "compact+etag": lambda p: make_etag(encode_json(p)),
+        "compact+gzip": lambda p: compress(encode_json(p), "gzip"),
+        "compact+deflate": lambda p: compress(encode_json(p), "deflate"),
+    }
+    report = {"reps": reps, "routes": []}
+    for route, payload in payloads.items():
+        row = {"route": route}
+        for name, fn in variants.items():
+            body, cpu_us = measure(lambda: fn(payload), reps)
+            if isinstance(body, bytes):
+                row[f"{name}_bytes"] = len(body)
+            row[f"{name}_cpu_us"] = round(cpu_us, 1)
+        row["bytes_saved_gzip_pct"] = round(100 * (1 - row["compact+gzip_bytes"] / row["pretty_bytes"]), 1)
+        report["routes"].append(row)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Benchmark: paper detail lookup by GetItem vs. PaperIdIndex query.
+Allowed deps: boto3 + stdlib (json, sys, os)
+
+Usage:
+  python bench_get.py <papers_json_path> <table_name> [--region REGION] [--rounds N]
+
+Each round looks up every arxiv id from papers.json once per method
+(interleaved, so both see the same warm connection pool).
+"""
+
+import json
+import os
+import sys
+
+from boto3.dynamodb.conditions import Key
+
+from aws_clients import FastTable, dynamodb_client
+from batch_get import paper_key
+from latency import summarize, timed
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__); sys.exit(1)
+    papers_path, table_name = sys.argv[1], sys.argv[2]
+    opts = dict(zip(sys.argv[3::2], sys.argv[4::2]))
+    region = opts.get("--region") or os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION") or "us-east-1"
+    rounds = int(opts.get("--rounds", 5))
+
+    with open(papers_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    papers = data["papers"] if isinstance(data, dict) else data
+    ids = [p.get("arxiv_id") for p in papers if p.get("arxiv_id")]
+
+    table = FastTable(dynamodb_client(region), table_name)
+    table.get_item(Key=paper_key(ids[0]))  # warm up TLS + credentials
+
+    get_item, get_item_ec, gsi_query = [], [], []
+    for _ in range(rounds):
+        for a in ids:
+            get_item.append(timed(lambda: table.get_item(Key=paper_key(a), ConsistentRead=True)))
+            get_item_ec.append(timed(lambda: table.get_item(Key=paper_key(a))))
+            gsi_query.append(timed(lambda: table.query(
+                IndexName='PaperIdIndex',
+                KeyConditionExpression=Key('GSI2PK').eq(f'PAPER#{a}'),
+            )))
+
+    print(json.dumps({
+        "table": table_name,
+        "ids": len(ids),
+        "rounds": rounds,
+        "results": [
+            summarize("GetItem (ConsistentRead)", get_item),
+            summarize("GetItem (eventually consistent)", get_item_ec),
+            summarize("Query PaperIdIndex", gsi_query),
+        ],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Benchmark: recent-in-category from the hot-list item vs. the partition query.
+Allowed deps: boto3 + stdlib (json, sys, random, time)
+
+Usage:
+  python bench_hot.py [--papers N] [--skew S] [--shards N] [--limits 5,10,20,25] [--reps N] [--seed SEED]
+
+Loads a synthetic corpus (synth_corpus.py) into the in-memory table the way
+load_data.py does, hot lists included, then answers the same
+recent-in-category requests (categories drawn by popularity) both ways
+through query_papers._q_recent_in_category. Per path and limit: latency
+percentiles, DynamoDB calls, items read and consumed RCU per request
+(metrics.InstrumentedTable, 4 KB units as DynamoDB bills them).
+"""
+
+import json
+import random
+import sys
+
+import hot_lists
+import load_data
+import query_papers
+from latency import summarize, timed
+from local_backend import load_local_table
+from metrics import InstrumentedTable, Registry
+from synth_corpus import generate
+
+
+def run_path(table, registry, label, use_hot, requests):
+    hot_lists.HOT_LISTS = use_hot
+    samples = []
+    with registry.request(label):
+        for cat, limit in requests:
+            samples.append(timed(lambda: query_papers._q_recent_in_category(table, cat, limit)))
+    n = len(samples)
+    row = summarize(label, samples)
+    row.update({
+        "calls_per_op": round(registry.calls.total(route=label) / n, 2),
+        "items_read_per_op": round(registry.items.total(route=label) / n, 2),
+        "rcu_per_op": round(registry.capacity.total(route=label) / n, 3),
+    })
+    return row
+
+def main():
+    opts = dict(zip(sys.argv[1::2], sys.argv[2::2]))
+    if len(sys.argv) % 2 == 0:
+        print(__doc__); sys.exit(1)
+    seed = int(opts.get("--seed", 547))
+    papers = generate(int(opts.get("--papers", 5000)), float(opts.get("--skew", 1.1)), seed)
+    shards = int(opts.get("--shards", 1))
+    raw_table = load_local_table(None, "arxiv-bench", shards, max(1, len(papers) // 50), papers=papers)
+    registry = Registry()
+    table = InstrumentedTable(raw_table, registry)
+    query_papers._shard_maps.clear()
+
+    rng = random.Random(seed)
+    prepared = load_data.prepare_papers(papers)
+    reps = int(opts.get("--reps", 500))
+    limits = [int(x) for x in opts.get("--limits", "5,10,20,25").split(",")]
+    item = raw_table.get_item(Key=hot_lists.hot_key(prepared[0][0]["categories"][0]),
+                              ReturnConsumedCapacity="TOTAL")
+    report = {"papers": len(papers), "shards": shards, "hot_list_size": hot_lists.HOT_LIST_SIZE,
+              "hot_item_rcu": item.get("ConsumedCapacity", {}).get("CapacityUnits"), "limits": []}
+
+    query_papers._q_recent_in_category(table, "cs.LG", 1)          # warm-up: shard map
+    for limit in limits:
+        requests = [(rng.choice(rng.choice(prepared)[0]["categories"]), limit) for _ in range(reps)]
+        report["limits"].append({
+            "limit": limit,
+            "hot_list": run_path(table, registry, f"hot/{limit}", True, requests),
+            "query": run_path(table, registry, f"query/{limit}", False, requests),
+        })
+    hot_lists.HOT_LISTS = True
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
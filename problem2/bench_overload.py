@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Overload test: api_server.py with and without admission control.
+Allowed deps: boto3 + stdlib (http.client, json, os, random, subprocess, sys, tempfile, threading, time)
+
+Usage:
+  python bench_overload.py [--papers N] [--latency-ms MS] [--backend-concurrency N]
+                           [--rate RPS] [--seconds S] [--timeout S] [--clients N]
+                           [--max-in-flight N] [--queue-depth N] [--queue-timeout-ms MS]
+                           [--deadline-ms MS] [--port PORT] [--seed SEED] [--out REPORT_JSON]
+
+Each scenario starts api_server.py on the local backend (synthetic corpus,
+response cache off) with a simulated table: every DynamoDB call takes
+--latency-ms and at most --backend-concurrency run at once, i.e. a table
+that serves about backend-concurrency / latency calls per second. An
+open-loop client then offers --rate requests/s (recent-in-category,
+get-by-id, keyword) for --seconds, whatever the server does: latency is
+measured from each request's scheduled send time, so a server that falls
+behind cannot hide it by slowing the client down. Requests still
+unanswered after --timeout count as client timeouts.
+
+  unprotected   ARXIV_MAX_IN_FLIGHT=0, no deadlines: every request is
+                accepted and waits behind the ones before it
+  admission     in-flight limit + short queue + deadlines (server defaults
+                unless overridden): excess load gets a fast 503
+
+Per scenario: status counts, goodput (200s per second), p50/p95/p99 of the
+successful requests and p99 over every answered request.
+"""
+
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import load_data
+from latency import summarize
+from synth_corpus import generate
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def request_paths(papers, n, seed):
+    rng = random.Random(seed)
+    prepared = load_data.prepare_papers(papers)
+    paths = []
+    for _ in range(n):
+        p, keywords = rng.choice(prepared)
+        kind = rng.random()
+        if kind < 0.4:      # limit above the hot-list size: a partition query every time
+            paths.append(f"/papers/recent?category={rng.choice(p['categories'])}&limit=50")
+        elif kind < 0.8:
+            paths.append(f"/papers/{p['arxiv_id']}")
+        else:
+            paths.append(f"/papers/keyword/{rng.choice(keywords) if keywords else 'learning'}?limit=20")
+    return paths
+
+def start_server(port, data_path, opts, env_extra):
+    env = dict(os.environ, ARXIV_BACKEND="local", ARXIV_LOCAL_DATA=data_path, CACHE_MAX_ENTRIES="0",
+               ARXIV_LOCAL_LATENCY_MS=opts.get("--latency-ms", "20"),
+               ARXIV_LOCAL_MAX_CONCURRENCY=opts.get("--backend-concurrency", "4"), **env_extra)
+    proc = subprocess.Popen([sys.executable, os.path.join(HERE, "api_server.py"), str(port)], cwd=HERE, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    t_end = time.monotonic() + 120
+    while time.monotonic() < t_end:
+        if proc.poll() is not None:
+            raise RuntimeError(f"api_server.py exited with {proc.returncode}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/cache/stats")
+            if conn.getresponse().status == 200:
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("api_server.py did not come up")
+
+def fetch(port, path, timeout):
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+        conn.request("GET", path, headers={"Accept-Encoding": "identity"})
+        resp = conn.getresponse()
+        resp.read()
+        conn.close()
+        return str(resp.status)
+    except (TimeoutError, OSError) as e:
+        return "timeout" if isinstance(e, TimeoutError) or "timed out" in str(e) else "error"
+
+def drive(port, paths, rate, clients, timeout):
+    """Open loop: request i is due at i / rate; a pool of client threads sends them."""
+    results = []
+    lock = threading.Lock()
+    cursor = iter(enumerate(paths))
+    t0 = time.monotonic()
+
+    def client():
+        while True:
+            with lock:
+                nxt = next(cursor, None)
+            if nxt is None:
+                return
+            i, path = nxt
+            due = t0 + i / rate
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            status = fetch(port, path, max(0.05, due + timeout - time.monotonic()))
+            ms = (time.monotonic() - due) * 1000
+            with lock:
+                results.append((status, ms))
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, time.monotonic() - t0
+
+def scenario(name, port, data_path, opts, env_extra, paths):
+    proc = start_server(port, data_path, opts, env_extra)
+    try:
+        for path in paths[:20]:                    # warm-up: shard map, code paths
+            fetch(port, path, 10)
+        results, elapsed = drive(port, paths, float(opts.get("--rate", 400)),
+                                 int(opts.get("--clients", 256)), float(opts.get("--timeout", 5)))
+    finally:
+        proc.terminate()
+        proc.wait()
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    ok = [ms for s, ms in results if s == "200"]
+    answered = sorted(ms for s, ms in results if s not in ("timeout", "error"))
+    row = {"scenario": name, "env": env_extra, "requests": len(results), "seconds": round(elapsed, 1),
+           "statuses": dict(sorted(statuses.items())),
+           "goodput_rps": round(len(ok) / elapsed, 1) if elapsed else 0.0,
+           "ok": summarize(name, ok) if ok else None,
+           "answered_p99_ms": round(answered[min(len(answered) - 1, int(0.99 * len(answered)))], 1)
+           if answered else None}
+    return row
+
+def main():
+    opts = dict(zip(sys.argv[1::2], sys.argv[2::2]))
+    if len(sys.argv) % 2 == 0 or any(not k.startswith("--") for k in opts):
+        print(__doc__); sys.exit(1)
+    seed = int(opts.get("--seed", 547))
+    rate, seconds = float(opts.get("--rate", 400)), float(opts.get("--seconds", 10))
+    papers = generate(int(opts.get("--papers", 5000)), 1.1, seed)
+    paths = request_paths(papers, int(rate * seconds), seed)
+    port = int(opts.get("--port", 8097))
+
+    admission_env = {k: opts[f] for k, f in (("ARXIV_MAX_IN_FLIGHT", "--max-in-flight"),
+                                              ("ARXIV_QUEUE_DEPTH", "--queue-depth"),
+                                              ("ARXIV_QUEUE_TIMEOUT_MS", "--queue-timeout-ms"),
+                                              ("ARXIV_DEADLINE_MS", "--deadline-ms")) if f in opts}
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "papers.json")
+        with open(data_path, "w", encoding="utf-8") as f:
+            json.dump(papers, f)
+        capacity = int(opts.get("--backend-concurrency", 4)) / (float(opts.get("--latency-ms", 20)) / 1000)
+        report = {"papers": len(papers), "offered_rps": rate, "seconds": seconds,
+                  "backend_capacity_calls_per_s": round(capacity, 1), "scenarios": []}
+        for name, env_extra in (("unprotected", {"ARXIV_MAX_IN_FLIGHT": "0", "ARXIV_DEADLINE_MS": "0",
+                                                 "ARXIV_DEADLINE_LONG_MS": "0"}),
+                                ("admission", admission_env)):
+            print(f"running {name} ...", file=sys.stderr)
+            report["scenarios"].append(scenario(name, port, data_path, opts, env_extra, paths))
+    text = json.dumps(report, indent=2)
+    if "--out" in opts:
+        with open(opts["--out"], "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Benchmark: the five access patterns, per backend.
+Allowed deps: boto3 + stdlib (json, sys, os, time, random)
+
+Usage:
+  python bench_query.py <papers_json_path> [--backends local,dynamodb] [--table TABLE]
+                        [--region REGION] [--rounds N] [--seed SEED]
+
+Runs recent / author / get / daterange / keyword --rounds times each with
+parameters sampled from the JSON file, through the same _q_* functions the
+CLI uses. The default backend list is just "local" (no AWS needed); add
+"dynamodb" to compare against a table that load_data.py already filled.
+"""
+
+import json
+import os
+import random
+import sys
+import time
+
+import load_data
+import query_papers
+from backend import open_table
+from latency import summarize, timed
+
+
+def workload(papers, rounds, seed):
+    """[(pattern, fn(table)), ...] with parameters drawn from the corpus."""
+    rng = random.Random(seed)
+    prepared = load_data.prepare_papers(papers)
+    cats = sorted({c for p, _ in prepared for c in p["categories"]})
+    authors = sorted({a for p, _ in prepared for a in p["authors"]})
+    ids = [p["arxiv_id"] for p, _ in prepared]
+    keywords = sorted({k for _, kws in prepared for k in kws})
+    dates = sorted(p["published_date"] for p, _ in prepared)
+
+    jobs = []
+    for _ in range(rounds):
+        c, a, i, k = rng.choice(cats), rng.choice(authors), rng.choice(ids), rng.choice(keywords)
+        lo, hi = sorted(rng.sample(dates, 2)) if len(dates) > 1 else (dates[0], dates[0])
+        jobs += [
+            ("recent", lambda t, c=c: query_papers._q_recent_in_category(t, c, 20)),
+            ("author", lambda t, a=a: query_papers._q_papers_by_author(t, a)),
+            ("get", lambda t, i=i: query_papers._q_paper_by_id(t, i)),
+            ("daterange", lambda t, c=c, lo=lo, hi=hi: query_papers._q_papers_in_date_range(t, c, lo, hi)),
+            ("keyword", lambda t, k=k: query_papers._q_papers_by_keyword(t, k, 20)),
+        ]
+    return jobs
+
+def run(backend, table_name, region, papers_path, jobs):
+    t0 = time.perf_counter()
+    table = open_table(table_name, region, backend, papers_path)
+    open_ms = (time.perf_counter() - t0) * 1000
+    query_papers._shard_maps.clear()
+    for _, fn in jobs[:5]:                        # warm-up: connections / shard map
+        fn(table)
+
+    samples = {}
+    t0 = time.perf_counter()
+    for name, fn in jobs:
+        samples.setdefault(name, []).append(timed(lambda: fn(table)))
+    elapsed = time.perf_counter() - t0
+    return {
+        "backend": backend,
+        "open_ms": round(open_ms, 1),
+        "ops_per_s": round(len(jobs) / elapsed, 1) if elapsed else 0.0,
+        "patterns": [summarize(name, s) for name, s in samples.items()],
+    }
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__); sys.exit(1)
+    papers_path = sys.argv[1]
+    opts = dict(zip(sys.argv[2::2], sys.argv[3::2]))
+    region = opts.get("--region") or os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION") or "us-east-1"
+    table_name = opts.get("--table") or os.environ.get("ARXIV_TABLE") or "arxiv-papers"
+    backends = [b.strip() for b in opts.get("--backends", "local").split(",") if b.strip()]
+    rounds = int(opts.get("--rounds", 200))
+
+    jobs = workload(load_data.load_papers_json(papers_path), rounds, int(opts.get("--seed", 547)))
+    report = {"papers_json": papers_path, "rounds": rounds, "runs": []}
+    for b in backends:
+        report["runs"].append(run(b, table_name, region, papers_path, jobs))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
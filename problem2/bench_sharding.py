@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Load test: write sharding on a skewed synthetic corpus.
+Allowed deps: boto3 + stdlib (json, sys, os, time, statistics, concurrent.futures)
+
+Usage:
+  python bench_sharding.py <table_prefix> [--region REGION] [--papers N] [--skew S]
+                           [--shards N] [--writers N] [--readers N] [--reads N] [--cleanup]
+
+Loads the same corpus twice -- <prefix>-s1 (unsharded) and <prefix>-s<N> --
+with --writers parallel writers, then runs --readers threads issuing
+--reads recent / keyword queries against the hottest category and keyword.
+Point AWS_ENDPOINT_URL at DynamoDB Local to try it without an AWS account
+(hot-partition throttling only shows up against the real service).
+"""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+
+import load_data
+import query_papers
+from latency import summarize
+from synth_corpus import generate
+
+
+def load(region, table_name, papers, shards, writers):
+    dynamodb, client = load_data.get_clients(region)
+    table = load_data.ensure_table(client, dynamodb, table_name)
+    prepared = load_data.prepare_papers(papers)
+    counts = load_data.partition_counts(prepared)
+    # shard every value holding >= 2% of the corpus
+    plan = load_data.plan_shards(counts, shards, max(1, len(prepared) // 50))
+    items = load_data.config_items(plan)
+    for p, keywords in prepared:
+        items.extend(load_data.paper_items(p, keywords, plan))
+    t0 = time.perf_counter()
+    n = load_data.write_items(table, items, region=region, writers=writers)
+    elapsed = time.perf_counter() - t0
+    return table, counts, {"items": n, "seconds": round(elapsed, 2),
+                           "items_per_s": round(n / elapsed, 1) if elapsed else 0.0,
+                           "sharded_partitions": len(plan)}
+
+def read(table, category, keyword, readers, reads):
+    def one(i):
+        t0 = time.perf_counter()
+        if i % 2:
+            query_papers._q_recent_in_category(table, category, 20)
+        else:
+            query_papers._q_papers_by_keyword(table, keyword, 20)
+        return (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=readers) as pool:
+        samples = list(pool.map(one, range(reads)))
+    elapsed = time.perf_counter() - t0
+    return {"queries_per_s": round(reads / elapsed, 1), **summarize("recent+keyword", samples)}
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__); sys.exit(1)
+    prefix = sys.argv[1]
+    args = sys.argv[2:]
+    cleanup = "--cleanup" in args
+    args = [a for a in args if a != "--cleanup"]
+    opts = dict(zip(args[::2], args[1::2]))
+    region = opts.get("--region") or os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION") or "us-east-1"
+    shards = int(opts.get("--shards", 8))
+    writers = int(opts.get("--writers", 8))
+    readers = int(opts.get("--readers", 16))
+    reads = int(opts.get("--reads", 500))
+
+    papers = generate(int(opts.get("--papers", 5000)), float(opts.get("--skew", 1.2)))
+    report = {"papers": len(papers), "shards": shards, "writers": writers, "readers": readers, "runs": []}
+    for n in (1, shards):
+        name = f"{prefix}-s{n}"
+        table, counts, write_stats = load(region, name, papers, n, writers)
+        hot_cat = max((c for c in counts.items() if c[0][0] == "CATEGORY"), key=lambda c: c[1])[0][1]
+        hot_kw = max((c for c in counts.items() if c[0][0] == "KEYWORD"), key=lambda c: c[1])[0][1]
+        query_papers._shard_maps.clear()
+        report["runs"].append({
+            "table": name,
+            "hot_category": hot_cat,
+            "hot_keyword": hot_kw,
+            "write": write_stats,
+            "read": read(table, hot_cat, hot_kw, readers, reads),
+        })
+        if cleanup:
+            boto3.client("dynamodb", region_name=region).delete_table(TableName=name)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Benchmark: full-text search latency vs. corpus size.
+Allowed deps: stdlib only (json, os, random, sys, tempfile, time)
+
+Usage:
+  python bench_text.py [--sizes 1000,5000,20000] [--queries N] [--limit K] [--seed SEED]
+
+For each size a synthetic corpus (synth_corpus.py) is indexed to a temp
+file, mmap'd, and queried with one-term, two-term AND, two-term OR and
+two-word phrase queries whose words are drawn from the corpus vocabulary
+(so hot and rare terms both show up). Reports build time, index size and
+p50/p95/p99 per query shape.
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from latency import summarize, timed
+from synth_corpus import generate
+from text_index import TextIndex, tokenize, write_index
+
+
+def queries(papers, n, rng):
+    """(shape, query, op) samples; phrases are cut from real abstracts so they match."""
+    out = []
+    for _ in range(n):
+        words = [t for _, t in tokenize(rng.choice(papers)["abstract"])]
+        a, b = rng.choice(words), rng.choice(words)
+        i = rng.randrange(len(words) - 1)
+        out += [
+            ("one_term", a, "and"),
+            ("and_2", f"{a} {b}", "and"),
+            ("or_2", f"{a} {b}", "or"),
+            ("phrase_2", f'"{words[i]} {words[i + 1]}"', "and"),
+        ]
+    return out
+
+def run(size, n_queries, limit, seed):
+    papers = generate(size, seed=seed)
+    fd, path = tempfile.mkstemp(suffix=".bin")
+    os.close(fd)
+    try:
+        t0 = time.perf_counter()
+        nbytes = write_index(papers, path)
+        build_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        idx = TextIndex(path)
+        open_ms = (time.perf_counter() - t0) * 1000
+        samples = {}
+        for shape, q, op in queries(papers, n_queries, random.Random(seed)):
+            samples.setdefault(shape, []).append(timed(lambda: idx.search(q, op, limit)))
+        terms = idx.n_terms
+        idx.close()
+    finally:
+        os.remove(path)
+    return {
+        "papers": size,
+        "terms": terms,
+        "index_bytes": nbytes,
+        "build_s": round(build_s, 2),
+        "open_ms": round(open_ms, 3),
+        "queries": [summarize(shape, s) for shape, s in samples.items()],
+    }
+
+def main():
+    if "-h" in sys.argv or "--help" in sys.argv:
+        print(__doc__); sys.exit(0)
+    opts = dict(zip(sys.argv[1::2], sys.argv[2::2]))
+    sizes = [int(s) for s in opts.get("--sizes", "1000,5000,20000").split(",") if s]
+    n, limit, seed = int(opts.get("--queries", 200)), int(opts.get("--limit", 10)), int(opts.get("--seed", 547))
+    print(json.dumps({"limit": limit, "runs": [run(s, n, limit, seed) for s in sizes]}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
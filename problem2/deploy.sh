@@ -13,6 +13,28 @@ echo "Deploying to EC2 instance: $EC2_IP"
 
 # Copy files
 scp -i "$KEY_FILE" problem2/api_server.py ec2-user@"$EC2_IP":~
+scp -i "$KEY_FILE" problem2/response_cache.py ec2-user@"$EC2_IP":~
+scp -i "$KEY_FILE" problem2/pagination.py ec2-user@"$EC2_IP":~
+scp -i "$KEY_FILE" problem2/batch_get.py ec2-user@"$EC2_IP":~
+scp -i "$KEY_FILE" problem2/fanout.py ec2-user@"$EC2_IP":~
+scp -i "$KEY_FILE" problem2/sharding.py ec2-user@"$EC2_IP":~
+scp -i "$KEY_FILE" problem2/aggregates.py ec2-user@"$EC2_IP":~
+scp -i "$KEY_FILE" problem2/hot_lists.py ec2-user@"$EC2_IP":~
+scp -i "$KEY_FILE" problem2/backend.py ec2-user@"$EC2_IP":~
+scp -i "$KEY_FILE" problem2/aws_clients.py ec2-user@"$EC2_IP":~
+scp -i "$KEY_FILE" problem2/admission.py ec2-user@"$EC2_IP":~
+scp -i "$KEY_FILE" problem2/metrics.py ec2-user@"$EC2_IP":~
+scp -i "$KEY_FILE" problem2/http_encoding.py ec2-user@"$EC2_IP":~
+scp -i "$KEY_FILE" problem2/text_index.py ec2-user@"$EC2_IP":~
+scp -i "$KEY_FILE" problem2/author_names.py ec2-user@"$EC2_IP":~
+# full-text index (python problem2/text_index.py build problem2/papers.json problem2/text_index.bin)
+if [ -f problem2/text_index.bin ]; then
+  scp -i "$KEY_FILE" problem2/text_index.bin ec2-user@"$EC2_IP":~
+fi
+# author typeahead (python problem2/author_names.py build problem2/papers.json problem2/authors_index.json)
+if [ -f problem2/authors_index.json ]; then
+  scp -i "$KEY_FILE" problem2/authors_index.json ec2-user@"$EC2_IP":~
+fi
 scp -i "$KEY_FILE" problem2/requirements.txt ec2-user@"$EC2_IP":~
 
 # Install and start
@@ -30,6 +52,7 @@ ssh -i "$KEY_FILE" ec2-user@"$EC2_IP" << 'EOF'
   # Optionally export environment
   # export AWS_REGION=us-west-2
   # export ARXIV_TABLE=arxiv-papers
+  # export ARXIV_INVALIDATE_TOKEN=<secret>   # lets remote loaders POST /cache/invalidate
 
   pkill -f api_server.py || true
   nohup python3 api_server.py 8080 > server.log 2>&1 &
@@ -37,4 +60,4 @@ ssh -i "$KEY_FILE" ec2-user@"$EC2_IP" << 'EOF'
 EOF
 
 echo "Deployment complete"
-echo "Test from local: curl \"http://$EC2_IP:8080/papers/recent?category=cs.LG&limit=5\""
+echo "Test from local: curl \"http://$EC2_IP:8080/papers/recent?category=cs.LG&limit=5&pretty=1\""
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Concurrent fan-out over several partitions with a k-way merge.
+Allowed deps: stdlib only (contextvars, heapq, concurrent.futures)
+
+"Recent papers across cs.LG, cs.NE, stat.ML" = one descending partition per
+category; a write-sharded category (sharding.py) is the same thing with one
+partition per shard. Every partition is already sorted by its SK
+(published_date#arxiv_id), so the global order is a k-way merge of the
+partition streams:
+  - the first page of every partition is fetched concurrently
+  - further pages are fetched lazily, only if the merge actually reaches them
+  - papers present in several partitions are returned once (merged_top_n)
+  - sharded_page() resumes with a next_token holding one position per shard
+"""
+
+import contextvars
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+
+from pagination import (InvalidLimit, InvalidToken, MAX_LIMIT, check_start_key, decode_cursor, encode_cursor,
+                        encode_token, iter_query_pages, query_page, query_scope)
+
+MAX_FANOUT = 20
+
+
+def _partition_stream(idx, first_page, rest_pages):
+    for it in first_page:
+        yield idx, it
+    for page in rest_pages:
+        for it in page:
+            yield idx, it
+
+def _merged(table, query_kwargs_list, sort_attr, descending, page_size=None, starts=None, max_workers=8):
+    """Yield (partition_index, item) in global sort order."""
+    starts = starts or [None] * len(query_kwargs_list)
+    pagers = [iter_query_pages(table, page_size=page_size, next_token=encode_token(start), **kw)
+              for kw, start in zip(query_kwargs_list, starts)]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pagers))) as pool:
+        # each task runs in a copy of the caller's context (request metrics follow the call)
+        futures = [pool.submit(contextvars.copy_context().run, next, g, []) for g in pagers]
+        first_pages = [f.result() for f in futures]
+    streams = [_partition_stream(i, first, rest) for i, (first, rest) in enumerate(zip(first_pages, pagers))]
+    return heapq.merge(*streams, key=lambda t: t[1].get(sort_attr) or "", reverse=descending)
+
+def merged_top_n(table, query_kwargs_list, limit, sort_attr="SK", max_workers=8):
+    """
+    Run every query in query_kwargs_list (each ScanIndexForward=False) and
+    return the first `limit` distinct papers in descending `sort_attr` order.
+    """
+    limit = int(limit)
+    if limit <= 0 or not query_kwargs_list:
+        return []
+    # a partition never contributes more than `limit` items to the answer
+    merged = _merged(table, query_kwargs_list, sort_attr, True, page_size=limit, max_workers=max_workers)
+
+    seen = set()
+    out = []
+    for _, it in merged:
+        aid = it.get("arxiv_id")
+        if aid in seen:
+            continue
+        seen.add(aid)
+        out.append(it)
+        if len(out) >= limit:
+            break
+    return out
+
+def sharded_page(table, query_kwargs_list, key_attrs, sort_attr, descending, limit=None, next_token=None):
+    """
+    query_page() over the shards of one logical partition. Each paper lives in
+    exactly one shard, so no dedup is needed. The next_token records, per
+    shard, the key of the last item consumed from it (key_attrs: table key
+    plus index key when querying a GSI).
+    """
+    if len(query_kwargs_list) == 1:
+        return query_page(table, limit, next_token, **query_kwargs_list[0])
+
+    if limit is not None and int(limit) < 1:
+        raise InvalidLimit(f"limit must be an integer in 1..{MAX_LIMIT}")
+    n = len(query_kwargs_list)
+    scope = query_scope(*query_kwargs_list)
+    state = decode_cursor(next_token)
+    if state is not None and (state.get("n") != n or not isinstance(state.get("pos"), list)
+                              or len(state["pos"]) != n):
+        raise InvalidToken("invalid next_token")
+    if state is not None and state.get("q") != scope:
+        raise InvalidToken("next_token belongs to a different query")
+    starts = state["pos"] if state else [None] * n
+    for start, kw in zip(starts, query_kwargs_list):
+        if start is not None:
+            check_start_key(start, kw)
+
+    merged = _merged(table, query_kwargs_list, sort_attr, descending,
+                     page_size=int(limit) if limit else None, starts=starts)
+    items = []
+    last = list(starts)
+    for idx, it in merged:
+        if limit is not None and len(items) >= int(limit):
+            # something is left: hand out the per-shard positions
+            return items, encode_cursor({"n": n, "pos": last, "q": scope})
+        items.append(it)
+        last[idx] = {a: it[a] for a in key_attrs}
+    return items, None
+
+def sharded_iter(table, query_kwargs_list, sort_attr, descending):
+    """all=1 / --all streaming over the shards of one logical partition."""
+    if len(query_kwargs_list) == 1:
+        for page in iter_query_pages(table, **query_kwargs_list[0]):
+            yield from page
+        return
+    for _, it in _merged(table, query_kwargs_list, sort_attr, descending):
+        yield it
+
+def split_values(raw):
+    """'cs.LG, cs.NE,,stat.ML' -> ['cs.LG', 'cs.NE', 'stat.ML'] (order kept, no duplicates)."""
+    vals = [v.strip() for v in (raw or "").split(",")]
+    return list(dict.fromkeys(v for v in vals if v))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Precomputed "latest papers" list per category (one item, one GetItem).
+Allowed deps: boto3 + stdlib (os, time)
+
+/papers/recent is the busiest route; answered from the partition it reads
+`limit` full CATEGORY_ITEMs (abstracts included). load_data.py keeps one
+small item per category instead:
+    PK=HOT#CATEGORY#<cat>   SK=LATEST
+        papers      newest HOT_LIST_SIZE entries: list fields + sort key (sk)
+        more        True when the category holds more papers than that
+        partitions  the CATEGORY partitions (shards) the list was built from
+It is rebuilt from the partitions themselves after every load, for every
+category the load touched, so delta loads and reloads keep it exact.
+
+hot_page() answers the first page of recent-in-category when limit <= the
+list size; the next_token it returns is the one sharded_page() / query_page()
+would have returned, so page 2 onwards continues on the partition query.
+Anything it cannot answer (no item, larger limit, shard layout changed)
+returns None and the caller falls back to the query.
+"""
+
+import os
+import time
+
+from fanout import merged_top_n
+from pagination import encode_cursor, encode_token, query_scope
+from sharding import shard_partitions, sharded_key
+
+# = default /papers/recent limit; set the same value for load_data.py --hot-list and the server
+HOT_LIST_SIZE = int(os.environ.get("ARXIV_HOT_LIST_SIZE", 20))
+LIST_ATTRS = ("arxiv_id", "title", "authors", "published", "categories")
+# hot lists are read unless ARXIV_HOT_LISTS=0 (e.g. to compare against the query path)
+HOT_LISTS = os.environ.get("ARXIV_HOT_LISTS", "1") not in ("0", "false", "no")
+
+_NAMES = {"#sk": "SK", **{f"#a{i}": a for i, a in enumerate(LIST_ATTRS)}}
+
+
+def hot_key(category):
+    return {"PK": f"HOT#CATEGORY#{category}", "SK": "LATEST"}
+
+def build_hot_list(table, category, partitions, size=HOT_LIST_SIZE):
+    """Newest `size` papers of a category (all its shards) -> hot-list item."""
+    from boto3.dynamodb.conditions import Key
+    # built right after the load's batch writes: an eventually consistent read could miss them
+    queries = [dict(KeyConditionExpression=Key("PK").eq(pk), ScanIndexForward=False, ConsistentRead=True,
+                    ProjectionExpression=", ".join(_NAMES), ExpressionAttributeNames=_NAMES)
+               for pk in partitions]
+    top = merged_top_n(table, queries, size + 1, sort_attr="SK")
+    return {
+        **hot_key(category),
+        "entity_type": "HOT_LIST",
+        "size": size,
+        "more": len(top) > size,
+        "partitions": list(partitions),
+        "papers": [{**{a: it.get(a) for a in LIST_ATTRS}, "sk": it["SK"]} for it in top[:size]],
+        "updated_at": int(time.time()),
+    }
+
+def category_partitions(prepared, shard_plan):
+    """Categories of a load -> {category: partition keys} under the load's shard plan."""
+    cats = sorted({c for p, _ in prepared for c in p["categories"]})
+    return {c: shard_partitions(f"CATEGORY#{c}", shard_plan.get(("CATEGORY", c), 1)) for c in cats}
+
+def refresh_hot_lists(table, partitions_by_category, size=HOT_LIST_SIZE):
+    """
+    Rebuild the hot list of every category in {category: [partition pk, ...]}.
+    size 0 deletes them instead (so a load without hot lists never leaves a stale one).
+    """
+    for category, partitions in partitions_by_category.items():
+        if size > 0:
+            table.put_item(Item=build_hot_list(table, category, partitions, size))
+        else:
+            table.delete_item(Key=hot_key(category))
+    return len(partitions_by_category)
+
+def hot_page(table, category, partitions, limit):
+    """First page of recent-in-category from the hot list: (items, next_token), or None."""
+    if not HOT_LISTS or limit is None or not 0 < int(limit) <= HOT_LIST_SIZE:
+        return None                 # larger pages can't come from the list: skip the GetItem
+    limit = int(limit)
+    item = table.get_item(Key=hot_key(category)).get("Item")
+    if not item or limit > int(item.get("size", 0)) or list(item.get("partitions") or []) != list(partitions):
+        return None
+    entries = item.get("papers") or []
+    page = entries[:limit]
+    token = None
+    if page and (len(entries) > limit or item.get("more")):
+        from boto3.dynamodb.conditions import Key
+        n = len(partitions)
+        # the scope of recent_queries(): the next page is a query_page() / sharded_page() call
+        scope = query_scope(*({"KeyConditionExpression": Key("PK").eq(pk)} for pk in partitions))
+        if n == 1:
+            token = encode_token({"PK": partitions[0], "SK": page[-1]["sk"]}, scope)
+        else:
+            # sharded_page() cursor: last key consumed from each shard
+            base = f"CATEGORY#{category}"
+            index = {pk: i for i, pk in enumerate(partitions)}
+            pos = [None] * n
+            for e in page:
+                pk = sharded_key(base, e["arxiv_id"], n)
+                pos[index[pk]] = {"PK": pk, "SK": e["sk"]}
+            token = encode_cursor({"n": n, "pos": pos, "q": scope})
+    return [{a: e.get(a) for a in LIST_ATTRS} for e in page], token
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Response encoding for api_server.py: JSON layout, compression, ETags.
+Allowed deps: stdlib only (gzip, hashlib, json, zlib)
+
+  - compact JSON by default, indent=2 only for ?pretty=1
+  - Content-Encoding gzip / deflate picked from Accept-Encoding (q-values
+    honoured, gzip preferred), skipped for bodies under MIN_COMPRESS bytes
+  - strong ETag over the uncompressed body; compressed variants get a
+    suffix ("...-gzip") so caches never mix encodings, and If-None-Match
+    accepts any variant of the same body
+"""
+
+import gzip
+import hashlib
+import json
+import zlib
+
+ENCODINGS = ("gzip", "deflate")
+MIN_COMPRESS = 1024
+COMPRESS_LEVEL = 5            # zlib 1..9: 5 is most of level 9's ratio at well under half the CPU
+
+
+def encode_json(payload, pretty=False):
+    if pretty:
+        return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def negotiate(accept_encoding):
+    """Accept-Encoding header -> "gzip" / "deflate" / None (identity)."""
+    if not accept_encoding:
+        return None
+    q = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        q[name] = weight
+    best = None
+    for enc in ENCODINGS:
+        w = q.get(enc, q.get("*", 0.0))
+        if w > 0 and (best is None or w > q.get(best, q.get("*", 0.0))):
+            best = enc
+    return best
+
+def compress(body, encoding, level=COMPRESS_LEVEL):
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    if encoding == "deflate":
+        return zlib.compress(body, level)          # HTTP "deflate" = zlib-wrapped stream
+    return body
+
+def stream_compressor(encoding, level=COMPRESS_LEVEL):
+    """zlib compressobj for a streamed body (wbits 31 = gzip framing, 15 = zlib)."""
+    if encoding not in ENCODINGS:
+        return None
+    return zlib.compressobj(level, zlib.DEFLATED, 31 if encoding == "gzip" else 15)
+
+def make_etag(body, encoding=None):
+    digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+    return f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison (RFC 9110 13.1.2), ignoring our per-encoding suffix."""
+    if not if_none_match:
+        return False
+    base = etag.strip('"').split("-", 1)[0]
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag.strip('"').split("-", 1)[0] == base:
+            return True
+    return False
+
+def prepare(payload, pretty=False, accept_encoding=None, min_size=MIN_COMPRESS):
+    """-> (body bytes, content-encoding or None, etag)."""
+    raw = encode_json(payload, pretty)
+    encoding = negotiate(accept_encoding) if len(raw) >= min_size else None
+    return compress(raw, encoding), encoding, make_etag(raw, encoding)
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Latency sample helpers shared by the benchmarks and query_papers.py batch mode.
+Allowed deps: stdlib only (statistics, time)
+
+    samples = [timed(lambda: table.get_item(...)) for _ in range(100)]
+    summarize("get_item", samples)   # {"method", "n", "mean_ms", "p50_ms", "p95_ms", "p99_ms"}
+"""
+
+import statistics
+import time
+
+
+def percentile(sorted_ms, p):
+    if not sorted_ms:
+        return 0.0
+    idx = min(len(sorted_ms) - 1, int(round(p / 100.0 * (len(sorted_ms) - 1))))
+    return sorted_ms[idx]
+
+def summarize(name, samples):
+    s = sorted(samples)
+    return {
+        "method": name,
+        "n": len(s),
+        "mean_ms": round(statistics.fmean(s), 2) if s else 0.0,
+        "p50_ms": round(percentile(s, 50), 2),
+        "p95_ms": round(percentile(s, 95), 2),
+        "p99_ms": round(percentile(s, 99), 2),
+    }
+
+def timed(fn):
+    """Milliseconds fn() took."""
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000
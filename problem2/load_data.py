@@ -9,10 +9,23 @@ import json
 import sys
 import os
 import re
+import time
 from datetime import datetime
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import Request, urlopen
 
 import boto3
+from boto3.dynamodb.conditions import Attr
+
+from aggregates import apply_deltas, count_deltas, rebuild_counters
+from aws_clients import dynamodb_client, dynamodb_resource
+from author_names import author_counts, write_index as write_author_index
+from batch_get import batch_get_papers
+from hot_lists import HOT_LIST_SIZE, category_partitions, refresh_hot_lists
+from load_profile import LoadProfiler
+from sharding import config_items, merge_plan, plan_shards, sharded_key
+from text_index import write_index
 
 STOPWORDS = {
     'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
@@ -26,29 +39,44 @@ STOPWORDS = {
 # ------------- helpers ------------- #
 
 def usage():
-    print("Usage: python load_data.py <papers_json_path> <table_name> [--region REGION]")
+    print("Usage: python load_data.py <papers_json_path> <table_name> [--region REGION]\n"
+          "                           [--invalidate-url URL]\n"
+          "                           [--migrate-details] [--no-paper-id-index]\n"
+          "                           [--shards N] [--shard-threshold ITEMS] [--writers N]\n"
+          "                           [--no-stats | --recount-aggregates] [--text-index PATH] [--author-index PATH]\n"
+          "                           [--hot-list N]   (newest N papers per category, default 20; 0 = off)\n"
+          "                           [--profile [REPORT_JSON]] [--profile-cprofile STAGE,...] [--profile-top N]")
     sys.exit(1)
 
+def parse_opts(argv, start_idx):
+    """--name VALUE / --name=VALUE options after the positional arguments."""
+    opts = {}
+    i = start_idx
+    while i < len(argv):
+        a = argv[i]
+        if a.startswith("--") and "=" in a:
+            name, value = a[2:].split("=", 1)
+            opts[name] = value; i += 1; continue
+        if a.startswith("--") and i+1 < len(argv) and not argv[i+1].startswith("--"):
+            opts[a[2:]] = argv[i+1]; i += 2; continue
+        if a.startswith("--"):
+            opts[a[2:]] = True
+        i += 1
+    return opts
+
 def parse_args(argv):
     if len(argv) < 3:
         usage()
     papers_path = argv[1]
     table_name = argv[2]
-    region = None
-    if len(argv) >= 5 and argv[3] == "--region":
-        region = argv[4]
-    elif len(argv) >= 4 and argv[3].startswith("--region"):
-        parts = argv[3].split("=", 1)
-        if len(parts) == 2:
-            region = parts[1]
+    opts = parse_opts(argv, 3)
+    region = opts.get("region")
     if region is None:
         region = os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION") or "us-west-2"
-    return papers_path, table_name, region
+    return papers_path, table_name, region, opts
 
 def get_clients(region):
-    dynamodb = boto3.resource("dynamodb", region_name=region)
-    client = boto3.client("dynamodb", region_name=region)
-    return dynamodb, client
+    return dynamodb_resource(region), dynamodb_client(region)
 
 def list_tables_contains(client, table_name):
     start = None
@@ -63,7 +91,45 @@ def list_tables_contains(client, table_name):
         if not start:
             return False
 
-def ensure_table(client, dynamodb, table_name):
+ATTRIBUTE_DEFS = [
+    {"AttributeName": "PK", "AttributeType": "S"},
+    {"AttributeName": "SK", "AttributeType": "S"},
+    {"AttributeName": "GSI1PK", "AttributeType": "S"},
+    {"AttributeName": "GSI1SK", "AttributeType": "S"},
+    {"AttributeName": "GSI2PK", "AttributeType": "S"},
+    {"AttributeName": "GSI2SK", "AttributeType": "S"},
+    {"AttributeName": "GSI3PK", "AttributeType": "S"},
+    {"AttributeName": "GSI3SK", "AttributeType": "S"},
+]
+
+def gsi_def(name, pk, sk):
+    return {
+        "IndexName": name,
+        "KeySchema": [
+            {"AttributeName": pk, "KeyType": "HASH"},
+            {"AttributeName": sk, "KeyType": "RANGE"},
+        ],
+        "Projection": {"ProjectionType": "ALL"},
+    }
+
+GSI_DEFS = {
+    "AuthorIndex":  gsi_def("AuthorIndex", "GSI1PK", "GSI1SK"),
+    "PaperIdIndex": gsi_def("PaperIdIndex", "GSI2PK", "GSI2SK"),
+    "KeywordIndex": gsi_def("KeywordIndex", "GSI3PK", "GSI3SK"),
+}
+
+def wait_for_indexes(client, table_name):
+    """table_exists only waits for the table; GSI creation/deletion takes longer."""
+    waiter = client.get_waiter('table_exists')
+    waiter.wait(TableName=table_name)
+    while True:
+        desc = client.describe_table(TableName=table_name)["Table"]
+        gsis = desc.get("GlobalSecondaryIndexes") or []
+        if desc.get("TableStatus") == "ACTIVE" and all(g.get("IndexStatus") == "ACTIVE" for g in gsis):
+            return
+        time.sleep(5)
+
+def ensure_table(client, dynamodb, table_name, paper_id_index=True):
     """
     Create table + GSIs if not exists. If exists, verify GSIs and continue.
     Keys:
@@ -71,55 +137,28 @@ def ensure_table(client, dynamodb, table_name):
       - SK (RANGE, S)
     GSIs:
       - AuthorIndex:     GSI1PK (HASH), GSI1SK (RANGE)
-      - PaperIdIndex:    GSI2PK (HASH), GSI2SK (RANGE)
+      - PaperIdIndex:    GSI2PK (HASH), GSI2SK (RANGE)  (skipped/dropped with paper_id_index=False;
+                         detail reads are GetItem on PAPER#<id>/DETAILS)
       - KeywordIndex:    GSI3PK (HASH), GSI3SK (RANGE)
     Billing: PAY_PER_REQUEST
     """
+    wanted = ["AuthorIndex", "PaperIdIndex", "KeywordIndex"]
+    if not paper_id_index:
+        wanted.remove("PaperIdIndex")
+    used_attrs = {k["AttributeName"] for name in wanted for k in GSI_DEFS[name]["KeySchema"]} | {"PK", "SK"}
+    attr_defs = [a for a in ATTRIBUTE_DEFS if a["AttributeName"] in used_attrs]
+
     if not list_tables_contains(client, table_name):
         print(f"Creating DynamoDB table: {table_name}")
         client.create_table(
             TableName=table_name,
             BillingMode="PAY_PER_REQUEST",
-            AttributeDefinitions=[
-                {"AttributeName": "PK", "AttributeType": "S"},
-                {"AttributeName": "SK", "AttributeType": "S"},
-                {"AttributeName": "GSI1PK", "AttributeType": "S"},
-                {"AttributeName": "GSI1SK", "AttributeType": "S"},
-                {"AttributeName": "GSI2PK", "AttributeType": "S"},
-                {"AttributeName": "GSI2SK", "AttributeType": "S"},
-                {"AttributeName": "GSI3PK", "AttributeType": "S"},
-                {"AttributeName": "GSI3SK", "AttributeType": "S"},
-            ],
+            AttributeDefinitions=attr_defs,
             KeySchema=[
                 {"AttributeName": "PK", "KeyType": "HASH"},
                 {"AttributeName": "SK", "KeyType": "RANGE"},
             ],
-            GlobalSecondaryIndexes=[
-                {
-                    "IndexName": "AuthorIndex",
-                    "KeySchema": [
-                        {"AttributeName": "GSI1PK", "KeyType": "HASH"},
-                        {"AttributeName": "GSI1SK", "KeyType": "RANGE"},
-                    ],
-                    "Projection": {"ProjectionType": "ALL"},
-                },
-                {
-                    "IndexName": "PaperIdIndex",
-                    "KeySchema": [
-                        {"AttributeName": "GSI2PK", "KeyType": "HASH"},
-                        {"AttributeName": "GSI2SK", "KeyType": "RANGE"},
-                    ],
-                    "Projection": {"ProjectionType": "ALL"},
-                },
-                {
-                    "IndexName": "KeywordIndex",
-                    "KeySchema": [
-                        {"AttributeName": "GSI3PK", "KeyType": "HASH"},
-                        {"AttributeName": "GSI3SK", "KeyType": "RANGE"},
-                    ],
-                    "Projection": {"ProjectionType": "ALL"},
-                },
-            ],
+            GlobalSecondaryIndexes=[GSI_DEFS[name] for name in wanted],
         )
         waiter = client.get_waiter('table_exists')
         waiter.wait(TableName=table_name)
@@ -131,58 +170,82 @@ def ensure_table(client, dynamodb, table_name):
         existing = set()
         for g in (desc["Table"].get("GlobalSecondaryIndexes") or []):
             existing.add(g["IndexName"])
-        wanted = {"AuthorIndex", "PaperIdIndex", "KeywordIndex"}
         missing = [x for x in wanted if x not in existing]
         if missing:
             print(f"Adding missing GSIs: {', '.join(missing)}")
-            gdefs = []
+            # UpdateTable accepts one GSI create per call
             for name in missing:
-                if name == "AuthorIndex":
-                    gdefs.append({
-                        "IndexName": "AuthorIndex",
-                        "KeySchema": [
-                            {"AttributeName": "GSI1PK", "KeyType": "HASH"},
-                            {"AttributeName": "GSI1SK", "KeyType": "RANGE"},
-                        ],
-                        "Projection": {"ProjectionType": "ALL"},
-                    })
-                elif name == "PaperIdIndex":
-                    gdefs.append({
-                        "IndexName": "PaperIdIndex",
-                        "KeySchema": [
-                            {"AttributeName": "GSI2PK", "KeyType": "HASH"},
-                            {"AttributeName": "GSI2SK", "KeyType": "RANGE"},
-                        ],
-                        "Projection": {"ProjectionType": "ALL"},
-                    })
-                elif name == "KeywordIndex":
-                    gdefs.append({
-                        "IndexName": "KeywordIndex",
-                        "KeySchema": [
-                            {"AttributeName": "GSI3PK", "KeyType": "HASH"},
-                            {"AttributeName": "GSI3SK", "KeyType": "RANGE"},
-                        ],
-                        "Projection": {"ProjectionType": "ALL"},
-                    })
-            client.update_table(
-                TableName=table_name,
-                AttributeDefinitions=[
-                    {"AttributeName": "PK", "AttributeType": "S"},
-                    {"AttributeName": "SK", "AttributeType": "S"},
-                    {"AttributeName": "GSI1PK", "AttributeType": "S"},
-                    {"AttributeName": "GSI1SK", "AttributeType": "S"},
-                    {"AttributeName": "GSI2PK", "AttributeType": "S"},
-                    {"AttributeName": "GSI2SK", "AttributeType": "S"},
-                    {"AttributeName": "GSI3PK", "AttributeType": "S"},
-                    {"AttributeName": "GSI3SK", "AttributeType": "S"},
-                ],
-                GlobalSecondaryIndexUpdates=[{"Create": g} for g in gdefs]
-            )
-            waiter = client.get_waiter('table_exists')
-            waiter.wait(TableName=table_name)
+                client.update_table(
+                    TableName=table_name,
+                    AttributeDefinitions=attr_defs,
+                    GlobalSecondaryIndexUpdates=[{"Create": GSI_DEFS[name]}]
+                )
+                wait_for_indexes(client, table_name)
             print("GSIs ACTIVE.")
     return dynamodb.Table(table_name)
 
+def drop_paper_id_index(client, table_name):
+    desc = client.describe_table(TableName=table_name)
+    names = {g["IndexName"] for g in (desc["Table"].get("GlobalSecondaryIndexes") or [])}
+    if "PaperIdIndex" not in names:
+        return False
+    print("Dropping PaperIdIndex (detail reads use GetItem)...")
+    client.update_table(
+        TableName=table_name,
+        GlobalSecondaryIndexUpdates=[{"Delete": {"IndexName": "PaperIdIndex"}}],
+    )
+    wait_for_indexes(client, table_name)
+    return True
+
+# written once no detail item is left at DETAILS#<date>: later loads skip the Scan below
+LAYOUT_KEY = {"PK": "META#LAYOUT", "SK": "DETAILS"}
+
+def details_migrated(table):
+    return "Item" in table.get_item(Key=LAYOUT_KEY, ConsistentRead=True)
+
+def mark_details_migrated(table):
+    table.put_item(Item={**LAYOUT_KEY, "entity_type": "LAYOUT_MARKER"})
+
+def has_legacy_details(table):
+    """Any detail item still at PAPER#<id> / DETAILS#<published_date>? (filtered Scan, stops at the first)"""
+    scan_kwargs = {
+        "FilterExpression": Attr("entity_type").eq("PAPER_ITEM") & Attr("SK").begins_with("DETAILS#"),
+        "ProjectionExpression": "PK",
+    }
+    while True:
+        resp = table.scan(**scan_kwargs)
+        if resp.get("Items"):
+            return True
+        if not resp.get("LastEvaluatedKey"):
+            return False
+        scan_kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+def migrate_detail_items(table, strip_gsi2=False):
+    """
+    Move detail items from the old PAPER#<id> / DETAILS#<published_date> key to
+    PAPER#<id> / DETAILS so they can be read with GetItem. Idempotent.
+    """
+    scan_kwargs = {
+        "FilterExpression": Attr("entity_type").eq("PAPER_ITEM") & Attr("SK").begins_with("DETAILS#"),
+    }
+    moved = 0
+    with table.batch_writer() as batch:
+        while True:
+            resp = table.scan(**scan_kwargs)
+            for it in resp.get("Items", []):
+                new = dict(it)
+                new["SK"] = "DETAILS"
+                if strip_gsi2:
+                    new.pop("GSI2PK", None)
+                    new.pop("GSI2SK", None)
+                batch.put_item(Item=new)
+                batch.delete_item(Key={"PK": it["PK"], "SK": it["SK"]})
+                moved += 1
+            if not resp.get("LastEvaluatedKey"):
+                break
+            scan_kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+    return moved
+
 def load_papers_json(path):
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
@@ -245,35 +308,61 @@ def base_fields(paper):
         "categories": paper["categories"],
     }
 
-def main():
-    papers_path, table_name, region = parse_args(sys.argv)
-    dynamodb, client = get_clients(region)
-    table = ensure_table(client, dynamodb, table_name)
+def normalize_papers(raw):
+    """Normalized papers; entries without an arxiv_id are dropped."""
+    papers = []
+    for rp in raw:
+        p = normalize_paper(rp)
+        if p["arxiv_id"]:
+            papers.append(p)
+    return papers
 
-    print(f"Loading papers from {papers_path} ...")
-    raw = load_papers_json(papers_path)
+def with_keywords(papers):
+    return [(p, extract_keywords(p["abstract"], topk=10)) for p in papers]
 
-    print("Extracting keywords from abstracts...")
-    total_papers = 0
-    items_to_write = []
-    cnt_category = 0
-    cnt_author = 0
-    cnt_keyword = 0
-    cnt_paperid = 0
+def prepare_papers(raw):
+    """Normalize + extract keywords once: [(paper, keywords), ...]."""
+    return with_keywords(normalize_papers(raw))
 
-    for rp in raw:
-        p = normalize_paper(rp)
-        if not p["arxiv_id"]:
-            continue
-        total_papers += 1
-        keywords = extract_keywords(p["abstract"], topk=10)
-
-        items_to_write.append({
-            "PK": f"PAPER#{p['arxiv_id']}",
-            "SK": f"DETAILS#{p['published_date']}",
-            "GSI2PK": f"PAPER#{p['arxiv_id']}",
-            "GSI2SK": p["published_date"],
-            "entity_type": "PAPER_ITEM",
+def partition_counts(prepared):
+    """Items per category / keyword partition, used to pick which ones to shard."""
+    counts = Counter()
+    for p, keywords in prepared:
+        for cat in p["categories"]:
+            counts[("CATEGORY", cat)] += 1
+        for kw in keywords:
+            counts[("KEYWORD", kw)] += 1
+    return counts
+
+def paper_items(p, keywords, shard_plan=None, paper_id_index=True):
+    """Every denormalized DynamoDB item for one paper."""
+    shard_plan = shard_plan or {}
+    sk = f"{p['published_date']}#{p['arxiv_id']}"
+    items = []
+
+    # fixed SK: PAPER#<id>/DETAILS is addressable without knowing the date,
+    # so batch lookups can use BatchGetItem on base-table keys
+    items.append({
+        "PK": f"PAPER#{p['arxiv_id']}",
+        "SK": "DETAILS",
+        **({"GSI2PK": f"PAPER#{p['arxiv_id']}", "GSI2SK": p["published_date"]} if paper_id_index else {}),
+        "entity_type": "PAPER_ITEM",
+        "arxiv_id": p["arxiv_id"],
+        "title": p["title"],
+        "authors": p["authors"],
+        "abstract": p["abstract"],
+        "categories": p["categories"],
+        "keywords": keywords,
+        "published": p["published"],
+        "published_date": p["published_date"],
+    })
+
+    for cat in p["categories"]:
+        n = shard_plan.get(("CATEGORY", cat), 1)
+        items.append({
+            "PK": sharded_key(f"CATEGORY#{cat}", p["arxiv_id"], n),
+            "SK": sk,
+            "entity_type": "CATEGORY_ITEM",
             "arxiv_id": p["arxiv_id"],
             "title": p["title"],
             "authors": p["authors"],
@@ -283,57 +372,194 @@ def main():
             "published": p["published"],
             "published_date": p["published_date"],
         })
-        cnt_paperid += 1
 
-        for cat in p["categories"]:
-            items_to_write.append({
-                "PK": f"CATEGORY#{cat}",
-                "SK": f"{p['published_date']}#{p['arxiv_id']}",
-                "entity_type": "CATEGORY_ITEM",
-                "arxiv_id": p["arxiv_id"],
-                "title": p["title"],
-                "authors": p["authors"],
-                "abstract": p["abstract"],
-                "categories": p["categories"],
-                "keywords": keywords,
-                "published": p["published"],
-                "published_date": p["published_date"],
-            })
-            cnt_category += 1
-
-        for author in p["authors"]:
-            items_to_write.append({
-                "PK": f"META#AUTHOR#{author}",
-                "SK": f"{p['published_date']}#{p['arxiv_id']}",
-                "GSI1PK": f"AUTOR#{author}".replace("AUTOR","AUTHOR"),  # safe guard
-                "GSI1SK": f"{p['published_date']}#{p['arxiv_id']}",
-                "entity_type": "AUTHOR_ITEM",
-                **base_fields(p),
-            })
-            cnt_author += 1
+    for author in p["authors"]:
+        items.append({
+            "PK": f"META#AUTHOR#{author}",
+            "SK": sk,
+            "GSI1PK": f"AUTHOR#{author}",
+            "GSI1SK": sk,
+            "entity_type": "AUTHOR_ITEM",
+            **base_fields(p),
+        })
 
-        for kw in keywords:
-            items_to_write.append({
-                "PK": f"META#KEYWORD#{kw}",
-                "SK": f"{p['published_date']}#{p['arxiv_id']}",
-                "GSI3PK": f"KEYWORD#{kw}",
-                "GSI3SK": f"{p['published_date']}#{p['arxiv_id']}",
-                "entity_type": "KEYWORD_ITEM",
-                **base_fields(p),
-            })
-            cnt_keyword += 1
-
-    print("Writing items to DynamoDB (batch)...")
-    total_items = 0
-    with table.batch_writer(overwrite_by_pkeys=['PK', 'SK']) as batch:
-        for it in items_to_write:
-            batch.put_item(Item=it)
-            total_items += 1
+    for kw in keywords:
+        n = shard_plan.get(("KEYWORD", kw), 1)
+        items.append({
+            "PK": sharded_key(f"META#KEYWORD#{kw}", p["arxiv_id"], n),
+            "SK": sk,
+            "GSI3PK": sharded_key(f"KEYWORD#{kw}", p["arxiv_id"], n),
+            "GSI3SK": sk,
+            "entity_type": "KEYWORD_ITEM",
+            **base_fields(p),
+        })
+    return items
+
+def loaded_papers(table, prepared):
+    """{arxiv_id: detail item} for the papers already in the table (what the counters hold for them)."""
+    ids = [p["arxiv_id"] for p, _ in prepared]
+    found, _ = batch_get_papers(table, ids, consistent=True, index_fallback=False, max_ids=None,
+                                projection="arxiv_id, authors, categories, published_date, keywords")
+    return {it["arxiv_id"]: it for it in found}
+
+def write_items(table, items, region=None, writers=1):
+    """
+    BatchWriteItem everything. writers > 1 splits the items over threads, each
+    with its own boto3 session (resources are not thread-safe); that is where
+    write sharding pays off, since one hot partition caps every writer.
+    """
+    if writers <= 1:
+        with table.batch_writer(overwrite_by_pkeys=['PK', 'SK']) as batch:
+            for it in items:
+                batch.put_item(Item=it)
+        return len(items)
+
+    def run(chunk):
+        t = dynamodb_resource(region, boto3.session.Session()).Table(table.name)
+        with t.batch_writer(overwrite_by_pkeys=['PK', 'SK']) as batch:
+            for it in chunk:
+                batch.put_item(Item=it)
+        return len(chunk)
+
+    chunks = [items[i::writers] for i in range(writers)]
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        return sum(pool.map(run, chunks))
+
+def notify_cache_invalidate(url):
+    """
+    Tell a running api_server.py that the table changed (POST /cache/invalidate).
+    Best effort: a server that is down simply has nothing cached. Sends
+    ARXIV_INVALIDATE_TOKEN (if set) as X-Invalidate-Token, as the server expects.
+    """
+    token = os.environ.get("ARXIV_INVALIDATE_TOKEN")
+    headers = {"X-Invalidate-Token": token} if token else {}
+    try:
+        with urlopen(Request(url, data=b"", method="POST", headers=headers), timeout=5) as resp:
+            print(f"Cache invalidated at {url}: {resp.read().decode('utf-8', 'replace')}")
+    except Exception as e:
+        print(f"WARNING: cache invalidation at {url} failed: {e}")
+
+def make_profiler(opts):
+    """
+    --profile [PATH]           per-stage wall / CPU time, rows, peak RSS, tracemalloc top allocators
+                               -> JSON report (default load_profile.json)
+    --profile-cprofile A,B     cProfile those stages too (PATH.<stage>.prof + top functions in the report)
+    --profile-top N            allocators per stage (default 10); 0 turns tracemalloc off for honest timings
+    """
+    path = opts.get("profile")
+    if not path:
+        return LoadProfiler(enabled=False), None
+    path = "load_profile.json" if path is True else path
+    stages = [s for s in str(opts.get("profile-cprofile") or "").split(",") if s]
+    return LoadProfiler(enabled=True, cprofile_stages=stages, tracemalloc_top=int(opts.get("profile-top", 10)),
+                        prof_prefix=os.path.splitext(path)[0]), path
+
+def main():
+    papers_path, table_name, region, opts = parse_args(sys.argv)
+    prof, profile_path = make_profiler(opts)
+    with prof.stage("connect"):
+        dynamodb, client = get_clients(region)
+        # --no-paper-id-index: detail items are read with GetItem only; don't keep the GSI
+        paper_id_index = not opts.get("no-paper-id-index")
+        table = ensure_table(client, dynamodb, table_name, paper_id_index=paper_id_index)
+
+    # a paper must never have two detail items (DETAILS#<date> from an old load + DETAILS from this
+    # one): old ones are moved before anything is written (the Scan runs until the table is marked)
+    migrated = details_migrated(table)
+    if opts.get("migrate-details") or (not migrated and has_legacy_details(table)):
+        print("Migrating detail items to PAPER#<id>/DETAILS ...")
+        with prof.stage("migrate_details") as st:
+            st.rows = migrate_detail_items(table, strip_gsi2=not paper_id_index)
+        print(f"Migrated {st.rows} detail items")
+    if not migrated:
+        mark_details_migrated(table)
+    if not paper_id_index:
+        drop_paper_id_index(client, table_name)
+
+    print(f"Loading papers from {papers_path} ...")
+    with prof.stage("parse_json") as st:
+        raw = load_papers_json(papers_path)
+        st.rows = len(raw)
+
+    print("Extracting keywords from abstracts...")
+    with prof.stage("normalize") as st:
+        papers = normalize_papers(raw)
+        st.rows = len(papers)
+    with prof.stage("keywords") as st:
+        prepared = with_keywords(papers)
+        st.rows = len(prepared)
+    total_papers = len(prepared)
+
+    # --shards N: categories / keywords with >= --shard-threshold items get N partitions
+    # values sharded by an earlier load keep their shard count; values loaded unsharded stay so
+    with prof.stage("shard_plan") as st:
+        shard_plan, kept = merge_plan(table, plan_shards(partition_counts(prepared), int(opts.get("shards", 1)),
+                                                         int(opts.get("shard-threshold", 1000))))
+        st.rows = len(shard_plan)
+    if kept:
+        print(f"WARNING: not sharding {len(kept)} values that already have unsharded items: "
+              + ", ".join(f"{k}#{v}" for k, v in kept[:10]) + (" ..." if len(kept) > 10 else ""))
+    if shard_plan:
+        print(f"Write-sharding {len(shard_plan)} hot partitions: "
+              + ", ".join(f"{k}#{v}" for k, v in sorted(shard_plan)[:10])
+              + (" ..." if len(shard_plan) > 10 else ""))
+
+    with prof.stage("build_items") as st:
+        items_to_write = config_items(shard_plan)
+        for p, keywords in prepared:
+            items_to_write.extend(paper_items(p, keywords, shard_plan, paper_id_index))
+        st.rows = len(items_to_write)
+    by_type = Counter(it["entity_type"] for it in items_to_write)
+    cnt_category = by_type["CATEGORY_ITEM"]
+    cnt_author = by_type["AUTHOR_ITEM"]
+    cnt_keyword = by_type["KEYWORD_ITEM"]
+    cnt_paperid = by_type["PAPER_ITEM"]
+
+    # counters: diff against the detail items in the table before they are overwritten
+    # (--recount-aggregates instead rebuilds every counter from a Scan after the write)
+    recount = bool(opts.get("recount-aggregates"))
+    stats = not opts.get("no-stats") and not recount
+    if stats:
+        with prof.stage("new_papers") as st:
+            loaded = loaded_papers(table, prepared)
+            deltas = count_deltas(prepared, loaded)
+            st.rows = len(prepared)
+        print(f"New papers: {total_papers - len(loaded)} of {total_papers} "
+              f"({len(loaded)} already loaded: counted as new minus old contents)")
+
+    writers = int(opts.get("writers", 1))
+    print(f"Writing items to DynamoDB (batch, {writers} writer{'s' if writers > 1 else ''})...")
+    t0 = time.perf_counter()
+    with prof.stage("write_items") as st:
+        total_items = write_items(table, items_to_write, region=region, writers=writers)
+        st.rows = total_items
+    elapsed = time.perf_counter() - t0
+
+    if stats:
+        with prof.stage("counters") as st:
+            n_counters = apply_deltas(table, deltas, workers=max(writers, 8))
+            st.rows = n_counters
+        print(f"Updated {n_counters} counter items (author / category / category-month / keyword)")
+    if recount:
+        print("Recounting all counters from the detail items ...")
+        with prof.stage("counters") as st:
+            n_papers, n_counters, n_stale = rebuild_counters(table)
+            st.rows = n_papers
+        print(f"Rebuilt {n_counters} counter items from {n_papers} papers ({n_stale} stale counters deleted)")
+
+    # --hot-list N: newest N papers per touched category in one item (hot_lists.py); 0 removes them
+    hot_size = int(opts.get("hot-list", HOT_LIST_SIZE))
+    with prof.stage("hot_lists") as st:
+        n_hot = refresh_hot_lists(table, category_partitions(prepared, shard_plan), hot_size)
+        st.rows = n_hot
+    print(f"{'Refreshed' if hot_size else 'Removed'} {n_hot} category hot lists"
+          + (f" (latest {hot_size} papers each)" if hot_size else ""))
 
     denorm_factor = (total_items / total_papers) if total_papers else 0.0
     print(f"Loaded {total_papers} papers")
     print(f"Created {total_items} DynamoDB items (denormalized)")
-    print(f"Denormalization factor: {denorm_factor:.1f}x\\n")
+    print(f"Write throughput: {total_items / elapsed if elapsed else 0.0:.0f} items/s ({elapsed:.1f}s)")
+    print(f"Denormalization factor: {denorm_factor:.1f}x\n")
     print("Storage breakdown:")
     avg = lambda c: (c / total_papers) if total_papers else 0.0
     print(f"  - Category items: {cnt_category} ({avg(cnt_category):.1f} per paper avg)")
@@ -341,6 +567,30 @@ def main():
     print(f"  - Keyword items:  {cnt_keyword} ({avg(cnt_keyword):.1f} per paper avg)")
     print(f"  - Paper ID items: {cnt_paperid} ({avg(cnt_paperid):.1f} per paper)")
 
+    # --text-index PATH: rebuild the full-text index (text_index.py) from this file
+    text_index_path = opts.get("text-index")
+    if text_index_path:
+        with prof.stage("text_index") as st:
+            size = write_index(raw, text_index_path)
+            st.rows = len(raw)
+        print(f"\nWrote full-text index {text_index_path} ({size} bytes)")
+    # --author-index PATH: {author: papers} for /authors/suggest (author_names.py)
+    author_index_path = opts.get("author-index")
+    if author_index_path:
+        with prof.stage("author_index") as st:
+            n_authors = write_author_index(author_counts(p for p, _ in prepared), author_index_path)
+            st.rows = n_authors
+        print(f"Wrote author index {author_index_path} ({n_authors} authors)")
+
+    invalidate_url = opts.get("invalidate-url") or os.environ.get("ARXIV_CACHE_INVALIDATE_URL")
+    if invalidate_url:
+        notify_cache_invalidate(invalidate_url)
+
+    if profile_path:
+        rep = prof.write(profile_path, papers=total_papers, items=total_items, writers=writers)
+        print(f"\nProfile written to {profile_path} (slowest stages: {', '.join(rep['slowest_stages'])}, "
+              f"peak RSS {rep['peak_rss_mb']} MB)")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Offline in-memory stand-in for the DynamoDB papers table.
+Allowed deps: boto3 (conditions / type (de)serializers only, no AWS calls) + stdlib + aws_clients.TableMeta
+
+LocalTable implements the subset of the boto3 Table resource the query layer
+uses, with the same semantics:
+  - PK/SK ordering (strings compare like DynamoDB's UTF-8 byte order)
+  - sparse GSIs (AuthorIndex / PaperIdIndex / KeywordIndex)
+  - Key conditions: eq, <, <=, >, >=, between, begins_with
+  - ScanIndexForward, Limit, ExclusiveStartKey / LastEvaluatedKey,
+    1 MB page cut-off, ProjectionExpression
+  - Scan with FilterExpression and Segment / TotalSegments
+  - ReturnConsumedCapacity (4 KB read units, half for eventual consistency)
+  - meta.client.batch_get_item / update_item (ADD / SET) on typed values,
+    describe_table (index names)
+  - optional simulated round trip: every read takes a fixed latency, with a
+    cap on concurrent calls (simulate(); ARXIV_LOCAL_LATENCY_MS /
+    ARXIV_LOCAL_MAX_CONCURRENCY via backend.py) for overload tests
+Items are stored in wire format and deserialized on every read, like the
+resource layer does, so client-side costs stay comparable.
+
+    table = load_local_table("papers.json")      # runs load_data's item builders
+"""
+
+import bisect
+import json
+import math
+import threading
+import time
+import zlib
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+from aws_clients import TableMeta
+
+PAGE_BYTES = 1024 * 1024
+
+GSI_KEYS = {
+    "AuthorIndex": ("GSI1PK", "GSI1SK"),
+    "PaperIdIndex": ("GSI2PK", "GSI2SK"),
+    "KeywordIndex": ("GSI3PK", "GSI3SK"),
+}
+
+_ser = TypeSerializer()
+_deser = TypeDeserializer()
+
+
+def _serialize(item):
+    return {k: _ser.serialize(v) for k, v in item.items()}
+
+def _deserialize(raw, names=None):
+    return {k: _deser.deserialize(v) for k, v in raw.items() if names is None or k in names}
+
+def _scalar(v):
+    """Typed key attribute value -> python str (all keys in this table are S)."""
+    return next(iter(v.values())) if isinstance(v, dict) else v
+
+def _item_size(raw):
+    """Approximate DynamoDB item size: attribute names + value bytes (one dumps per item)."""
+    return len(json.dumps(raw, separators=(",", ":"), ensure_ascii=False))
+
+def _projection(expr, attr_names=None):
+    if not expr:
+        return None
+    names = set()
+    for part in expr.split(","):
+        part = part.strip()
+        names.add((attr_names or {}).get(part, part))
+    return names
+
+
+# ---- condition objects (boto3.dynamodb.conditions) ---- #
+
+def _condition_holds(cond, item):
+    """Evaluate a boto3 Key()/Attr() condition against a deserialized item."""
+    if isinstance(cond, str):
+        raise NotImplementedError("local backend takes boto3 condition objects, not expression strings")
+    expr = cond.get_expression()
+    op, vals = expr["operator"], expr["values"]
+    if op == "AND":
+        return all(_condition_holds(c, item) for c in vals)
+    if op == "OR":
+        return any(_condition_holds(c, item) for c in vals)
+    if op == "NOT":
+        return not _condition_holds(vals[0], item)
+    name = vals[0].name
+    if op == "attribute_exists":
+        return name in item
+    if op == "attribute_not_exists":
+        return name not in item
+    if name not in item:
+        return False
+    v = item[name]
+    if op == "=":
+        return v == vals[1]
+    if op == "<>":
+        return v != vals[1]
+    if op == "<":
+        return v < vals[1]
+    if op == "<=":
+        return v <= vals[1]
+    if op == ">":
+        return v > vals[1]
+    if op == ">=":
+        return v >= vals[1]
+    if op == "BETWEEN":
+        return vals[1] <= v <= vals[2]
+    if op == "begins_with":
+        return isinstance(v, str) and v.startswith(vals[1])
+    if op == "contains":
+        return vals[1] in v
+    if op == "IN":
+        return v in vals[1]
+    raise NotImplementedError(f"condition operator {op} not supported by local backend")
+
+def _split_key_condition(cond, pk_name):
+    """KeyConditionExpression -> (partition value, sort-key condition or None)."""
+    expr = cond.get_expression()
+    if expr["operator"] == "AND":
+        a, b = expr["values"]
+        if a.get_expression()["values"][0].name != pk_name:
+            a, b = b, a
+        pk_value, _ = _split_key_condition(a, pk_name)
+        return pk_value, b
+    if expr["operator"] != "=" or expr["values"][0].name != pk_name:
+        raise ValueError(f"Query condition must include an equality on {pk_name}")
+    return expr["values"][1], None
+
+
+class _BatchWriter:
+    def __init__(self, table):
+        self._table = table
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        return False
+    def put_item(self, Item):
+        self._table.put_item(Item=Item)
+    def delete_item(self, Key):
+        self._table.delete_item(Key=Key)
+
+
+class LocalClient:
+    """The few low-level client calls the query layer makes (typed values)."""
+    def __init__(self):
+        self.tables = {}
+
+    def batch_get_item(self, RequestItems, ReturnConsumedCapacity=None):
+        responses, capacity = {}, []
+        for name, req in RequestItems.items():
+            t = self.tables[name]
+            t._round_trip()
+            names = _projection(req.get("ProjectionExpression"), req.get("ExpressionAttributeNames"))
+            out, size = [], 0
+            for key in req["Keys"]:
+                raw = t._get_raw(_scalar(key["PK"]), _scalar(key["SK"]))
+                if raw is not None:
+                    size += math.ceil(_item_size(raw) / 4096) * 4096   # each item rounds up to 4 KB
+                    out.append(raw if names is None else {k: v for k, v in raw.items() if k in names})
+            responses[name] = out
+            capacity.append(t._capacity(size, req.get("ConsistentRead", False)))
+        resp = {"Responses": responses, "UnprocessedKeys": {}}
+        if ReturnConsumedCapacity in ("TOTAL", "INDEXES"):
+            resp["ConsumedCapacity"] = capacity
+        return resp
+
+    def describe_table(self, TableName):
+        t = self.tables[TableName]
+        return {"Table": {"TableName": TableName, "ItemCount": t.item_count(),
+                          "GlobalSecondaryIndexes": [{"IndexName": n, "IndexStatus": "ACTIVE"} for n in GSI_KEYS]}}
+
+    def update_item(self, TableName, Key, UpdateExpression, ExpressionAttributeValues=None,
+                    ExpressionAttributeNames=None, ReturnConsumedCapacity=None, **_):
+        return self.tables[TableName]._update_raw(Key, UpdateExpression, ExpressionAttributeValues or {},
+                                                  ExpressionAttributeNames or {})
+
+
+_MAX = "\U0010ffff"
+
+def _bounds(entries, cond, tuples):
+    """[lo, hi) slice of a sorted partition matching a sort-key condition."""
+    if cond is None:
+        return 0, len(entries)
+    expr = cond.get_expression()
+    op, vals = expr["operator"], expr["values"]
+    low = (lambda x: (x,)) if tuples else (lambda x: x)
+    high = (lambda x: (x, _MAX, _MAX)) if tuples else (lambda x: x)
+    bl = lambda x: bisect.bisect_left(entries, low(x))
+    br = lambda x: bisect.bisect_right(entries, high(x))
+    if op == "=":
+        return bl(vals[1]), br(vals[1])
+    if op == "<":
+        return 0, bl(vals[1])
+    if op == "<=":
+        return 0, br(vals[1])
+    if op == ">":
+        return br(vals[1]), len(entries)
+    if op == ">=":
+        return bl(vals[1]), len(entries)
+    if op == "BETWEEN":
+        return bl(vals[1]), br(vals[2])
+    if op == "begins_with":
+        return bl(vals[1]), br(vals[1] + _MAX)
+    raise ValueError(f"unsupported sort key condition {op}")
+
+
+class LocalTable:
+    def __init__(self, name="arxiv-papers", client=None):
+        self.name = name
+        self.meta = TableMeta(client or LocalClient())
+        self.meta.client.tables[name] = self
+        self._lock = threading.RLock()
+        self._items = {}                                  # (pk, sk) -> raw item
+        self._sizes = {}                                  # (pk, sk) -> approx bytes
+        self._parts = {}                                  # pk -> sorted [sk]
+        self._gsi = {n: {} for n in GSI_KEYS}             # index -> gpk -> sorted [(gsk, pk, sk)]
+        self._scan_order = {}                             # (segment, total) -> sorted keys, reset on write
+        self._latency = 0.0                               # simulated service time per read call
+        self._slots = None                                # simulated throughput ceiling
+
+    def simulate(self, latency_s=0.0, max_concurrency=0):
+        """
+        Make every read call take latency_s, at most max_concurrency at a time
+        (0 = no cap): a remote table's round trip and its throughput ceiling,
+        so calls queue up the way they do against a throttled table.
+        """
+        self._latency = max(0.0, float(latency_s))
+        self._slots = threading.BoundedSemaphore(int(max_concurrency)) if max_concurrency > 0 else None
+        return self
+
+    def _round_trip(self):
+        if self._latency <= 0:
+            return
+        if self._slots is None:
+            time.sleep(self._latency)
+            return
+        with self._slots:
+            time.sleep(self._latency)
+
+    # ---- writes ---- #
+    def _index(self, raw, add):
+        pk, sk = _scalar(raw["PK"]), _scalar(raw["SK"])
+        part = self._parts.setdefault(pk, [])
+        i = bisect.bisect_left(part, sk)
+        if add:
+            part.insert(i, sk)
+        else:
+            del part[i]
+        for name, (gpk_attr, gsk_attr) in GSI_KEYS.items():
+            if gpk_attr in raw and gsk_attr in raw:
+                gpart = self._gsi[name].setdefault(_scalar(raw[gpk_attr]), [])
+                entry = (_scalar(raw[gsk_attr]), pk, sk)
+                j = bisect.bisect_left(gpart, entry)
+                if add:
+                    gpart.insert(j, entry)
+                else:
+                    del gpart[j]
+
+    def _put_raw(self, raw):
+        key = (_scalar(raw["PK"]), _scalar(raw["SK"]))
+        with self._lock:
+            old = self._items.get(key)
+            if old is not None:
+                self._index(old, add=False)
+            self._items[key] = raw
+            self._sizes[key] = _item_size(raw)
+            self._index(raw, add=True)
+            self._scan_order.clear()
+
+    def put_item(self, Item, **_):
+        self._put_raw(_serialize(Item))
+        return {}
+
+    def delete_item(self, Key, **_):
+        key = (Key["PK"], Key["SK"])
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._sizes.pop(key, None)
+                self._index(old, add=False)
+                self._scan_order.clear()
+        return {}
+
+    def batch_writer(self, overwrite_by_pkeys=None):
+        return _BatchWriter(self)
+
+    def _update_raw(self, key, expression, values, names):
+        pk, sk = _scalar(key["PK"]), _scalar(key["SK"])
+        with self._lock:
+            raw = dict(self._items.get((pk, sk)) or {"PK": {"S": pk}, "SK": {"S": sk}})
+            clause, pending = None, []
+            for token in expression.replace(",", " , ").split():
+                if token.upper() in ("ADD", "SET"):
+                    clause, pending = token.upper(), []
+                    continue
+                if token in (",", "="):
+                    continue
+                pending.append(names.get(token, token))
+                if len(pending) == 2:
+                    attr, ref = pending
+                    pending = []
+                    v = values[ref]
+                    if clause == "ADD" and "N" in v and attr in raw:
+                        total = _deser.deserialize(raw[attr]) + _deser.deserialize(v)
+                        raw[attr] = _ser.serialize(total)
+                    else:
+                        raw[attr] = v
+            self._put_raw(raw)
+        return {}
+
+    # ---- reads ---- #
+    def _get_raw(self, pk, sk):
+        with self._lock:
+            return self._items.get((pk, sk))
+
+    def _capacity(self, size_bytes, consistent, index=None):
+        units = max(1, math.ceil(size_bytes / 4096)) * (1.0 if consistent else 0.5)
+        cap = {"TableName": self.name, "CapacityUnits": units}
+        if index:
+            cap["GlobalSecondaryIndexes"] = {index: {"CapacityUnits": units}}
+        return cap
+
+    def get_item(self, Key, ConsistentRead=False, ProjectionExpression=None,
+                 ExpressionAttributeNames=None, ReturnConsumedCapacity=None, **_):
+        self._round_trip()
+        raw = self._get_raw(Key["PK"], Key["SK"])
+        resp = {}
+        if raw is not None:
+            resp["Item"] = _deserialize(raw, _projection(ProjectionExpression, ExpressionAttributeNames))
+        if ReturnConsumedCapacity in ("TOTAL", "INDEXES"):
+            resp["ConsumedCapacity"] = self._capacity(_item_size(raw) if raw else 0, ConsistentRead)
+        return resp
+
+    def query(self, KeyConditionExpression, IndexName=None, ScanIndexForward=True, Limit=None,
+              ExclusiveStartKey=None, ProjectionExpression=None, ExpressionAttributeNames=None,
+              FilterExpression=None, ConsistentRead=False, ReturnConsumedCapacity=None, **_):
+        if IndexName is not None and ConsistentRead:
+            raise ValueError("Consistent reads are not supported on global secondary indexes")
+        self._round_trip()
+        pk_name, sk_name = GSI_KEYS[IndexName] if IndexName else ("PK", "SK")
+        pk_value, sk_cond = _split_key_condition(KeyConditionExpression, pk_name)
+        names = _projection(ProjectionExpression, ExpressionAttributeNames)
+
+        items, scanned, size, last = [], 0, 0, None
+        with self._lock:
+            if IndexName:
+                entries = self._gsi[IndexName].get(pk_value, [])
+                key_of = lambda e: (e[1], e[2])
+                start = ExclusiveStartKey and (ExclusiveStartKey[sk_name], ExclusiveStartKey["PK"],
+                                               ExclusiveStartKey["SK"])
+            else:
+                entries = self._parts.get(pk_value, [])
+                key_of = lambda e: (pk_value, e)
+                start = ExclusiveStartKey and ExclusiveStartKey["SK"]
+            lo, hi = _bounds(entries, sk_cond, tuples=bool(IndexName))
+            if start:
+                if ScanIndexForward:
+                    lo = max(lo, bisect.bisect_right(entries, start))
+                else:
+                    hi = min(hi, bisect.bisect_left(entries, start))
+            order = range(lo, hi) if ScanIndexForward else range(hi - 1, lo - 1, -1)
+
+            for i in order:
+                key = key_of(entries[i])
+                raw = self._items[key]
+                scanned += 1
+                size += self._sizes[key]
+                item = _deserialize(raw, names if FilterExpression is None else None)
+                if FilterExpression is None or _condition_holds(FilterExpression, item):
+                    items.append(item if names is None else {k: v for k, v in item.items() if k in names})
+                if (Limit is not None and scanned >= Limit) or size >= PAGE_BYTES:
+                    if i != order[-1]:
+                        last = raw
+                    break
+
+        resp = {"Items": items, "Count": len(items), "ScannedCount": scanned}
+        if last is not None:
+            lek = {"PK": _scalar(last["PK"]), "SK": _scalar(last["SK"])}
+            if IndexName:
+                lek.update({pk_name: _scalar(last[pk_name]), sk_name: _scalar(last[sk_name])})
+            resp["LastEvaluatedKey"] = lek
+        if ReturnConsumedCapacity in ("TOTAL", "INDEXES"):
+            resp["ConsumedCapacity"] = self._capacity(size, ConsistentRead, index=IndexName)
+        return resp
+
+    def scan(self, FilterExpression=None, ExclusiveStartKey=None, Limit=None, Segment=None, TotalSegments=None,
+             ProjectionExpression=None, ExpressionAttributeNames=None, ConsistentRead=False,
+             ReturnConsumedCapacity=None, **_):
+        self._round_trip()
+        names = _projection(ProjectionExpression, ExpressionAttributeNames)
+        items, scanned, size, last = [], 0, 0, None
+        with self._lock:
+            seg = (Segment, TotalSegments) if TotalSegments else (0, 1)
+            keys = self._scan_order.get(seg)
+            if keys is None:
+                keys = sorted(k for k in self._items
+                              if seg[1] == 1 or zlib.crc32(k[0].encode("utf-8")) % seg[1] == seg[0])
+                self._scan_order[seg] = keys
+            start = bisect.bisect_right(keys, (ExclusiveStartKey["PK"], ExclusiveStartKey["SK"])) \
+                if ExclusiveStartKey else 0
+            for i in range(start, len(keys)):
+                k = keys[i]
+                raw = self._items[k]
+                scanned += 1
+                size += self._sizes[k]
+                item = _deserialize(raw, names if FilterExpression is None else None)
+                if FilterExpression is None or _condition_holds(FilterExpression, item):
+                    items.append(item if names is None else {a: v for a, v in item.items() if a in names})
+                if (Limit is not None and scanned >= Limit) or size >= PAGE_BYTES:
+                    if i != len(keys) - 1:
+                        last = k
+                    break
+
+        resp = {"Items": items, "Count": len(items), "ScannedCount": scanned}
+        if last is not None:
+            resp["LastEvaluatedKey"] = {"PK": last[0], "SK": last[1]}
+        if ReturnConsumedCapacity in ("TOTAL", "INDEXES"):
+            resp["ConsumedCapacity"] = self._capacity(size, ConsistentRead)
+        return resp
+
+    def item_count(self):
+        with self._lock:
+            return len(self._items)
+
+
+def load_local_table(papers_path, table_name="arxiv-papers", shards=1, shard_threshold=1000, papers=None):
+    """Build a LocalTable exactly as load_data.py would fill DynamoDB."""
+    import load_data
+    from aggregates import apply_deltas, count_deltas
+    from hot_lists import category_partitions, refresh_hot_lists
+    from sharding import config_items, plan_shards
+
+    raw = papers if papers is not None else load_data.load_papers_json(papers_path)
+    prepared = load_data.prepare_papers(raw)
+    plan = plan_shards(load_data.partition_counts(prepared), shards, shard_threshold)
+    table = LocalTable(table_name)
+    with table.batch_writer() as batch:
+        for it in config_items(plan):
+            batch.put_item(Item=it)
+        for p, keywords in prepared:
+            for it in load_data.paper_items(p, keywords, plan):
+                batch.put_item(Item=it)
+    apply_deltas(table, count_deltas(prepared), workers=1)
+    refresh_hot_lists(table, category_partitions(prepared, plan))
+    return table
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Request / DynamoDB metrics for api_server.py, Prometheus text format.
+Allowed deps: stdlib (bisect, contextvars, threading, time) + aws_clients.TableMeta
+
+    METRICS = Registry()
+    table = InstrumentedTable(table, METRICS)      # every Query / GetItem / Scan /
+                                                   # BatchGetItem / UpdateItem is timed,
+                                                   # asks for ReturnConsumedCapacity=INDEXES
+    with METRICS.request("/papers/{id}") as req:   # per-request DynamoDB wall time
+        ...                                        # (calls overlap under fan-out)
+    METRICS.render()                               # GET /metrics body
+
+Cost per request is a few dict updates under one lock; per-call attribution
+uses a contextvar, so worker threads must run tasks in a copy of the
+caller's context (fanout.py / batch_get.py do).
+"""
+
+import bisect
+import contextvars
+import threading
+import time
+
+from aws_clients import TableMeta
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current = contextvars.ContextVar("arxiv_request", default=None)
+
+
+def _escape(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in pairs) + "}" if pairs else ""
+
+def _num(v):
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self._values = {}
+
+    def inc(self, labels=(), value=1):
+        self._values[labels] = self._values.get(labels, 0) + value
+
+    def total(self, **match):
+        """Sum of the samples whose labels match, e.g. total(route="/papers/{id}")."""
+        want = [(self.labelnames.index(k), v) for k, v in match.items()]
+        return sum(v for labels, v in self._values.items() if all(labels[i] == x for i, x in want))
+
+    def samples(self):
+        for labels, v in sorted(self._values.items()):
+            yield self.name + _labels(self.labelnames, labels), v
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}                              # labels -> [bucket counts..., sum, count]
+
+    def observe(self, labels, value):
+        v = self._values.get(labels)
+        if v is None:
+            v = self._values[labels] = [0] * len(self.buckets) + [0.0, 0]
+        i = bisect.bisect_left(self.buckets, value)
+        if i < len(self.buckets):
+            v[i] += 1
+        v[-2] += value
+        v[-1] += 1
+
+    def samples(self):
+        for labels, v in sorted(self._values.items()):
+            cumulative = 0
+            for le, n in zip(self.buckets, v):
+                cumulative += n
+                yield self.name + "_bucket" + _labels(self.labelnames, labels, ("le", _num(le))), cumulative
+            yield self.name + "_bucket" + _labels(self.labelnames, labels, ("le", "+Inf")), v[-1]
+            yield self.name + "_sum" + _labels(self.labelnames, labels), round(v[-2], 6)
+            yield self.name + "_count" + _labels(self.labelnames, labels), v[-1]
+
+
+class Collected:
+    """Values read from somewhere else (cache counters) at scrape time."""
+    def __init__(self, name, kind, help_text, labelnames, fn):
+        self.name, self.kind, self.help, self.labelnames, self._fn = name, kind, help_text, tuple(labelnames), fn
+
+    def samples(self):
+        for labels, v in sorted(self._fn().items()):
+            yield self.name + _labels(self.labelnames, labels), v
+
+
+class RequestStats:
+    """DynamoDB wall time of one request: time with at least one call in flight."""
+    def __init__(self, route):
+        self.route = route
+        self._lock = threading.Lock()
+        self._active = 0
+        self._since = 0.0
+        self.dynamodb_seconds = 0.0
+        self.calls = 0
+
+    def call_started(self):
+        with self._lock:
+            if self._active == 0:
+                self._since = time.perf_counter()
+            self._active += 1
+            self.calls += 1
+
+    def call_finished(self):
+        with self._lock:
+            self._active -= 1
+            if self._active == 0:
+                self.dynamodb_seconds += time.perf_counter() - self._since
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = []
+        self.requests = self.counter("arxiv_http_requests_total", "HTTP requests by route and status",
+                                     ("route", "method", "status"))
+        self.latency = self.histogram("arxiv_http_request_seconds", "Total request time",
+                                      ("route",))
+        self.dynamodb = self.histogram("arxiv_request_dynamodb_seconds",
+                                       "Wall time with a DynamoDB call in flight, per request", ("route",))
+        self.serialize = self.histogram("arxiv_request_serialize_seconds",
+                                        "JSON encoding + compression + socket write time, per request", ("route",))
+        self.response_bytes = self.counter("arxiv_http_response_bytes_total", "Response body bytes on the wire",
+                                           ("route", "encoding"))
+        self.calls = self.counter("arxiv_dynamodb_calls_total", "DynamoDB API calls",
+                                  ("route", "op", "index"))
+        self.call_latency = self.histogram("arxiv_dynamodb_call_seconds", "Latency of single DynamoDB calls",
+                                           ("op",))
+        self.capacity = self.counter("arxiv_dynamodb_consumed_capacity_total",
+                                     "Consumed read/write capacity units (ReturnConsumedCapacity)",
+                                     ("route", "op", "index"))
+        self.items = self.counter("arxiv_dynamodb_items_read_total",
+                                  "Items read (ScannedCount for Query/Scan, items returned for Get/BatchGet)",
+                                  ("route", "op", "index"))
+        self.errors = self.counter("arxiv_dynamodb_errors_total", "DynamoDB calls that raised", ("op",))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._add(Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._add(Histogram(name, help_text, labelnames, buckets))
+
+    def collect(self, name, kind, help_text, labelnames, fn):
+        return self._add(Collected(name, kind, help_text, labelnames, fn))
+
+    # ---- recording ---- #
+    def request(self, route):
+        return _RequestScope(route)
+
+    def finish_request(self, stats, method, status, total, serialize, body_bytes=0, encoding=None):
+        with self._lock:
+            self.requests.inc((stats.route, method, str(status)))
+            self.response_bytes.inc((stats.route, encoding or "identity"), body_bytes)
+            self.latency.observe((stats.route,), total)
+            self.dynamodb.observe((stats.route,), stats.dynamodb_seconds)
+            self.serialize.observe((stats.route,), serialize)
+
+    def record_call(self, op, index, seconds, capacity, failed=False, items=0):
+        req = _current.get()
+        route = req.route if req is not None else "-"
+        with self._lock:
+            self.calls.inc((route, op, index or ""))
+            self.call_latency.observe((op,), seconds)
+            if failed:
+                self.errors.inc((op,))
+            for idx, units in capacity:
+                self.capacity.inc((route, op, idx), units)
+            if items:
+                self.items.inc((route, op, index or ""), items)
+
+    def render(self):
+        out = []
+        with self._lock:
+            for m in self._metrics:
+                out.append(f"# HELP {m.name} {m.help}")
+                out.append(f"# TYPE {m.name} {m.kind}")
+                out.extend(f"{name} {_num(v)}" for name, v in m.samples())
+        return "\n".join(out) + "\n"
+
+
+class _RequestScope:
+    def __init__(self, route):
+        self.stats = RequestStats(route)
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current.set(self.stats)
+        return self.stats
+
+    def __exit__(self, *exc):
+        _current.reset(self._token)
+        return False
+
+
+# ---- DynamoDB call wrappers ---- #
+
+def _capacity_entries(consumed):
+    """ConsumedCapacity (dict or list) -> [(index or "", units), ...]."""
+    out = []
+    for cc in consumed if isinstance(consumed, list) else [consumed]:
+        gsis = cc.get("GlobalSecondaryIndexes") or {}
+        if "Table" in cc:
+            out.append(("", cc["Table"].get("CapacityUnits", 0.0)))
+        elif not gsis:
+            out.append(("", cc.get("CapacityUnits", 0.0)))
+        out.extend((name, v.get("CapacityUnits", 0.0)) for name, v in gsis.items())
+    return [(idx, units) for idx, units in out if units]
+
+def _items_read(resp):
+    if "ScannedCount" in resp:
+        return resp["ScannedCount"]
+    if "Responses" in resp:
+        return sum(len(v) for v in resp["Responses"].values())
+    return 1 if resp.get("Item") else 0
+
+def _timed_call(registry, op, index, fn, kwargs):
+    kwargs.setdefault("ReturnConsumedCapacity", "INDEXES")
+    req = _current.get()
+    if req is not None:
+        req.call_started()
+    t0 = time.perf_counter()
+    try:
+        resp = fn(**kwargs)
+    except Exception:
+        registry.record_call(op, index, time.perf_counter() - t0, [], failed=True)
+        raise
+    finally:
+        if req is not None:
+            req.call_finished()
+    registry.record_call(op, index, time.perf_counter() - t0, _capacity_entries(resp.get("ConsumedCapacity") or []),
+                         items=_items_read(resp))
+    return resp
+
+
+class _InstrumentedClient:
+    def __init__(self, client, registry):
+        self._client = client
+        self._registry = registry
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def batch_get_item(self, **kwargs):
+        return _timed_call(self._registry, "BatchGetItem", None, self._client.batch_get_item, kwargs)
+
+    def update_item(self, **kwargs):
+        return _timed_call(self._registry, "UpdateItem", None, self._client.update_item, kwargs)
+
+
+class InstrumentedTable:
+    """Same interface as a boto3 Table (or LocalTable); reads are timed and capacity-tracked."""
+    def __init__(self, table, registry):
+        self._table = table
+        self._registry = registry
+        self.name = table.name
+        self.meta = TableMeta(_InstrumentedClient(table.meta.client, registry), table.meta)
+
+    def __getattr__(self, name):
+        return getattr(self._table, name)
+
+    def query(self, **kwargs):
+        return _timed_call(self._registry, "Query", kwargs.get("IndexName"), self._table.query, kwargs)
+
+    def get_item(self, **kwargs):
+        return _timed_call(self._registry, "GetItem", None, self._table.get_item, kwargs)
+
+    def scan(self, **kwargs):
+        return _timed_call(self._registry, "Scan", kwargs.get("IndexName"), self._table.scan, kwargs)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Cursor pagination helpers shared by api_server.py and query_papers.py.
+Allowed deps: stdlib only (base64, hashlib, json)
+
+DynamoDB stops a Query after 1 MB (or Limit items) and returns LastEvaluatedKey.
+These helpers follow it so results are never silently truncated:
+  - query_page():       up to `limit` items + opaque next_token for the rest
+  - iter_query_pages(): generator of pages, for "fetch all" streaming
+  - iter_json_envelope(): write {"...": ..., "papers": [..stream..], "count": N}
+                          without holding every item in memory
+
+A next_token is bound to the query that produced it (query_scope(): index +
+key condition), so a token from another route, category or date range is
+an InvalidToken (400) instead of a bad ExclusiveStartKey.
+"""
+
+import base64
+import hashlib
+import json
+
+MAX_LIMIT = 1000
+
+
+class InvalidToken(ValueError):
+    """next_token could not be decoded (tampered, truncated, wrong route)."""
+
+
+class InvalidLimit(ValueError):
+    """limit is not an integer in 1..MAX_LIMIT."""
+
+
+def parse_limit(raw, default=None, maximum=MAX_LIMIT):
+    """?limit= / --limit value -> int in 1..maximum; default when absent (None = no limit)."""
+    if raw is None or raw == "":
+        return default
+    try:
+        limit = int(raw)
+    except (TypeError, ValueError):
+        raise InvalidLimit(f"limit must be an integer in 1..{maximum}")
+    if not 1 <= limit <= maximum:
+        raise InvalidLimit(f"limit must be an integer in 1..{maximum}")
+    return limit
+
+
+def encode_cursor(state):
+    """Any JSON-able dict -> opaque url-safe string."""
+    if not state:
+        return None
+    raw = json.dumps(state, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(token):
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except Exception:
+        raise InvalidToken("invalid next_token")
+    if not isinstance(state, dict):
+        raise InvalidToken("invalid next_token")
+    return state
+
+def _condition_terms(cond, names, values):
+    """Attribute names and values of a boto3 key condition (Key('PK').eq(...) & ...)."""
+    for v in cond.get_expression()["values"]:
+        if hasattr(v, "get_expression"):
+            _condition_terms(v, names, values)
+        elif hasattr(v, "name"):
+            names.append(v.name)
+        else:
+            values.append(str(v))
+
+def query_scope(*query_kwargs):
+    """Short digest of the queries a token pages through (index + key condition of each)."""
+    parts = []
+    for kw in query_kwargs:
+        names, values = [], []
+        _condition_terms(kw["KeyConditionExpression"], names, values)
+        parts.append([kw.get("IndexName") or "", names, values])
+    raw = json.dumps(parts, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+def check_start_key(key, query_kwargs):
+    """A LastEvaluatedKey for this query: table key, plus the index key on a GSI, all strings."""
+    names, values = [], []
+    _condition_terms(query_kwargs["KeyConditionExpression"], names, values)
+    need = {"PK", "SK", *names}
+    if not isinstance(key, dict) or not need <= set(key) \
+            or len(key) != (4 if query_kwargs.get("IndexName") else 2) \
+            or not all(isinstance(v, str) for v in key.values()):
+        raise InvalidToken("invalid next_token")
+    return key
+
+def encode_token(last_evaluated_key, scope=None):
+    if scope is None or not last_evaluated_key:
+        return encode_cursor(last_evaluated_key)
+    return encode_cursor({"q": scope, "key": last_evaluated_key})
+
+def decode_token(token, scope=None):
+    state = decode_cursor(token)
+    if state is None or scope is None:
+        if state is not None and not all(isinstance(v, str) for v in state.values()):
+            raise InvalidToken("invalid next_token")
+        return state
+    if state.get("q") != scope:
+        raise InvalidToken("next_token belongs to a different query")
+    return state.get("key")
+
+
+def query_page(table, limit=None, next_token=None, **query_kwargs):
+    """
+    Run table.query(**query_kwargs), following LastEvaluatedKey until `limit`
+    items are collected (or the partition is exhausted when limit is None).
+    Returns (items, next_token); next_token is None when there is nothing left.
+    """
+    if limit is not None and int(limit) < 1:
+        raise InvalidLimit(f"limit must be an integer in 1..{MAX_LIMIT}")
+    scope = query_scope(query_kwargs)
+    items = []
+    start_key = decode_token(next_token, scope)
+    if start_key is not None:
+        check_start_key(start_key, query_kwargs)
+    while True:
+        kwargs = dict(query_kwargs)
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+        if limit is not None:
+            kwargs["Limit"] = int(limit) - len(items)
+        resp = table.query(**kwargs)
+        items.extend(resp.get("Items", []))
+        start_key = resp.get("LastEvaluatedKey")
+        if not start_key or (limit is not None and len(items) >= int(limit)):
+            break
+    return items, encode_token(start_key, scope)
+
+def iter_query_pages(table, page_size=None, next_token=None, **query_kwargs):
+    """Yield each page of items as soon as DynamoDB returns it."""
+    start_key = decode_token(next_token)
+    while True:
+        kwargs = dict(query_kwargs)
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+        if page_size:
+            kwargs["Limit"] = int(page_size)
+        resp = table.query(**kwargs)
+        yield resp.get("Items", [])
+        start_key = resp.get("LastEvaluatedKey")
+        if not start_key:
+            return
+
+
+def iter_json_envelope(head, list_key, items, tail=None, indent=None):
+    """
+    Yield str chunks forming json.dumps({**head, list_key: [*items], **tail()}).
+    `items` may be a generator; `tail` is called after it is exhausted and
+    receives the item count (e.g. to add "count" / "execution_time_ms").
+    """
+    seps = None if indent else (",", ":")
+    dump = lambda v: json.dumps(v, ensure_ascii=False, default=str, separators=seps)
+    nl = "\n" if indent else ""
+    pad = " " * (indent or 0)
+    sep = ": " if indent else ":"
+    yield "{" + nl
+    for k, v in head.items():
+        yield f"{pad}{dump(k)}{sep}{dump(v)},{nl}"
+    yield f"{pad}{dump(list_key)}{sep}[{nl}"
+    n = 0
+    for it in items:
+        yield ("," + nl if n else "") + pad * 2 + dump(it)
+        n += 1
+    yield f"{nl}{pad}]"
+    for k, v in (tail(n) if tail else {}).items():
+        yield f",{nl}{pad}{dump(k)}{sep}{dump(v)}"
+    yield nl + "}"
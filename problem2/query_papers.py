@@ -2,15 +2,25 @@
 # -*- coding: utf-8 -*-
 """
 HW3 Problem 2 — Part C: Query implementations for 5 access patterns.
-Allowed deps: boto3 + stdlib (json, sys, os, datetime, time)
+Allowed deps: boto3 + stdlib (json, sys, os, datetime, time, shlex, concurrent.futures)
+
+boto3 (and the modules that import it: batch_get, sharding) is imported
+lazily, so usage errors and --help return without paying ~0.3 s of imports.
 """
 
 import json
 import sys
 import os
+import shlex
 import time
-from boto3.dynamodb.conditions import Key
-import boto3
+from concurrent.futures import ThreadPoolExecutor
+
+_T_START = time.perf_counter()
+
+from aggregates import get_count
+from backend import open_table
+from fanout import MAX_FANOUT, merged_top_n, sharded_iter, sharded_page, split_values
+from pagination import InvalidToken, decode_cursor, iter_json_envelope, parse_limit, query_page
 
 
 # ------------ pretty print + timing ------------ #
@@ -20,6 +30,19 @@ def pretty_print(payload):
     sys.stdout.write(json.dumps(payload, ensure_ascii=False, indent=2) + "\n")
     sys.stdout.flush()
 
+def stream_print(query_type, parameters, table, queries, sort_attr="SK", descending=True):
+    """--all: print results page by page as they arrive instead of buffering."""
+    t0 = time.perf_counter()
+    def results():
+        for it in sharded_iter(table, queries, sort_attr, descending):
+            yield clean_item(it)
+    tail = lambda n: {"count": n, "execution_time_ms": int((time.perf_counter() - t0) * 1000)}
+    for chunk in iter_json_envelope({"query_type": query_type, "parameters": parameters},
+                                    "results", results(), tail=tail, indent=2):
+        sys.stdout.write(chunk)
+        sys.stdout.flush()
+    sys.stdout.write("\n")
+
 
 class Timer:
     """计算执行耗时（毫秒）。"""
@@ -45,50 +68,315 @@ def getenv_region():
 def getenv_table(default=None):
     return os.environ.get("ARXIV_TABLE") or default
 
-def get_table(table_name, region):
-    return boto3.resource("dynamodb", region_name=region).Table(table_name)
+def get_table(table_name, region, backend=None, data_path=None):
+    return open_table(table_name, region, backend, data_path)
 
 
 # ------------ queries (raw) ------------ #
+# Each list query follows LastEvaluatedKey (see pagination.py) and returns
+# (items, next_token); the *_queries() builders are shared with --all streaming.
+# Category / keyword partitions may be write-sharded (sharding.py): one query per shard.
+
+BASE_KEY = ("PK", "SK")
+KEYWORD_KEY = ("PK", "SK", "GSI3PK", "GSI3SK")
+_shard_maps = {}
+
+def _partitions(table, kind, value):
+    from sharding import ShardMap
+    if id(table) not in _shard_maps:
+        _shard_maps[id(table)] = ShardMap(table)
+    return _shard_maps[id(table)].partitions(kind, value)
+
+def _recent_queries(table, category):
+    from boto3.dynamodb.conditions import Key
+    return [dict(KeyConditionExpression=Key('PK').eq(pk), ScanIndexForward=False)
+            for pk in _partitions(table, "CATEGORY", category)]
+
+def _author_queries(table, author_name):
+    from boto3.dynamodb.conditions import Key
+    return [dict(IndexName='AuthorIndex',
+                 KeyConditionExpression=Key('GSI1PK').eq(f'AUTHOR#{author_name}'))]
+
+def _date_range_queries(table, category, start_date, end_date):
+    from boto3.dynamodb.conditions import Key
+    return [dict(KeyConditionExpression=Key('PK').eq(pk) &
+                                        Key('SK').between(f'{start_date}#', f'{end_date}#zzzzzzz'))
+            for pk in _partitions(table, "CATEGORY", category)]
+
+def _keyword_queries(table, keyword):
+    from boto3.dynamodb.conditions import Key
+    return [dict(IndexName='KeywordIndex',
+                 KeyConditionExpression=Key('GSI3PK').eq(pk),
+                 ScanIndexForward=False)
+            for pk in _partitions(table, "KEYWORD", keyword.lower())]
+
+def _q_recent_in_category(table, category, limit=20, next_token=None):
+    from hot_lists import hot_page
+    hot = None if next_token else hot_page(table, category, _partitions(table, "CATEGORY", category), limit)
+    return hot or sharded_page(table, _recent_queries(table, category), BASE_KEY, "SK", True, limit, next_token)
+
+def _q_papers_by_author(table, author_name, limit=None, next_token=None):
+    return query_page(table, limit, next_token, **_author_queries(table, author_name)[0])
 
-def _q_recent_in_category(table, category, limit=20):
-    resp = table.query(
-        KeyConditionExpression=Key('PK').eq(f'CATEGORY#{category}'),
-        ScanIndexForward=False,
-        Limit=int(limit)
-    )
-    return resp.get('Items', [])
+def _q_paper_by_id(table, arxiv_id):
+    from batch_get import get_paper
+    return get_paper(table, arxiv_id)
 
-def _q_papers_by_author(table, author_name):
-    resp = table.query(
-        IndexName='AuthorIndex',
-        KeyConditionExpression=Key('GSI1PK').eq(f'AUTHOR#{author_name}')
-    )
-    return resp.get('Items', [])
+def _q_papers_in_date_range(table, category, start_date, end_date, limit=None, next_token=None):
+    return sharded_page(table, _date_range_queries(table, category, start_date, end_date),
+                        BASE_KEY, "SK", False, limit, next_token)
 
-def _q_paper_by_id(table, arxiv_id):
-    resp = table.query(
-        IndexName='PaperIdIndex',
-        KeyConditionExpression=Key('GSI2PK').eq(f'PAPER#{arxiv_id}')
-    )
-    items = resp.get('Items', [])
-    return items[0] if items else None
+def _q_papers_by_keyword(table, keyword, limit=20, next_token=None):
+    return sharded_page(table, _keyword_queries(table, keyword), KEYWORD_KEY, "GSI3SK", True, limit, next_token)
 
-def _q_papers_in_date_range(table, category, start_date, end_date):
-    resp = table.query(
-        KeyConditionExpression=Key('PK').eq(f'CATEGORY#{category}') &
-                               Key('SK').between(f'{start_date}#', f'{end_date}#zzzzzzz')
-    )
-    return resp.get('Items', [])
-
-def _q_papers_by_keyword(table, keyword, limit=20):
-    resp = table.query(
-        IndexName='KeywordIndex',
-        KeyConditionExpression=Key('GSI3PK').eq(f'KEYWORD#{keyword.lower()}'),
-        ScanIndexForward=False,
-        Limit=int(limit)
-    )
-    return resp.get('Items', [])
+def _q_recent_in_categories(table, categories, limit=20):
+    queries = [q for c in categories for q in _recent_queries(table, c)]
+    return merged_top_n(table, queries, limit, sort_attr="SK")
+
+def _q_papers_by_any_keyword(table, keywords, limit=20):
+    queries = [q for k in keywords for q in _keyword_queries(table, k)]
+    return merged_top_n(table, queries, limit, sort_attr="GSI3SK")
+
+
+# ------------ commands ------------ #
+# run_command() is shared by the one-shot CLI and batch mode; it returns the
+# payload instead of printing it.
+
+class UsageError(ValueError):
+    pass
+
+MIN_ARGS = {"recent": 1, "author": 1, "get": 1, "getmany": 0, "daterange": 3, "keyword": 1,
+            "stats": 2, "recent-multi": 1, "keyword-any": 1}
+STREAM_COMMANDS = ("recent", "author", "daterange", "keyword")
+
+def check_command(cmd, args):
+    if cmd not in MIN_ARGS or len(args) < MIN_ARGS[cmd]:
+        raise UsageError(f"usage: {cmd} needs {MIN_ARGS.get(cmd, '?')} argument(s)" if cmd in MIN_ARGS
+                         else f"unknown command {cmd!r}")
+
+def _list_payload(query_type, parameters, raw, t, token=False, **extra):
+    results = [clean_item(it) for it in raw]
+    out = {"query_type": query_type, "parameters": parameters, "results": results, "count": len(results)}
+    if token is not False:
+        out["next_token"] = token
+    out.update(extra)
+    out["execution_time_ms"] = t.ms
+    return out
+
+def run_command(table, cmd, args, opts):
+    check_command(cmd, args)
+    next_token = opts.get("next_token")
+    decode_cursor(next_token)
+
+    if cmd == "recent":
+        category = args[0]
+        limit = parse_limit(opts.get("limit"), 20)
+        with Timer() as t:
+            raw, token = _q_recent_in_category(table, category, limit, next_token)
+        return _list_payload("recent_in_category", {"category": category, "limit": limit}, raw, t, token)
+
+    if cmd == "author":
+        author = args[0]
+        limit = parse_limit(opts.get("limit"))
+        with Timer() as t:
+            raw, token = _q_papers_by_author(table, author, limit, next_token)
+        return _list_payload("papers_by_author", {"author": author, "limit": limit}, raw, t, token)
+
+    if cmd == "get":
+        arxiv_id = args[0]
+        with Timer() as t:
+            one = _q_paper_by_id(table, arxiv_id)
+        return _list_payload("paper_by_id", {"arxiv_id": arxiv_id}, [one] if one else [], t)
+
+    # batch get by ids
+    if cmd == "getmany":
+        from batch_get import MAX_BATCH_IDS, batch_get_papers
+        ids = list(args)
+        if "file" in opts:
+            with open(opts["file"], "r", encoding="utf-8") as f:
+                ids += [line.strip() for line in f if line.strip()]
+        if not ids or len(ids) > MAX_BATCH_IDS:
+            raise UsageError(f"getmany takes 1..{MAX_BATCH_IDS} ids")
+        with Timer() as t:
+            found, missing = batch_get_papers(table, ids)
+        return _list_payload("papers_by_ids", {"arxiv_ids": ids}, found, t, missing=missing)
+
+    if cmd == "daterange":
+        category, start_date, end_date = args[:3]
+        params = {"category": category, "start_date": start_date, "end_date": end_date}
+        limit = parse_limit(opts.get("limit"))
+        with Timer() as t:
+            raw, token = _q_papers_in_date_range(table, category, start_date, end_date, limit, next_token)
+        return _list_payload("daterange_in_category", {**params, "limit": limit}, raw, t, token)
+
+    if cmd == "keyword":
+        kw = args[0]
+        limit = parse_limit(opts.get("limit"), 20)
+        with Timer() as t:
+            raw, token = _q_papers_by_keyword(table, kw, limit, next_token)
+        return _list_payload("papers_by_keyword", {"keyword": kw, "limit": limit}, raw, t, token)
+
+    # precomputed counters (single GetItem)
+    if cmd == "stats":
+        if args[0].upper() not in ("AUTHOR", "CATEGORY", "KEYWORD"):
+            raise UsageError("stats takes author|category|keyword <value>")
+        kind = args[0].upper()
+        value = args[1].lower() if kind == "KEYWORD" else args[1]
+        month = opts.get("month") if kind == "CATEGORY" else None
+        with Timer() as t:
+            n = get_count(table, kind, value, month)
+        return {
+          "query_type": f"stats_{kind.lower()}",
+          "parameters": {kind.lower(): value, **({"month": month} if month else {})},
+          "papers": n,
+          "execution_time_ms": t.ms
+        }
+
+    # recent across several categories (concurrent fan-out + k-way merge)
+    if cmd == "recent-multi":
+        categories = split_values(args[0])
+        if not categories or len(categories) > MAX_FANOUT:
+            raise UsageError(f"recent-multi takes 1..{MAX_FANOUT} categories")
+        limit = parse_limit(opts.get("limit"), 20)
+        with Timer() as t:
+            raw = _q_recent_in_categories(table, categories, limit)
+        return _list_payload("recent_in_categories", {"categories": categories, "limit": limit}, raw, t)
+
+    # papers matching any of several keywords
+    if cmd == "keyword-any":
+        keywords = split_values(args[0].lower())
+        if not keywords or len(keywords) > MAX_FANOUT:
+            raise UsageError(f"keyword-any takes 1..{MAX_FANOUT} keywords")
+        limit = parse_limit(opts.get("limit"), 20)
+        with Timer() as t:
+            raw = _q_papers_by_any_keyword(table, keywords, limit)
+        return _list_payload("papers_by_any_keyword", {"keywords": keywords, "limit": limit}, raw, t)
+
+def stream_command(table, cmd, args):
+    """--all: stream every page of a list query to stdout."""
+    if cmd == "recent":
+        stream_print("recent_in_category", {"category": args[0]}, table, _recent_queries(table, args[0]))
+    elif cmd == "author":
+        stream_print("papers_by_author", {"author": args[0]}, table, _author_queries(table, args[0]))
+    elif cmd == "daterange":
+        category, start_date, end_date = args[:3]
+        stream_print("daterange_in_category", {"category": category, "start_date": start_date, "end_date": end_date},
+                     table, _date_range_queries(table, category, start_date, end_date), "SK", False)
+    elif cmd == "keyword":
+        stream_print("papers_by_keyword", {"keyword": args[0]}, table, _keyword_queries(table, args[0]), "GSI3SK")
+
+
+# ------------ batch / REPL ------------ #
+# One process, one table handle, many queries: boto3 import, credentials and
+# the TLS connection are paid once (reported as startup), not per query.
+
+SPEC_OPTS = ("limit", "next_token", "month", "file")
+
+def parse_spec(line):
+    """
+    One input line -> (id, cmd, args, opts). Either a JSON spec
+        {"id": "q1", "query": "recent", "args": ["cs.LG"], "limit": 5}
+    or the same words as the command line:
+        recent cs.LG --limit 5
+    """
+    if line.startswith("{"):
+        spec = json.loads(line)
+        args = spec.get("args") or []
+        if isinstance(args, str):
+            args = [args]
+        if not isinstance(args, list) or not all(isinstance(a, str) for a in args):
+            raise ValueError("args must be a list of strings")
+        opts = {k: spec[k] for k in SPEC_OPTS if spec.get(k) is not None}
+        if spec.get("all"):
+            opts["all"] = True
+        return spec.get("id"), spec.get("query") or spec.get("cmd"), args, opts
+    argv = shlex.split(line)
+    return None, argv[0], positional_args(argv, 1), parse_opts(argv, 1)
+
+def run_spec(table, n, line):
+    t0 = time.perf_counter()
+    ident = None
+    try:
+        ident, cmd, args, opts = parse_spec(line)
+        if opts.get("all"):
+            raise UsageError("--all is not available in batch mode; page with next_token")
+        out = run_command(table, cmd, args, opts)
+    except Exception as e:                       # one bad line must not end the batch
+        out = {"error": f"{type(e).__name__}: {e}"}
+    return {"id": n if ident is None else ident, **out,
+            "latency_ms": round((time.perf_counter() - t0) * 1000, 2)}
+
+def read_lines(f, prompt=None):
+    while True:
+        if prompt:
+            sys.stderr.write(prompt); sys.stderr.flush()
+        line = f.readline()
+        if not line:
+            return
+        line = line.strip()
+        if line in ("quit", "exit"):
+            return
+        if line and not line.startswith("#"):
+            yield line
+
+def run_batch(table_name, region, opts, source):
+    """
+    Queries from `source` (file path, or "-" for stdin) -> one JSON result per
+    line on stdout, timing summary on stderr. stdin on a terminal is a REPL
+    (prompt + pretty output, one query at a time).
+    """
+    interactive = source == "-" and sys.stdin.isatty()
+    concurrency = 1 if interactive else max(1, int(opts.get("concurrency", 1)))
+    startup = {}
+
+    t = time.perf_counter()
+    import batch_get, sharding                   # noqa: F401  (pulls in boto3)
+    from boto3.dynamodb.conditions import Key    # noqa: F401
+    startup["import_ms"] = round((time.perf_counter() - t) * 1000, 1)
+    t = time.perf_counter()
+    table = get_table(table_name, region, opts.get("backend"), opts.get("data"))
+    startup["open_table_ms"] = round((time.perf_counter() - t) * 1000, 1)
+    t = time.perf_counter()
+    _partitions(table, "CATEGORY", "")           # first round trip: credentials, TLS, shard map
+    startup["warmup_ms"] = round((time.perf_counter() - t) * 1000, 1)
+    startup["total_ms"] = round((time.perf_counter() - _T_START) * 1000, 1)
+
+    f = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    lines = read_lines(f, "query> " if interactive else None)
+    t_queries = time.perf_counter()
+    if concurrency > 1:
+        pool = ThreadPoolExecutor(max_workers=concurrency)
+        results = pool.map(lambda nl: run_spec(table, *nl), enumerate(lines, 1))
+    else:
+        results = (run_spec(table, n, line) for n, line in enumerate(lines, 1))
+
+    latencies, errors = [], 0
+    for res in results:
+        latencies.append(res["latency_ms"])
+        errors += "error" in res
+        if interactive:
+            pretty_print(res)
+        else:
+            sys.stdout.write(json.dumps(res, ensure_ascii=False, separators=(",", ":")) + "\n")
+            sys.stdout.flush()
+    wall = time.perf_counter() - t_queries
+    if concurrency > 1:
+        pool.shutdown()
+    if f is not sys.stdin:
+        f.close()
+
+    from latency import summarize
+    summary = {
+        "queries": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "startup": startup,
+        "queries_wall_ms": round(wall * 1000, 1),
+        "queries_per_sec": round(len(latencies) / wall, 1) if wall > 0 and latencies else 0.0,
+        "total_ms": round((time.perf_counter() - _T_START) * 1000, 1),
+        "latency": summarize("batch", latencies),
+    }
+    sys.stderr.write(json.dumps(summary, indent=2) + "\n")
 
 
 # ------------ CLI / output wiring ------------ #
@@ -97,10 +385,30 @@ def usage_and_exit():
     u = (
         "Usage:\n"
         "  python query_papers.py recent <category> [--limit N] [--table TABLE] [--region REGION]\n"
-        "  python query_papers.py author <author_name> [--table TABLE] [--region REGION]\n"
+        "  python query_papers.py author <author_name> [--limit N] [--table TABLE] [--region REGION]\n"
         "  python query_papers.py get <arxiv_id> [--table TABLE] [--region REGION]\n"
-        "  python query_papers.py daterange <category> <start_date> <end_date> [--table TABLE] [--region REGION]\n"
+        "  python query_papers.py getmany <arxiv_id> [<arxiv_id> ...] [--file IDS_FILE] [--table TABLE] [--region REGION]\n"
+        "  python query_papers.py daterange <category> <start_date> <end_date> [--limit N] [--table TABLE] [--region REGION]\n"
         "  python query_papers.py keyword <keyword> [--limit N] [--table TABLE] [--region REGION]\n"
+        "  python query_papers.py stats author|category|keyword <value> [--month YYYY-MM] [--table TABLE] [--region REGION]\n"
+        "  python query_papers.py recent-multi <cat1,cat2,...> [--limit N] [--table TABLE] [--region REGION]\n"
+        "  python query_papers.py keyword-any <kw1,kw2,...> [--limit N] [--table TABLE] [--region REGION]\n"
+        "  python query_papers.py batch [QUERIES_FILE|-] [--concurrency N] [--table TABLE] [--region REGION]\n"
+        "\n"
+        "Paging (recent/author/daterange/keyword):\n"
+        "  --next-token TOKEN   continue from the next_token of a previous result\n"
+        "  --all                stream every page as it arrives (ignores --limit)\n"
+        "\n"
+        "Batch / REPL (one warm table for many queries):\n"
+        "  one query per line, as command words or a JSON spec:\n"
+        "    recent cs.LG --limit 5\n"
+        "    {\"id\": \"q2\", \"query\": \"daterange\", \"args\": [\"cs.LG\", \"2023-01-01\", \"2023-01-31\"], \"limit\": 50}\n"
+        "  results go to stdout as JSON lines, startup + latency summary to stderr;\n"
+        "  stdin on a terminal gives a query> prompt (quit / Ctrl-D to leave)\n"
+        "\n"
+        "Offline (no AWS):\n"
+        "  --backend local [--data papers.json]   query an in-memory copy of the JSON file\n"
+        "                                         (or set ARXIV_BACKEND=local / ARXIV_LOCAL_DATA)\n"
     )
     print(u); sys.exit(1)
 
@@ -121,108 +429,93 @@ def parse_opts(argv, start_idx):
             opts["table"] = a.split("=",1)[1]; i += 1; continue
         if a.startswith("--region="):
             opts["region"] = a.split("=",1)[1]; i += 1; continue
+        if a == "--next-token" and i+1 < len(argv):
+            opts["next_token"] = argv[i+1]; i += 2; continue
+        if a.startswith("--next-token="):
+            opts["next_token"] = a.split("=",1)[1]; i += 1; continue
+        if a == "--file" and i+1 < len(argv):
+            opts["file"] = argv[i+1]; i += 2; continue
+        if a.startswith("--file="):
+            opts["file"] = a.split("=",1)[1]; i += 1; continue
+        if a == "--month" and i+1 < len(argv):
+            opts["month"] = argv[i+1]; i += 2; continue
+        if a.startswith("--month="):
+            opts["month"] = a.split("=",1)[1]; i += 1; continue
+        if a == "--backend" and i+1 < len(argv):
+            opts["backend"] = argv[i+1]; i += 2; continue
+        if a.startswith("--backend="):
+            opts["backend"] = a.split("=",1)[1]; i += 1; continue
+        if a == "--data" and i+1 < len(argv):
+            opts["data"] = argv[i+1]; i += 2; continue
+        if a.startswith("--data="):
+            opts["data"] = a.split("=",1)[1]; i += 1; continue
+        if a == "--concurrency" and i+1 < len(argv):
+            opts["concurrency"] = argv[i+1]; i += 2; continue
+        if a.startswith("--concurrency="):
+            opts["concurrency"] = a.split("=",1)[1]; i += 1; continue
+        if a == "--all":
+            opts["all"] = True; i += 1; continue
         i += 1
     return opts
 
+VALUE_OPTS = ("--limit", "--table", "--region", "--next-token", "--file", "--month", "--backend", "--data",
+              "--concurrency")
+
+def positional_args(argv, start_idx):
+    """Arguments that are neither options nor option values."""
+    out = []
+    i = start_idx
+    while i < len(argv):
+        a = argv[i]
+        if a in VALUE_OPTS:
+            i += 2; continue
+        if not a.startswith("--"):
+            out.append(a)
+        i += 1
+    return out
+
 
 def main():
-    if len(sys.argv) < 2:
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help", "help"):
         usage_and_exit()
 
     cmd = sys.argv[1]
     opts = parse_opts(sys.argv, 2)
+    args = positional_args(sys.argv, 2)
     region = opts.get("region") or getenv_region()
     table_name = opts.get("table") or getenv_table("arxiv-papers")
-    table = get_table(table_name, region)
 
-    # recent
-    if cmd == "recent":
-        if len(sys.argv) < 3:
-            usage_and_exit()
-        category = sys.argv[2]
-        limit = int(opts.get("limit", 20))
-        with Timer() as t:
-            raw = _q_recent_in_category(table, category, limit)
-            results = [clean_item(it) for it in raw]
-        pretty_print({
-          "query_type": "recent_in_category",
-          "parameters": {"category": category, "limit": limit},
-          "results": results,
-          "count": len(results),
-          "execution_time_ms": t.ms
-        })
+    if cmd == "batch":
+        try:
+            run_batch(table_name, region, opts, args[0] if args else "-")
+        except (ValueError, OSError) as e:
+            print(f"Error: {e}"); sys.exit(1)
         return
 
-    # author
-    if cmd == "author":
-        if len(sys.argv) < 3:
-            usage_and_exit()
-        author = sys.argv[2]
-        with Timer() as t:
-            raw = _q_papers_by_author(table, author)
-            results = [clean_item(it) for it in raw]
-        pretty_print({
-          "query_type": "papers_by_author",
-          "parameters": {"author": author},
-          "results": results,
-          "count": len(results),
-          "execution_time_ms": t.ms
-        })
-        return
+    # argument errors are reported before anything imports boto3
+    try:
+        check_command(cmd, args)
+        decode_cursor(opts.get("next_token"))
+    except UsageError:
+        usage_and_exit()
+    except InvalidToken as e:
+        print(f"Error: {e}"); sys.exit(1)
 
-    # get by id
-    if cmd == "get":
-        if len(sys.argv) < 3:
-            usage_and_exit()
-        arxiv_id = sys.argv[2]
-        with Timer() as t:
-            one = _q_paper_by_id(table, arxiv_id)
-            results = [clean_item(one)] if one else []
-        pretty_print({
-          "query_type": "paper_by_id",
-          "parameters": {"arxiv_id": arxiv_id},
-          "results": results,
-          "count": len(results),
-          "execution_time_ms": t.ms
-        })
-        return
+    try:
+        table = get_table(table_name, region, opts.get("backend"), opts.get("data"))
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}"); sys.exit(1)
 
-    # date range
-    if cmd == "daterange":
-        if len(sys.argv) < 5:
-            usage_and_exit()
-        category, start_date, end_date = sys.argv[2], sys.argv[3], sys.argv[4]
-        with Timer() as t:
-            raw = _q_papers_in_date_range(table, category, start_date, end_date)
-            results = [clean_item(it) for it in raw]
-        pretty_print({
-          "query_type": "daterange_in_category",
-          "parameters": {"category": category, "start_date": start_date, "end_date": end_date},
-          "results": results,
-          "count": len(results),
-          "execution_time_ms": t.ms
-        })
-        return
-
-    # keyword
-    if cmd == "keyword":
-        if len(sys.argv) < 3:
-            usage_and_exit()
-        kw = sys.argv[2]
-        limit = int(opts.get("limit", 20))
-        with Timer() as t:
-            raw = _q_papers_by_keyword(table, kw, limit)
-            results = [clean_item(it) for it in raw]
-        pretty_print({
-          "query_type": "papers_by_keyword",
-          "parameters": {"keyword": kw, "limit": limit},
-          "results": results,
-          "count": len(results),
-          "execution_time_ms": t.ms
-        })
+    if opts.get("all") and cmd in STREAM_COMMANDS:
+        stream_command(table, cmd, args)
         return
-
-    usage_and_exit()
+    try:
+        payload = run_command(table, cmd, args, opts)
+    except UsageError:
+        usage_and_exit()
+    except (InvalidToken, ValueError, OSError) as e:
+        print(f"Error: {e}"); sys.exit(1)
+    pretty_print(payload)
 
 
 if __name__ == "__main__":
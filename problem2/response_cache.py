@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — In-process read-through response cache for api_server.py.
+Allowed deps: stdlib only (threading, time, collections)
+
+The papers table only changes when load_data.py runs, so query results can be
+served from memory:
+  - keyed by (route, params)
+  - size-bounded LRU eviction
+  - per-route TTLs
+  - hit / miss / eviction counters (also per route, for /metrics)
+  - single-flight: concurrent identical misses share one backend call
+  - invalidate() hook (api_server exposes it as POST /cache/invalidate)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Flight:
+    """One in-progress load that other threads can wait on."""
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResponseCache:
+    def __init__(self, max_entries=1024, default_ttl=60.0, route_ttls=None, clock=time.monotonic):
+        self.max_entries = int(max_entries)
+        self.default_ttl = float(default_ttl)
+        self.route_ttls = dict(route_ttls or {})
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (expires_at, value)
+        self._flights = {}              # key -> _Flight
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.route_counts = {}          # route -> {"hit": n, "miss": n, "coalesced": n}
+
+    @staticmethod
+    def make_key(route, params):
+        return (route, tuple(sorted((params or {}).items())))
+
+    def _count(self, route, result):
+        counts = self.route_counts.setdefault(route, {"hit": 0, "miss": 0, "coalesced": 0})
+        counts[result] += 1
+
+    def ttl_for(self, route):
+        return float(self.route_ttls.get(route, self.default_ttl))
+
+    def get_or_load(self, route, params, loader):
+        """
+        Return the cached value for (route, params), or call loader() once and
+        cache its result. Exceptions from loader() are propagated to every
+        waiting caller and are never cached. The value is shared with every
+        later hit, not copied: callers must treat it as read-only.
+        """
+        ttl = self.ttl_for(route)
+        if ttl <= 0 or self.max_entries <= 0:
+            return loader()
+
+        key = self.make_key(route, params)
+        with self._lock:
+            now = self._clock()
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self._count(route, "hit")
+                    return entry[1]
+                del self._entries[key]
+                self.expirations += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                self._count(route, "coalesced")
+                leader = False
+            else:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.misses += 1
+                self._count(route, "miss")
+                leader = True
+            generation = self._generation
+
+        if not leader:
+            flight.event.wait()
+            if isinstance(flight.error, Exception):
+                raise flight.error
+            if flight.error is not None:        # KeyboardInterrupt / SystemExit belong to the leader's thread
+                raise RuntimeError(f"cache load aborted ({type(flight.error).__name__})")
+            return flight.value
+
+        # the flight is always resolved, whatever loader() raises: waiters never hang
+        try:
+            flight.value = loader()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+                # an invalidate() that raced with this load wins: don't store stale data
+                if flight.error is None and generation == self._generation:
+                    self._entries[key] = (self._clock() + ttl, flight.value)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+            flight.event.set()
+        return flight.value
+
+    def invalidate(self, route=None):
+        """Drop every entry (or only those of one route). Returns number removed."""
+        with self._lock:
+            if route is None:
+                n = len(self._entries)
+                self._entries.clear()
+            else:
+                stale = [k for k in self._entries if k[0] == route]
+                for k in stale:
+                    del self._entries[k]
+                n = len(stale)
+            self._generation += 1
+            return n
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+                "routes": {r: dict(c) for r, c in self.route_counts.items()},
+                "route_ttls": dict(self.route_ttls),
+                "default_ttl": self.default_ttl,
+            }
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Parallel Scan export of paper items to a columnar, mmap-able snapshot.
+Allowed deps: boto3 + stdlib (array, bisect, json, mmap, os, sys, time, datetime, concurrent.futures);
+              numpy is used for reading when installed, never required
+
+Usage:
+  python snapshot.py export <table_name> <out_dir> [--segments N] [--region REGION]
+                            [--backend local --data papers.json]
+  python snapshot.py stats <out_dir> [--top N]
+
+export: --segments worker threads each Scan one Segment of TotalSegments,
+with FilterExpression entity_type = PAPER_ITEM and a projection of the
+analytic attributes only (no abstract), following LastEvaluatedKey per
+segment. Rows are sorted by (published date, arxiv_id) and written as one
+.npy file per array, so numpy.load(path, mmap_mode="r") maps any of them:
+
+    published_day.npy            int32   days since 1970-01-01, one per paper
+    arxiv_id.offsets/.bytes      int64 / uint8   utf-8 strings, row i = bytes[off[i]:off[i+1]]
+    title.offsets/.bytes         same
+    <col>.offsets.npy            int64   row i owns codes[off[i]:off[i+1]]   (col = authors,
+    <col>.codes.npy              int32   index into the sorted dictionary     categories,
+    <col>.dict.offsets/.bytes    string dictionary, sorted (bisect lookup)    keywords)
+    manifest.json                row count, files, scan / write throughput (written last)
+
+The .npy files are produced with the stdlib array module (the format is a
+64-byte-aligned text header + raw little-endian data); Snapshot reads them
+through numpy memmaps when numpy is importable, otherwise through mmap +
+memoryview.cast, with the same interface.
+
+stats: the analytics the table cannot answer cheaply -- paper counts per
+category, top authors / keywords, papers per year for the top categories --
+computed from the snapshot alone.
+"""
+
+import array
+import bisect
+import json
+import mmap
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:                  # optional: only speeds up reading
+    np = None
+
+PROJECTED = ("arxiv_id", "title", "authors", "categories", "keywords", "published_date")
+STRING_COLUMNS = ("arxiv_id", "title")
+LIST_COLUMNS = ("authors", "categories", "keywords")
+EPOCH = date(1970, 1, 1).toordinal()
+NPY_ALIGN = 64
+SNAPSHOT_VERSION = 1
+
+
+# ------------ parallel scan ------------ #
+
+def scan_segment(table, segment, total_segments):
+    """All PAPER_ITEM rows of one segment -> (rows, stats)."""
+    from boto3.dynamodb.conditions import Attr
+    names = {f"#p{i}": a for i, a in enumerate(PROJECTED)}
+    kwargs = dict(Segment=segment, TotalSegments=total_segments,
+                  FilterExpression=Attr("entity_type").eq("PAPER_ITEM"),
+                  ProjectionExpression=", ".join(names), ExpressionAttributeNames=names,
+                  ReturnConsumedCapacity="TOTAL")
+    rows, pages, scanned, rcu = [], 0, 0, 0.0
+    while True:
+        resp = table.scan(**kwargs)
+        pages += 1
+        scanned += resp.get("ScannedCount", 0)
+        rcu += (resp.get("ConsumedCapacity") or {}).get("CapacityUnits", 0.0)
+        rows.extend(resp.get("Items", []))
+        last = resp.get("LastEvaluatedKey")
+        if not last:
+            break
+        kwargs["ExclusiveStartKey"] = last
+    return rows, {"segment": segment, "pages": pages, "scanned": scanned, "rows": len(rows), "rcu": rcu}
+
+def parallel_scan(table, segments):
+    with ThreadPoolExecutor(max_workers=segments) as pool:
+        parts = list(pool.map(lambda s: scan_segment(table, s, segments), range(segments)))
+    rows = [r for part, _ in parts for r in part]
+    return rows, [stats for _, stats in parts]
+
+
+# ------------ .npy writing (stdlib only) ------------ #
+
+def _npy_header(descr, length):
+    d = "{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }" % (descr, length)
+    pad = -(10 + len(d) + 1) % NPY_ALIGN
+    d = d + " " * pad + "\n"
+    return b"\x93NUMPY\x01\x00" + len(d).to_bytes(2, "little") + d.encode("latin1")
+
+_DESCR = {"i": "<i4", "q": "<i8", "B": "|u1"}
+
+def write_npy(path, typecode, values):
+    arr = values if isinstance(values, array.array) else array.array(typecode, values)
+    if sys.byteorder == "big" and typecode != "B":
+        arr = array.array(typecode, arr)
+        arr.byteswap()
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_npy_header(_DESCR[typecode], len(arr)))
+        arr.tofile(f)
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+def _string_arrays(strings):
+    """[str] -> (int64 offsets (n+1), uint8 blob)."""
+    offsets = array.array("q", [0])
+    blob = bytearray()
+    for s in strings:
+        blob += s.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets, array.array("B", bytes(blob))
+
+def _day(published_date):
+    try:
+        return date.fromisoformat(str(published_date)[:10]).toordinal() - EPOCH
+    except ValueError:
+        return -1
+
+def write_snapshot(rows, out_dir, extra=None):
+    """Paper rows (dicts) -> columnar snapshot directory; returns the manifest."""
+    os.makedirs(out_dir, exist_ok=True)
+    rows = sorted(rows, key=lambda r: (str(r.get("published_date", "")), r.get("arxiv_id", "")))
+    files = {}
+
+    def put(name, typecode, values):
+        files[name] = write_npy(os.path.join(out_dir, f"{name}.npy"), typecode, values)
+
+    put("published_day", "i", (_day(r.get("published_date")) for r in rows))
+    for col in STRING_COLUMNS:
+        offsets, blob = _string_arrays(str(r.get(col, "")) for r in rows)
+        put(f"{col}.offsets", "q", offsets)
+        put(f"{col}.bytes", "B", blob)
+    for col in LIST_COLUMNS:
+        values = [r.get(col) or [] for r in rows]
+        dictionary = sorted({v for vs in values for v in vs})
+        code = {v: i for i, v in enumerate(dictionary)}
+        offsets, codes = array.array("q", [0]), array.array("i")
+        for vs in values:
+            codes.extend(code[v] for v in vs)
+            offsets.append(len(codes))
+        put(f"{col}.offsets", "q", offsets)
+        put(f"{col}.codes", "i", codes)
+        d_off, d_blob = _string_arrays(dictionary)
+        put(f"{col}.dict.offsets", "q", d_off)
+        put(f"{col}.dict.bytes", "B", d_blob)
+
+    manifest = {"version": SNAPSHOT_VERSION, "rows": len(rows), "files": files,
+                "bytes": sum(files.values()), **(extra or {})}
+    tmp = os.path.join(out_dir, "manifest.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(out_dir, "manifest.json"))
+    return manifest
+
+
+# ------------ reading ------------ #
+
+_TYPECODE = {"<i4": "i", "<i8": "q", "|u1": "B"}
+
+def _open_npy(path):
+    """Stdlib fallback: (mmap, memoryview cast to the stored type)."""
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    header_len = int.from_bytes(mm[8:10], "little")
+    header = mm[10:10 + header_len].decode("latin1")
+    descr = header.split("'descr': '", 1)[1].split("'", 1)[0]
+    view = memoryview(mm)[10 + header_len:]
+    return mm, view.cast(_TYPECODE[descr]) if descr != "|u1" else view
+
+
+class Snapshot:
+    """Read-only view of a snapshot directory; arrays are memory-mapped, never copied."""
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "manifest.json"), "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self._arrays = {}
+        self._maps = []
+        self._dicts = {}
+
+    def __len__(self):
+        return self.manifest["rows"]
+
+    def array(self, name):
+        if name not in self._arrays:
+            path = os.path.join(self.path, f"{name}.npy")
+            if np is not None:
+                self._arrays[name] = np.load(path, mmap_mode="r")
+            else:
+                mm, view = _open_npy(path)
+                self._maps.append(mm)
+                self._arrays[name] = view
+        return self._arrays[name]
+
+    def _string(self, prefix, i):
+        off = self.array(f"{prefix}.offsets")
+        return bytes(self.array(f"{prefix}.bytes")[int(off[i]):int(off[i + 1])]).decode("utf-8")
+
+    def string(self, col, row):
+        """arxiv_id / title of one row."""
+        return self._string(col, row)
+
+    def dictionary(self, col):
+        if col not in self._dicts:
+            n = len(self.array(f"{col}.dict.offsets")) - 1
+            self._dicts[col] = [self._string(f"{col}.dict", i) for i in range(n)]
+        return self._dicts[col]
+
+    def code(self, col, value):
+        """Dictionary code of `value`, or None."""
+        d = self.dictionary(col)
+        i = bisect.bisect_left(d, value)
+        return i if i < len(d) and d[i] == value else None
+
+    def values(self, col, row):
+        off = self.array(f"{col}.offsets")
+        d = self.dictionary(col)
+        return [d[c] for c in self.array(f"{col}.codes")[int(off[row]):int(off[row + 1])]]
+
+    def counts(self, col):
+        """Occurrences of every dictionary value: [count per code]."""
+        codes = self.array(f"{col}.codes")
+        n = len(self.dictionary(col))
+        if np is not None:
+            return np.bincount(codes, minlength=n).tolist()
+        out = [0] * n
+        for c in codes:
+            out[c] += 1
+        return out
+
+    def rows_of(self, col):
+        """Row index of every entry in <col>.codes (CSR expanded)."""
+        off = self.array(f"{col}.offsets")
+        if np is not None:
+            return np.repeat(np.arange(len(off) - 1, dtype=np.int32), np.diff(off))
+        out = array.array("i")
+        for row in range(len(off) - 1):
+            out.extend([row] * (off[row + 1] - off[row]))
+        return out
+
+    def close(self):
+        self._arrays.clear()
+        for mm in self._maps:
+            try:
+                mm.close()
+            except BufferError:        # a caller still holds a view
+                pass
+        self._maps.clear()
+
+
+def summary(snap, top=10):
+    days = snap.array("published_day")
+    year_of = lambda d: date.fromordinal(int(d) + EPOCH).year if d >= 0 else None
+    cats = snap.dictionary("categories")
+    cat_counts = snap.counts("categories")
+    top_cats = sorted(range(len(cats)), key=lambda i: -cat_counts[i])[:top]
+
+    trend = {cats[i]: Counter() for i in top_cats}
+    wanted = set(top_cats)
+    for row, c in zip(snap.rows_of("categories"), snap.array("categories.codes")):
+        if int(c) in wanted:
+            trend[cats[int(c)]][year_of(days[row])] += 1
+
+    def top_values(col):
+        d, counts = snap.dictionary(col), snap.counts(col)
+        return [{"value": d[i], "papers": counts[i]}
+                for i in sorted(range(len(d)), key=lambda i: -counts[i])[:top]]
+
+    return {
+        "papers": len(snap),
+        "first_day": date.fromordinal(int(days[0]) + EPOCH).isoformat() if len(snap) else None,
+        "last_day": date.fromordinal(int(days[-1]) + EPOCH).isoformat() if len(snap) else None,
+        "categories": {cats[i]: cat_counts[i] for i in top_cats},
+        "top_authors": top_values("authors"),
+        "top_keywords": top_values("keywords"),
+        "papers_per_year": {c: dict(sorted(t.items())) for c, t in trend.items()},
+    }
+
+
+# ------------ CLI ------------ #
+
+def export(table_name, out_dir, opts):
+    from backend import open_table
+    region = opts.get("--region") or os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION") or "us-east-1"
+    segments = int(opts.get("--segments", 8))
+    table = open_table(table_name, region, opts.get("--backend"), opts.get("--data"))
+
+    t0 = time.perf_counter()
+    rows, seg_stats = parallel_scan(table, segments)
+    scan_s = time.perf_counter() - t0
+    scanned = sum(s["scanned"] for s in seg_stats)
+    scan = {"segments": segments, "seconds": round(scan_s, 3), "rows": len(rows), "scanned": scanned,
+            "rows_per_s": round(len(rows) / scan_s, 1) if scan_s else 0.0,
+            "scanned_per_s": round(scanned / scan_s, 1) if scan_s else 0.0,
+            "rcu": round(sum(s["rcu"] for s in seg_stats), 1),
+            "pages": sum(s["pages"] for s in seg_stats)}
+
+    t0 = time.perf_counter()
+    manifest = write_snapshot(rows, out_dir, {"table": table_name, "scan": scan})
+    write_s = time.perf_counter() - t0
+    manifest["write"] = {"seconds": round(write_s, 3),
+                         "mb_per_s": round(manifest["bytes"] / 1e6 / write_s, 1) if write_s else 0.0}
+    manifest["scan_to_disk_rows_per_s"] = round(len(rows) / (scan_s + write_s), 1) if rows else 0.0
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ("export", "stats"):
+        print(__doc__); sys.exit(1)
+    if sys.argv[1] == "export":
+        if len(sys.argv) < 4:
+            print(__doc__); sys.exit(1)
+        opts = dict(zip(sys.argv[4::2], sys.argv[5::2]))
+        try:
+            manifest = export(sys.argv[2], sys.argv[3], opts)
+        except (ValueError, OSError) as e:
+            print(f"Error: {e}"); sys.exit(1)
+        print(json.dumps({k: v for k, v in manifest.items() if k != "files"}, indent=2))
+        return
+
+    opts = dict(zip(sys.argv[3::2], sys.argv[4::2]))
+    t0 = time.perf_counter()
+    snap = Snapshot(sys.argv[2])
+    out = summary(snap, int(opts.get("--top", 10)))
+    out["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    out["reader"] = "numpy" if np is not None else "mmap"
+    snap.close()
+    print(json.dumps(out, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
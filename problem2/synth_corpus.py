@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Synthetic arXiv corpus with skewed categories / authors / keywords.
+Allowed deps: stdlib only (json, random, sys, datetime, itertools)
+
+Usage:
+  python synth_corpus.py <out_json> [--papers N] [--skew S] [--seed SEED]
+                         [--category-skew S] [--author-skew S] [--keyword-skew S]
+
+Output has the same shape as papers.json, so load_data.py can load it.
+Popularity follows a Zipf-like law with exponent S (0 = uniform, ~1.2 = very
+hot head), which is what makes cs.LG / "learning" partitions hot. --skew
+sets all three; the per-dimension options override it.
+"""
+
+import json
+import random
+import sys
+from datetime import date, timedelta
+from itertools import accumulate
+
+CATEGORY_POOL = [
+    "cs.LG", "cs.AI", "stat.ML", "cs.CV", "cs.CL", "cs.NE", "cs.IR", "cs.RO",
+    "cs.DS", "cs.CR", "math.OC", "cs.SI", "cs.DB", "cs.DC", "q-bio.NC", "cs.GT",
+]
+WORD_POOL_SIZE = 2000
+AUTHOR_POOL_SIZE = 5000
+
+
+def zipf_weights(n, s):
+    """Cumulative Zipf weights, ready for random.choices(cum_weights=...)."""
+    return list(accumulate(1.0 / ((i + 1) ** s) for i in range(n)))
+
+def make_words(n, rng):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = ["learning", "network", "graph", "model", "neural", "data", "training", "optimization"]
+    seen = set(words)
+    while len(words) < n:
+        w = "".join(rng.choice(letters) for _ in range(rng.randint(4, 10)))
+        if w not in seen:
+            seen.add(w)
+            words.append(w)
+    return words
+
+def generate(n_papers=1000, skew=1.1, seed=547, n_authors=AUTHOR_POOL_SIZE, n_words=WORD_POOL_SIZE,
+             start=date(2000, 1, 1), days=9000, category_skew=None, author_skew=None, keyword_skew=None):
+    rng = random.Random(seed)
+    cat_w = zipf_weights(len(CATEGORY_POOL), skew if category_skew is None else category_skew)
+    authors = [f"Author {i:05d}" for i in range(n_authors)]
+    author_w = zipf_weights(n_authors, skew if author_skew is None else author_skew)
+    words = make_words(n_words, rng)
+    word_w = zipf_weights(n_words, skew if keyword_skew is None else keyword_skew)
+
+    papers = []
+    for i in range(n_papers):
+        cats = list(dict.fromkeys(rng.choices(CATEGORY_POOL, cum_weights=cat_w, k=rng.randint(1, 3))))
+        auths = list(dict.fromkeys(rng.choices(authors, cum_weights=author_w, k=rng.randint(1, 6))))
+        abstract = " ".join(rng.choices(words, cum_weights=word_w, k=rng.randint(60, 160)))
+        title = " ".join(rng.choices(words, cum_weights=word_w, k=rng.randint(4, 10))).title()
+        published = start + timedelta(days=rng.randrange(days))
+        papers.append({
+            "arxiv_id": f"{published:%y%m}.{i:05d}v1",
+            "title": title,
+            "authors": auths,
+            "abstract": abstract,
+            "categories": cats,
+            "published": f"{published.isoformat()}T00:00:00Z",
+        })
+    return papers
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__); sys.exit(1)
+    opts = dict(zip(sys.argv[2::2], sys.argv[3::2]))
+    skews = {k: float(opts[f"--{k.replace('_', '-')}"]) for k in ("category_skew", "author_skew", "keyword_skew")
+             if f"--{k.replace('_', '-')}" in opts}
+    papers = generate(int(opts.get("--papers", 1000)), float(opts.get("--skew", 1.1)),
+                      int(opts.get("--seed", 547)), **skews)
+    with open(sys.argv[1], "w", encoding="utf-8") as f:
+        json.dump(papers, f, ensure_ascii=False, indent=2)
+    print(f"Wrote {len(papers)} synthetic papers to {sys.argv[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HW3 Problem 2 — Full-text inverted index over titles + abstracts (BM25).
+Allowed deps: stdlib only (array, heapq, math, mmap, os, re, struct, json, sys)
+
+Usage:
+  python text_index.py build <papers_json_path> <index_path>
+  python text_index.py search <index_path> <query> [--op and|or] [--limit K]
+
+KeywordIndex only knows the top-10 terms of each abstract. This index
+knows every non-stopword of title + abstract, with positions, so
+    graph neural          both terms (--op and, default) / either (--op or)
+    "graph neural" pool   a quoted phrase must appear in that order
+are answered locally and ranked by BM25; api_server.py then hydrates the
+top-k arxiv ids with one BatchGetItem.
+
+File layout (little-endian, every section 8-byte aligned; the file is
+mmap'd and nothing is decoded until a term is looked up):
+    header      magic, n_docs, n_terms, avg_doc_len, 10 x (offset, length)
+    doc_ids     uint32[n_docs+1] offsets + utf-8 blob of arxiv ids
+    doc_len     uint32[n_docs]   tokens per document
+    terms       uint32[n_terms+1] offsets + sorted utf-8 blob (binary search)
+    post_start  uint64[n_terms+1] first posting of each term (df = difference)
+    post_docs   uint32[postings]  doc numbers, ascending within a term
+    post_tfs    uint16[postings]  term frequency (capped at 65535)
+    positions   uint64[n_terms+1] offsets + blob of varint position gaps
+                per posting (only decoded for phrase candidates)
+Doc ids and tfs are fixed width so a term's postings are a zero-copy slice
+of the mmap; only positions are varint-compressed, since they dominate.
+"""
+
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+
+MAGIC = b"ARXTXT01"
+HEADER = struct.Struct("<8sIId20Q")
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+TITLE_GAP = 1000           # position gap between title and abstract: phrases never span them
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 只去掉真正的虚词；"method" / "learning" 之类在全文检索里是有效查询
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in", "is", "it",
+    "its", "of", "on", "or", "that", "the", "this", "to", "was", "we", "were", "which", "with",
+}
+
+
+def tokenize(text, start=0):
+    """[(position, term), ...]; stopwords are dropped but still advance the position."""
+    out = []
+    for i, tok in enumerate(TOKEN_RE.findall(text.lower())):
+        if tok not in STOPWORDS:
+            out.append((start + i, tok))
+    return out
+
+def document_tokens(paper):
+    title = paper.get("title") or ""
+    abstract = paper.get("abstract") or paper.get("summary") or ""
+    return tokenize(title) + tokenize(abstract, start=TITLE_GAP)
+
+
+# ------------ varints ------------ #
+
+def _put_varint(buf, n):
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+def _skip_varints(buf, pos, count):
+    while count:
+        if buf[pos] < 0x80:
+            count -= 1
+        pos += 1
+    return pos
+
+def _read_varints(buf, pos, count):
+    out = []
+    for _ in range(count):
+        n = shift = 0
+        while True:
+            b = buf[pos]
+            pos += 1
+            n |= (b & 0x7F) << shift
+            if b < 0x80:
+                break
+            shift += 7
+        out.append(n)
+    return out, pos
+
+
+# ------------ build ------------ #
+
+def _uint_array(code, values):
+    a = array(code, values)
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a.tobytes()
+
+def build_index(papers):
+    """papers (papers.json shape) -> index file bytes. Later duplicates of an arxiv id win."""
+    docs = {}
+    for p in papers:
+        arxiv_id = p.get("arxiv_id") or p.get("id") or p.get("arXivId")
+        if arxiv_id:
+            docs[arxiv_id] = p
+    ids = sorted(docs)
+
+    postings = {}                                   # term -> [(doc, [positions])]
+    doc_len = []
+    for d, arxiv_id in enumerate(ids):
+        toks = document_tokens(docs[arxiv_id])
+        doc_len.append(len(toks))
+        per_doc = {}
+        for pos, term in toks:
+            per_doc.setdefault(term, []).append(pos)
+        for term, positions in per_doc.items():
+            postings.setdefault(term, []).append((d, positions))
+
+    terms = sorted(postings)
+    post_start, post_docs, post_tfs = [0], [], []
+    pos_off, blob = [], bytearray()
+    for term in terms:
+        plist = postings[term]
+        pos_off.append(len(blob))
+        for d, positions in plist:
+            positions = positions[:0xFFFF]
+            post_docs.append(d)
+            post_tfs.append(len(positions))
+            prev = 0
+            for pos in positions:
+                _put_varint(blob, pos - prev)
+                prev = pos
+        post_start.append(len(post_docs))
+    pos_off.append(len(blob))
+
+    def strings(values):
+        encoded = [v.encode("utf-8") for v in values]
+        offsets, total = [0], 0
+        for e in encoded:
+            total += len(e)
+            offsets.append(total)
+        return _uint_array("I", offsets), b"".join(encoded)
+
+    id_off, id_blob = strings(ids)
+    term_off, term_blob = strings(terms)
+    sections = [id_off, id_blob, _uint_array("I", doc_len), term_off, term_blob,
+                _uint_array("Q", post_start), _uint_array("I", post_docs), _uint_array("H", post_tfs),
+                _uint_array("Q", pos_off), bytes(blob)]
+
+    body, layout = bytearray(), []
+    offset = HEADER.size
+    for sec in sections:
+        pad = (-offset) % 8
+        body += b"\0" * pad
+        offset += pad
+        layout += [offset, len(sec)]
+        body += sec
+        offset += len(sec)
+    avg_len = sum(doc_len) / len(doc_len) if doc_len else 0.0
+    return HEADER.pack(MAGIC, len(ids), len(terms), avg_len, *layout) + bytes(body)
+
+def write_index(papers, path):
+    """Write via a temp file + rename: a server that has the old file mmap'd keeps reading it."""
+    data = build_index(papers)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return len(data)
+
+
+# ------------ query ------------ #
+
+def parse_query(q):
+    """'graph "neural network"' -> [[(0, 'graph')], [(0, 'neural'), (1, 'network')]] (one group per clause)."""
+    clauses = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', q):
+        toks = tokenize(phrase if phrase else word)
+        if toks:
+            base = toks[0][0]
+            clauses.append([(pos - base, term) for pos, term in toks])
+    return clauses
+
+
+class TextIndex:
+    """Read-only view of an index file; all lookups go straight to the mmap."""
+    def __init__(self, path):
+        self.path = path
+        self._f = open(path, "rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.n_docs, self.n_terms, self.avg_len, *layout = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: not a text index (bad magic)")
+        buf = memoryview(self._mm)
+        secs = [buf[layout[i]:layout[i] + layout[i + 1]] for i in range(0, len(layout), 2)]
+        self._id_off, self._id_blob = self._uints(secs[0], "I"), secs[1]
+        self._doc_len = self._uints(secs[2], "I")
+        self._term_off, self._term_blob = self._uints(secs[3], "I"), secs[4]
+        self._post_start = self._uints(secs[5], "Q")
+        self._post_docs = self._uints(secs[6], "I")
+        self._post_tfs = self._uints(secs[7], "H")
+        self._pos_off = self._uints(secs[8], "Q")
+        self._blob = secs[9]
+
+    @staticmethod
+    def _uints(view, code):
+        if sys.byteorder == "little":
+            return view.cast(code)
+        a = array(code, view.tobytes())          # big-endian hosts pay one copy at open time
+        a.byteswap()
+        return a
+
+    def close(self):
+        for name in ("_id_off", "_id_blob", "_doc_len", "_term_off", "_term_blob",
+                     "_post_start", "_post_docs", "_post_tfs", "_pos_off", "_blob"):
+            v = getattr(self, name, None)
+            if isinstance(v, memoryview):
+                v.release()
+        self._mm.close()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def arxiv_id(self, d):
+        return bytes(self._id_blob[self._id_off[d]:self._id_off[d + 1]]).decode("utf-8")
+
+    def _term(self, i):
+        return bytes(self._term_blob[self._term_off[i]:self._term_off[i + 1]])
+
+    def term_id(self, term):
+        key = term.encode("utf-8")
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self.n_terms and self._term(lo) == key else None
+
+    def postings(self, term, positions=False, only=None):
+        """{doc: tf} or, with positions=True, {doc: [positions]} (restricted to docs in `only`)."""
+        t = self.term_id(term)
+        if t is None:
+            return {}
+        lo, hi = self._post_start[t], self._post_start[t + 1]
+        docs, tfs = self._post_docs[lo:hi].tolist(), self._post_tfs[lo:hi].tolist()
+        if not positions:
+            return dict(zip(docs, tfs))
+        out, pos = {}, self._pos_off[t]
+        for d, tf in zip(docs, tfs):
+            if only is not None and d not in only:
+                pos = _skip_varints(self._blob, pos, tf)
+                continue
+            deltas, pos = _read_varints(self._blob, pos, tf)
+            p, plist = 0, []
+            for g in deltas:
+                p += g
+                plist.append(p)
+            out[d] = plist
+        return out
+
+    def _idf(self, df):
+        return math.log(1.0 + (self.n_docs - df + 0.5) / (df + 0.5))
+
+    def _clause_tfs(self, clause):
+        """Per-term {doc: tf} for one clause; a phrase keeps only docs with the terms in order."""
+        if len(clause) == 1:
+            return [self.postings(clause[0][1])]
+        # intersect on doc ids first; positions are only decoded for the candidates
+        tf_lists = [self.postings(term) for _, term in clause]
+        docs = set.intersection(*sorted((set(tfs) for tfs in tf_lists), key=len))
+        plists = [self.postings(term, positions=True, only=docs) for _, term in clause]
+        hits = set()
+        for d in docs:
+            rest = [set(pl[d]) for pl in plists[1:]]
+            if any(all(start + off in s for (off, _), s in zip(clause[1:], rest)) for start in plists[0][d]):
+                hits.add(d)
+        return [{d: len(pl[d]) for d in hits} for pl in plists]
+
+    def search(self, q, op="and", limit=10):
+        """-> ([(arxiv_id, score), ...] best first, number of matching documents)."""
+        clauses = parse_query(q)
+        if not clauses or not self.n_docs:
+            return [], 0
+        per_clause = [self._clause_tfs(c) for c in clauses]
+        doc_sets = [set().union(*(tfs.keys() for tfs in c)) for c in per_clause]
+        if op == "or":
+            matched = set().union(*doc_sets)
+        else:
+            matched = set.intersection(*sorted(doc_sets, key=len))
+
+        scores = dict.fromkeys(matched, 0.0)
+        k1, b, avg, doc_len = BM25_K1, BM25_B, self.avg_len or 1.0, self._doc_len
+        for clause_tfs in per_clause:
+            for tfs in clause_tfs:
+                if not tfs:
+                    continue
+                idf = self._idf(len(tfs))
+                docs = matched if len(matched) < len(tfs) else tfs   # walk the smaller side
+                for d in docs:
+                    tf = tfs.get(d)
+                    if tf and d in scores:
+                        scores[d] += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * doc_len[d] / avg))
+        top = heapq.nsmallest(limit, scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [(self.arxiv_id(d), round(s, 4)) for d, s in top], len(matched)
+
+
+def main():
+    if len(sys.argv) < 4 or sys.argv[1] not in ("build", "search"):
+        print(__doc__); sys.exit(1)
+    if sys.argv[1] == "build":
+        with open(sys.argv[2], "r", encoding="utf-8") as f:
+            data = json.load(f)
+        papers = data["papers"] if isinstance(data, dict) else data
+        size = write_index(papers, sys.argv[3])
+        with TextIndex(sys.argv[3]) as idx:
+            print(f"Indexed {idx.n_docs} papers, {idx.n_terms} terms -> {sys.argv[3]} ({size} bytes)")
+        return
+    opts = dict(zip(sys.argv[4::2], sys.argv[5::2]))
+    with TextIndex(sys.argv[2]) as idx:
+        hits, total = idx.search(sys.argv[3], opts.get("--op", "and"), int(opts.get("--limit", 10)))
+    print(json.dumps({"query": sys.argv[3], "total": total,
+                      "results": [{"arxiv_id": a, "score": s} for a, s in hits]}, indent=2))
+
+
+if __name__ == "__main__":
+    main()